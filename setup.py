@@ -42,7 +42,9 @@ setup(
         'test': TESTS_REQUIRES,
         'redis': ['redis>=2.10.5'],
         'uwsgi': ['uwsgi>=2.0.0'],
-        'cpphash': ['mmh3cffi>=0.1.4']
+        'cpphash': ['mmh3cffi>=0.1.4'],
+        'numpy': ['numpy>=1.16'],
+        'asyncio': ['aiohttp>=3.3.0;python_version>="3.5"']
     },
     setup_requires=['pytest-runner'],
     classifiers=[
@@ -0,0 +1,356 @@
+"""
+Asyncio HTTP client & API wrappers for split API.
+
+This module requires python 3.5+ and is only imported by the asyncio SDK flavor.
+"""
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+from future.utils import raise_from
+
+from splitio.api import APIException
+from splitio.api.client import HttpClient, HttpClientException, HttpResponse, _encode_body
+from splitio.api.splits import SplitsAPI
+from splitio.api.segments import SegmentsAPI
+from splitio.api.impressions import ImpressionsAPI
+from splitio.api.events import EventsAPI
+from splitio.api.telemetry import TelemetryAPI
+
+try:
+    from aiohttp import ClientSession, ClientTimeout, TCPConnector
+except ImportError:
+    def missing_aiohttp_dependencies(*_, **__):
+        """Fail if missing dependencies are used."""
+        raise NotImplementedError(
+            'Missing asyncio support dependencies. '
+            'Please use `pip install splitio_client[asyncio]` to install the sdk with asyncio '
+            'support'
+        )
+    ClientSession = ClientTimeout = TCPConnector = missing_aiohttp_dependencies
+
+
+class AsyncHttpClient(object):
+    """
+    Asyncio counterpart of `splitio.api.client.HttpClient`.
+
+    Requests are issued on the running event loop through one aiohttp session per server,
+    which is created on first use.
+    """
+
+    def __init__(self, timeout=None, sdk_url=None, events_url=None, compression=False,  #pylint: disable=too-many-arguments
+                 sdk_pool_size=HttpClient.DEFAULT_SDK_POOL_SIZE,
+                 events_pool_size=HttpClient.DEFAULT_EVENTS_POOL_SIZE):
+        """
+        Class constructor.
+
+        :param timeout: How many milliseconds to wait until the server responds.
+        :type timeout: int
+        :param sdk_url: Optional alternative sdk URL.
+        :type sdk_url: str
+        :param events_url: Optional alternative events URL.
+        :type events_url: str
+        :param compression: Whether to gzip POST bodies.
+        :type compression: bool
+        :param sdk_pool_size: How many connections to hold open to the sdk server.
+        :type sdk_pool_size: int
+        :param events_pool_size: How many connections to hold open to the events server.
+        :type events_pool_size: int
+        """
+        self._timeout = ClientTimeout(total=timeout / 1000 if timeout else None)
+        self._compression = compression
+        self._urls = {
+            'sdk': sdk_url if sdk_url is not None else HttpClient.SDK_URL,
+            'events': events_url if events_url is not None else HttpClient.EVENTS_URL,
+        }
+        self._pool_sizes = {'sdk': sdk_pool_size, 'events': events_pool_size}
+        self._sessions = {}
+
+    def _get_session(self, server):
+        """
+        Return the session of a server, building it on the running loop if needed.
+
+        :param server: Whether the session is for SDK server or Events server.
+        :type server: str
+
+        :rtype: aiohttp.ClientSession
+        """
+        session = self._sessions.get(server)
+        if session is None:
+            session = ClientSession(
+                connector=TCPConnector(limit=self._pool_sizes[server]),
+                timeout=self._timeout
+            )
+            self._sessions[server] = session
+        return session
+
+    async def close(self):
+        """Close every session and the connections they hold."""
+        sessions = list(self._sessions.values())
+        self._sessions = {}
+        for session in sessions:
+            await session.close()
+
+    def _build_headers(self, apikey, extra_headers):
+        """
+        Build the request headers.
+
+        :param apikey: API token used to identify backend calls.
+        :type apikey: str
+        :param extra_headers: key/value pairs of possible extra headers.
+        :type extra_headers: dict
+
+        :rtype: dict
+        """
+        headers = HttpClient._build_basic_headers(apikey)  #pylint: disable=protected-access
+        if extra_headers is not None:
+            headers.update(extra_headers)
+        return headers
+
+    async def get(self, server, path, apikey, query=None, extra_headers=None):  #pylint: disable=too-many-arguments
+        """
+        Issue a get request.
+
+        :param server: Whether the request is for SDK server or Events server.
+        :typee server: str
+        :param path: path to append to the host url.
+        :type path: str
+        :param apikey: api token.
+        :type apikey: str
+        :param query: Query string passed as dictionary.
+        :type query: dict
+        :param extra_headers: key/value pairs of possible extra headers.
+        :type extra_headers: dict
+
+        :return: Tuple of status_code, response text & response headers
+        :rtype: HttpResponse
+        """
+        headers = self._build_headers(apikey, extra_headers)
+        try:
+            async with self._get_session(server).get(
+                    self._urls[server] + path,
+                    params=query,
+                    headers=headers
+            ) as response:
+                body = await response.text()
+                return HttpResponse(response.status, body, response.headers)
+        except Exception as exc:  #pylint: disable=broad-except
+            raise_from(HttpClientException('aiohttp library is throwing exceptions'), exc)
+
+    async def post(self, server, path, apikey, body, query=None, extra_headers=None):  #pylint: disable=too-many-arguments
+        """
+        Issue a POST request.
+
+        :param server: Whether the request is for SDK server or Events server.
+        :typee server: str
+        :param path: path to append to the host url.
+        :type path: str
+        :param apikey: api token.
+        :type apikey: str
+        :param body: body sent in the request. Generators are sent as JSON arrays.
+        :type body: object
+        :param query: Query string passed as dictionary.
+        :type query: dict
+        :param extra_headers: key/value pairs of possible extra headers.
+        :type extra_headers: dict
+
+        :return: Tuple of status_code & response text
+        :rtype: HttpResponse
+        """
+        headers = self._build_headers(apikey, extra_headers)
+        if self._compression:
+            headers['Content-Encoding'] = 'gzip'
+
+        try:
+            async with self._get_session(server).post(
+                    self._urls[server] + path,
+                    data=b''.join(_encode_body(body, self._compression)),
+                    params=query,
+                    headers=headers
+            ) as response:
+                return HttpResponse(response.status, await response.text())
+        except Exception as exc:  #pylint: disable=broad-except
+            raise_from(HttpClientException('aiohttp library is throwing exceptions'), exc)
+
+
+class AsyncSplitsAPI(SplitsAPI):  #pylint: disable=too-few-public-methods
+    """Splits API that fetches through an `AsyncHttpClient`."""
+
+    async def fetch_splits(self, change_number):
+        """
+        Fetch splits from backend. See `SplitsAPI.fetch_splits`.
+
+        :param changeNumber: Last known timestamp of a split modification.
+        :type changeNumber: int
+
+        :return: Json representation of a splitChanges response.
+        :rtype: dict
+        """
+        try:
+            response = await self._client.get(
+                'sdk',
+                '/splitChanges',
+                self._apikey,
+                {'since': change_number},
+                self._build_headers(change_number)
+            )
+            return self._parse_response(change_number, response)
+        except HttpClientException as exc:
+            self._logger.error('Http client is throwing exceptions')
+            self._logger.debug('Error: ', exc_info=True)
+            raise_from(APIException('Splits not fetched correctly.'), exc)
+
+
+class AsyncSegmentsAPI(SegmentsAPI):  #pylint: disable=too-few-public-methods
+    """Segments API that fetches through an `AsyncHttpClient`."""
+
+    async def fetch_segment(self, segment_name, change_number):
+        """
+        Fetch segment changes from backend. See `SegmentsAPI.fetch_segment`.
+
+        :param segment_name: Name of the segment to fetch changes for.
+        :type segment_name: str
+        :param change_number: Last known timestamp of a segment modification.
+        :type change_number: int
+
+        :return: Json representation of a segmentChange response.
+        :rtype: dict
+        """
+        try:
+            response = await self._client.get(
+                'sdk',
+                '/segmentChanges/{segment_name}'.format(segment_name=segment_name),
+                self._apikey,
+                {'since': change_number},
+                self._build_headers(segment_name, change_number)
+            )
+            return self._parse_response(segment_name, change_number, response)
+        except HttpClientException as exc:
+            self._logger.error('Http client is throwing exceptions')
+            self._logger.debug('Error: ', exc_info=True)
+            raise_from(APIException('Segments not fetched properly.'), exc)
+
+
+class _AsyncPostMixin(object):  #pylint: disable=too-few-public-methods
+    """Post data-recording bulks through an `AsyncHttpClient`."""
+
+    async def _post_bulk(self, path, bulk, error_message):
+        """
+        Post a bulk to the events server.
+
+        :param path: Path of the endpoint.
+        :type path: str
+        :param bulk: Bulk to send.
+        :type bulk: object
+        :param error_message: Message of the APIException raised if the client fails.
+        :type error_message: str
+        """
+        try:
+            response = await self._client.post(
+                'events',
+                path,
+                self._apikey,
+                body=bulk,
+                extra_headers=self._metadata
+            )
+            if not 200 <= response.status_code < 300:
+                raise APIException(response.body, response.status_code)
+        except HttpClientException as exc:
+            self._logger.error('Http client is throwing exceptions')
+            self._logger.debug('Error: ', exc_info=True)
+            raise_from(APIException(error_message), exc)
+
+
+class AsyncImpressionsAPI(_AsyncPostMixin, ImpressionsAPI):
+    """Impressions API that posts through an `AsyncHttpClient`."""
+
+    async def flush_impressions(self, impressions):
+        """
+        Send impressions to the backend.
+
+        :param impressions: Impressions bulk
+        :type impressions: list
+        """
+        await self._post_bulk(
+            '/testImpressions/bulk',
+            self._build_bulk(impressions),
+            'Impressions not flushed properly.'
+        )
+
+    async def flush_counters(self, counters):
+        """
+        Send impression counts to the backend.
+
+        :param counters: Impression counts per feature per hour.
+        :type counters: list(splitio.models.impressions.ImpressionCount)
+        """
+        bulk = {
+            'pf': [
+                {'f': counter.feature_name, 'm': counter.time_frame, 'rc': counter.count}
+                for counter in counters
+            ]
+        }
+        await self._post_bulk(
+            '/testImpressions/count',
+            bulk,
+            'Impression counts not flushed properly.'
+        )
+
+
+class AsyncEventsAPI(_AsyncPostMixin, EventsAPI):  #pylint: disable=too-few-public-methods
+    """Events API that posts through an `AsyncHttpClient`."""
+
+    async def flush_events(self, events):
+        """
+        Send events to the backend.
+
+        :param events: Events bulk
+        :type events: list
+        """
+        await self._post_bulk(
+            '/events/bulk',
+            self._build_bulk(events),
+            'Events not flushed properly.'
+        )
+
+
+class AsyncTelemetryAPI(_AsyncPostMixin, TelemetryAPI):
+    """Telemetry API that posts through an `AsyncHttpClient`."""
+
+    async def flush_latencies(self, latencies):
+        """
+        Submit latencies to the backend.
+
+        :param latencies: List of latency buckets with their respective count.
+        :type latencies: list
+        """
+        await self._post_bulk(
+            '/metrics/times',
+            self._build_latencies(latencies),
+            'Latencies not flushed correctly.'
+        )
+
+    async def flush_gauges(self, gauges):
+        """
+        Submit gauges to the backend.
+
+        :param gauges: Gauges measured to be sent to the backend.
+        :type gauges: List
+        """
+        await self._post_bulk(
+            '/metrics/gauge',
+            self._build_gauges(gauges),
+            'Gauges not flushed correctly.'
+        )
+
+    async def flush_counters(self, counters):
+        """
+        Submit counters to the backend.
+
+        :param counters: Counters measured to be sent to the backend.
+        :type counters: List
+        """
+        await self._post_bulk(
+            '/metrics/counters',
+            self._build_counters(counters),
+            'Counters not flushed correctly.'
+        )
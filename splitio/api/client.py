@@ -1,12 +1,89 @@
 """Synchronous HTTP Client for split API."""
 from __future__ import division
 
+import json
+import zlib
 from collections import namedtuple
 
 from future.utils import raise_from
 import requests
+from requests.adapters import HTTPAdapter
+import six
 
-HttpResponse = namedtuple('HttpResponse', ['status_code', 'body'])
+HttpResponse = namedtuple('HttpResponse', ['status_code', 'body', 'headers'])
+HttpResponse.__new__.__defaults__ = (None,)
+
+_ENCODER = json.JSONEncoder(separators=(',', ':'))
+_BODY_CHUNK_SIZE = 65536
+
+
+def _iter_json(body):
+    """
+    Serialize a request body to JSON incrementally.
+
+    Lists & dicts are encoded as usual. Any other iterable (ie: a generator) is encoded as a
+    JSON array, one item at a time, without materializing it.
+
+    :param body: Body to serialize.
+    :type body: object
+
+    :return: Generator of JSON text chunks.
+    :rtype: generator
+    """
+    if isinstance(body, (list, tuple, dict, six.string_types)) or body is None or \
+            not hasattr(body, '__iter__'):
+        for chunk in _ENCODER.iterencode(body):
+            yield chunk
+        return
+
+    yield '['
+    for index, item in enumerate(body):
+        if index > 0:
+            yield ','
+        for chunk in _ENCODER.iterencode(item):
+            yield chunk
+    yield ']'
+
+
+def _encode_body(body, compress):
+    """
+    Serialize a request body to (optionally gzipped) JSON, in chunks of about 64KB.
+
+    JSON tokens are buffered before being encoded & compressed, so the compressor runs once
+    per chunk instead of once per token. Empty chunks are never yielded, since they'd end a
+    chunked request body early.
+
+    :param body: Body to serialize.
+    :type body: object
+    :param compress: Whether to gzip the serialized body.
+    :type compress: bool
+
+    :return: Generator of serialized body chunks.
+    :rtype: generator
+    """
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, 16 + zlib.MAX_WBITS) \
+        if compress else None
+    tokens = []
+    buffered = 0
+    for token in _iter_json(body):
+        tokens.append(token)
+        buffered += len(token)
+        if buffered < _BODY_CHUNK_SIZE:
+            continue
+
+        chunk = ''.join(tokens).encode('utf-8')
+        tokens = []
+        buffered = 0
+        if compressor is not None:
+            chunk = compressor.compress(chunk)
+        if chunk:
+            yield chunk
+
+    chunk = ''.join(tokens).encode('utf-8')
+    if compressor is not None:
+        chunk = compressor.compress(chunk) + compressor.flush()
+    if chunk:
+        yield chunk
 
 
 class HttpClientException(Exception):
@@ -28,7 +105,11 @@ class HttpClient(object):
     SDK_URL = 'https://sdk.split.io/api'
     EVENTS_URL = 'https://events.split.io/api'
 
-    def __init__(self, timeout=None, sdk_url=None, events_url=None):
+    DEFAULT_SDK_POOL_SIZE = 20
+    DEFAULT_EVENTS_POOL_SIZE = 5
+
+    def __init__(self, timeout=None, sdk_url=None, events_url=None, compression=False,  #pylint: disable=too-many-arguments
+                 sdk_pool_size=DEFAULT_SDK_POOL_SIZE, events_pool_size=DEFAULT_EVENTS_POOL_SIZE):
         """
         Class constructor.
 
@@ -38,12 +119,65 @@ class HttpClient(object):
         :type sdk_url: str
         :param events_url: Optional alternative events URL.
         :type events_url: str
+        :param compression: Whether to gzip POST bodies.
+        :type compression: bool
+        :param sdk_pool_size: How many keep-alive connections to hold to the sdk server.
+        :type sdk_pool_size: int
+        :param events_pool_size: How many keep-alive connections to hold to the events server.
+        :type events_pool_size: int
         """
         self._timeout = timeout / 1000  if timeout else None  # Convert ms to seconds.
+        self._compression = compression
         self._urls = {
             'sdk': sdk_url if sdk_url is not None else self.SDK_URL,
             'events': events_url if events_url is not None else self.EVENTS_URL,
         }
+        self._sessions = {
+            'sdk': self._build_session(sdk_pool_size),
+            'events': self._build_session(events_pool_size),
+        }
+
+    @staticmethod
+    def _build_session(pool_size):
+        """
+        Build a session that reuses up to `pool_size` connections per host.
+
+        :param pool_size: Maximum number of connections kept alive per host.
+        :type pool_size: int
+
+        :rtype: requests.Session
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def get_connection_stats(self):
+        """
+        Return how many requests were issued & how many connections were opened per server.
+
+        :return: Dict of server -> {'requests': int, 'connections': int}
+        :rtype: dict
+        """
+        stats = {}
+        for server, session in six.iteritems(self._sessions):
+            pools = session.get_adapter('https://').poolmanager.pools
+            requests_count = 0
+            connections_count = 0
+            for pool_key in pools.keys():
+                pool = pools.get(pool_key)
+                if pool is None:
+                    continue
+                requests_count += pool.num_requests
+                connections_count += pool.num_connections
+            stats[server] = {'requests': requests_count, 'connections': connections_count}
+        return stats
+
+    def close(self):
+        """Close every pooled connection."""
+        for session in self._sessions.values():
+            session.close()
 
     def _build_url(self, server, path):
         """
@@ -87,7 +221,7 @@ class HttpClient(object):
         :param extra_headers: key/value pairs of possible extra headers.
         :type extra_headers: dict
 
-        :return: Tuple of status_code & response text
+        :return: Tuple of status_code, response text & response headers
         :rtype: HttpResponse
         """
         headers = self._build_basic_headers(apikey)
@@ -96,13 +230,13 @@ class HttpClient(object):
             headers.update(extra_headers)
 
         try:
-            response = requests.get(
+            response = self._sessions[server].get(
                 self._build_url(server, path),
                 params=query,
                 headers=headers,
                 timeout=self._timeout
             )
-            return HttpResponse(response.status_code, response.text)
+            return HttpResponse(response.status_code, response.text, response.headers)
         except Exception as exc:  #pylint: disable=broad-except
             raise_from(HttpClientException('requests library is throwing exceptions'), exc)
 
@@ -116,8 +250,9 @@ class HttpClient(object):
         :type path: str
         :param apikey: api token.
         :type apikey: str
-        :param body: body sent in the request.
-        :type body: str
+        :param body: body sent in the request. Generators are sent as JSON arrays. Unless
+            it's an uncompressed list or dict, the body is streamed as it's serialized.
+        :type body: object
         :param query: Query string passed as dictionary.
         :type query: dict
         :param extra_headers: key/value pairs of possible extra headers.
@@ -131,14 +266,26 @@ class HttpClient(object):
         if extra_headers is not None:
             headers.update(extra_headers)
 
+        if self._compression:
+            headers['Content-Encoding'] = 'gzip'
+
         try:
-            response = requests.post(
-                self._build_url(server, path),
-                json=body,
-                params=query,
-                headers=headers,
-                timeout=self._timeout
-            )
+            if not self._compression and isinstance(body, (list, dict)):
+                response = self._sessions[server].post(
+                    self._build_url(server, path),
+                    json=body,
+                    params=query,
+                    headers=headers,
+                    timeout=self._timeout
+                )
+            else:
+                response = self._sessions[server].post(
+                    self._build_url(server, path),
+                    data=_encode_body(body, self._compression),
+                    params=query,
+                    headers=headers,
+                    timeout=self._timeout
+                )
             return HttpResponse(response.status_code, response.text)
         except Exception as exc:  #pylint: disable=broad-except
             raise_from(HttpClientException('requests library is throwing exceptions'), exc)
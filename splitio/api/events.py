@@ -34,10 +34,10 @@ class EventsAPI(object):  # pylint: disable=too-few-public-methods
         :param events: Events to be bundled.
         :type events: list(splitio.models.events.Event)
 
-        :return: Formatted bulk.
-        :rtype: dict
+        :return: Generator of formatted events, serialized lazily by the client.
+        :rtype: generator
         """
-        return [
+        return (
             {
                 'key': event.key,
                 'trafficTypeName': event.traffic_type_name,
@@ -47,7 +47,7 @@ class EventsAPI(object):  # pylint: disable=too-few-public-methods
                 'properties': event.properties,
             }
             for event in events
-        ]
+        )
 
     def flush_events(self, events):
         """
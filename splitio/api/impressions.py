@@ -34,11 +34,14 @@ class ImpressionsAPI(object):  # pylint: disable=too-few-public-methods
         :param impressions: List of impressions to bundle.
         :type impressions: list(splitio.models.impressions.Impression)
 
-        :return: Dictionary of lists of impressions.
-        :rtype: dict
+        :return: Generator of impressions grouped by feature, serialized lazily by the client.
+        :rtype: generator
         """
-        return [
-            {
+        for (test_name, imps) in groupby(
+                sorted(impressions, key=lambda i: i.feature_name),
+                lambda i: i.feature_name
+        ):
+            yield {
                 'testName': test_name,
                 'keyImpressions': [
                     {
@@ -52,11 +55,6 @@ class ImpressionsAPI(object):  # pylint: disable=too-few-public-methods
                     for impression in imps
                 ]
             }
-            for (test_name, imps) in groupby(
-                sorted(impressions, key=lambda i: i.feature_name),
-                lambda i: i.feature_name
-            )
-        ]
 
     def flush_impressions(self, impressions):
         """
@@ -80,3 +78,31 @@ class ImpressionsAPI(object):  # pylint: disable=too-few-public-methods
             self._logger.error('Http client is throwing exceptions')
             self._logger.debug('Error: ', exc_info=True)
             raise_from(APIException('Impressions not flushed properly.'), exc)
+
+    def flush_counters(self, counters):
+        """
+        Send impression counts to the backend.
+
+        :param counters: Impression counts per feature per hour.
+        :type counters: list(splitio.models.impressions.ImpressionCount)
+        """
+        bulk = {
+            'pf': [
+                {'f': counter.feature_name, 'm': counter.time_frame, 'rc': counter.count}
+                for counter in counters
+            ]
+        }
+        try:
+            response = self._client.post(
+                'events',
+                '/testImpressions/count',
+                self._apikey,
+                body=bulk,
+                extra_headers=self._metadata
+            )
+            if not 200 <= response.status_code < 300:
+                raise APIException(response.body, response.status_code)
+        except HttpClientException as exc:
+            self._logger.error('Http client is throwing exceptions')
+            self._logger.debug('Error: ', exc_info=True)
+            raise_from(APIException('Impression counts not flushed properly.'), exc)
@@ -24,11 +24,59 @@ class SegmentsAPI(object):  #pylint: disable=too-few-public-methods
         self._logger = logging.getLogger(self.__class__.__name__)
         self._client = http_client
         self._apikey = apikey
+        self._etags = {}
+
+    def _build_headers(self, segment_name, change_number):
+        """
+        Return the headers of a fetch, conditional if an ETag is known for the change number.
+
+        :param segment_name: Name of the segment to fetch changes for.
+        :type segment_name: str
+        :param change_number: Last known timestamp of a segment modification.
+        :type change_number: int
+
+        :rtype: dict
+        """
+        etag_change_number, etag = self._etags.get(segment_name, (None, None))
+        if etag is not None and etag_change_number == change_number:
+            return {'If-None-Match': etag}
+        return None
+
+    def _parse_response(self, segment_name, change_number, response):
+        """
+        Parse a segmentChanges response, remembering its ETag.
+
+        :param segment_name: Name of the fetched segment.
+        :type segment_name: str
+        :param change_number: Change number the fetch was made with.
+        :type change_number: int
+        :param response: Backend response.
+        :type response: splitio.api.client.HttpResponse
+
+        :return: Json representation of a segmentChange response.
+        :rtype: dict
+        """
+        if response.status_code == 304:
+            return {
+                'name': segment_name,
+                'added': [],
+                'removed': [],
+                'since': change_number,
+                'till': change_number
+            }
+        if 200 <= response.status_code < 300:
+            self._etags[segment_name] = (change_number, (response.headers or {}).get('ETag'))
+            return json.loads(response.body)
+        raise APIException(response.body, response.status_code)
 
     def fetch_segment(self, segment_name, change_number):
         """
         Fetch splits from backend.
 
+        If the previous fetch of this segment for the same change number returned an ETag,
+        the request is made conditional, and a 304 response is returned as an empty change
+        without parsing.
+
         :param segment_name: Name of the segment to fetch changes for.
         :type segment_name: str
         :param change_number: Last known timestamp of a split modification.
@@ -42,13 +90,10 @@ class SegmentsAPI(object):  #pylint: disable=too-few-public-methods
                 'sdk',
                 '/segmentChanges/{segment_name}'.format(segment_name=segment_name),
                 self._apikey,
-                {'since': change_number}
+                {'since': change_number},
+                self._build_headers(segment_name, change_number)
             )
-
-            if 200 <= response.status_code < 300:
-                return json.loads(response.body)
-            else:
-                raise APIException(response.body, response.status_code)
+            return self._parse_response(segment_name, change_number, response)
         except HttpClientException as exc:
             self._logger.error('Http client is throwing exceptions')
             self._logger.debug('Error: ', exc_info=True)
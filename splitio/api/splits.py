@@ -24,11 +24,48 @@ class SplitsAPI(object):  #pylint: disable=too-few-public-methods
         self._logger = logging.getLogger(self.__class__.__name__)
         self._client = client
         self._apikey = apikey
+        self._etag = (None, None)
+
+    def _build_headers(self, change_number):
+        """
+        Return the headers of a fetch, conditional if an ETag is known for the change number.
+
+        :param change_number: Last known timestamp of a split modification.
+        :type change_number: int
+
+        :rtype: dict
+        """
+        etag_change_number, etag = self._etag
+        if etag is not None and etag_change_number == change_number:
+            return {'If-None-Match': etag}
+        return None
+
+    def _parse_response(self, change_number, response):
+        """
+        Parse a splitChanges response, remembering its ETag.
+
+        :param change_number: Change number the fetch was made with.
+        :type change_number: int
+        :param response: Backend response.
+        :type response: splitio.api.client.HttpResponse
+
+        :return: Json representation of a splitChanges response.
+        :rtype: dict
+        """
+        if response.status_code == 304:
+            return {'splits': [], 'since': change_number, 'till': change_number}
+        if 200 <= response.status_code < 300:
+            self._etag = (change_number, (response.headers or {}).get('ETag'))
+            return json.loads(response.body)
+        raise APIException(response.body, response.status_code)
 
     def fetch_splits(self, change_number):
         """
         Fetch splits from backend.
 
+        If the previous fetch for the same change number returned an ETag, the request is
+        made conditional, and a 304 response is returned as an empty change without parsing.
+
         :param changeNumber: Last known timestamp of a split modification.
         :type changeNumber: int
 
@@ -40,12 +77,10 @@ class SplitsAPI(object):  #pylint: disable=too-few-public-methods
                 'sdk',
                 '/splitChanges',
                 self._apikey,
-                {'since': change_number}
+                {'since': change_number},
+                self._build_headers(change_number)
             )
-            if 200 <= response.status_code < 300:
-                return json.loads(response.body)
-            else:
-                raise APIException(response.body, response.status_code)
+            return self._parse_response(change_number, response)
         except HttpClientException as exc:
             self._logger.error('Http client is throwing exceptions')
             self._logger.debug('Error: ', exc_info=True)
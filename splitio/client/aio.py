@@ -0,0 +1,509 @@
+"""
+Asyncio flavor of the Split.io SDK.
+
+`get_async_factory` builds a standalone (in-memory) factory whose HTTP requests and
+synchronization tasks run on the event loop, without spawning threads. Its clients evaluate
+inline, since evaluating against in-memory storages never waits on I/O.
+
+Redis & uWSGI storages are blocking, so those factories are built with
+`splitio.get_factory` as usual, and `build_executor_client` wraps their clients to run each
+call on an executor thread instead of the event loop.
+
+This module requires python 3.5+ and, for `get_async_factory`, aiohttp.
+"""
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from splitio.api import APIException
+from splitio.client import input_validator, util
+from splitio.client.config import DEFAULT_CONFIG
+from splitio.client.factory import SplitFactory, Status, TimeoutException, \
+    _INSTANTIATED_FACTORIES, _INSTANTIATED_FACTORIES_LOCK, _warn_on_existing_factories, \
+    _wrap_impression_listener, _build_impressions_manager
+from splitio.engine.impressions import ImpressionsMode, Counter as ImpressionsCounter
+from splitio.storage.inmemmory import InMemorySplitStorage, InMemorySegmentStorage, \
+    InMemoryImpressionStorage, InMemoryEventStorage, InMemoryTelemetryStorage
+from splitio.api.aio import AsyncHttpClient, AsyncSplitsAPI, AsyncSegmentsAPI, \
+    AsyncImpressionsAPI, AsyncEventsAPI, AsyncTelemetryAPI
+from splitio.tasks.aio import AsyncSplitSynchronizationTask, AsyncSegmentSynchronizationTask, \
+    AsyncImpressionsSyncTask, AsyncImpressionsCountSyncTask, AsyncEventsSyncTask, \
+    AsyncTelemetrySynchronizationTask
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AsyncClient(object):
+    """
+    Client of an `AsyncSplitFactory`.
+
+    Evaluations & tracking run inline on the event loop. Only `destroy` awaits I/O, since it
+    flushes pending impressions & events.
+    """
+
+    def __init__(self, factory, client):
+        """
+        Class constructor.
+
+        :param factory: Factory holding the client.
+        :type factory: AsyncSplitFactory
+        :param client: Regular client reading the factory's in-memory storages.
+        :type client: splitio.client.client.Client
+        """
+        self._factory = factory
+        self._client = client
+
+    @property
+    def ready(self):
+        """Return whether the SDK initialization has finished."""
+        return self._client.ready
+
+    @property
+    def destroyed(self):
+        """Return whether the factory holding this client has been destroyed."""
+        return self._client.destroyed
+
+    async def get_treatment(self, key, feature, attributes=None):
+        """
+        Get the treatment for a feature and key. See `Client.get_treatment`.
+
+        :rtype: str
+        """
+        return self._client.get_treatment(key, feature, attributes)
+
+    async def get_treatment_with_config(self, key, feature, attributes=None):
+        """
+        Get the treatment & config for a feature and key. See `Client.get_treatment_with_config`.
+
+        :rtype: tuple(str, str)
+        """
+        return self._client.get_treatment_with_config(key, feature, attributes)
+
+    async def get_treatments(self, key, features, attributes=None):
+        """
+        Get the treatments for a list of features. See `Client.get_treatments`.
+
+        :rtype: dict
+        """
+        return self._client.get_treatments(key, features, attributes)
+
+    async def get_treatments_with_config(self, key, features, attributes=None):
+        """
+        Get treatments & configs for a list of features. See `Client.get_treatments_with_config`.
+
+        :rtype: dict
+        """
+        return self._client.get_treatments_with_config(key, features, attributes)
+
+    async def get_treatments_bulk(self, keys, features, attributes_per_key=None):
+        """
+        Get treatments for many keys & features. See `Client.get_treatments_bulk`.
+
+        :rtype: list(dict)
+        """
+        return self._client.get_treatments_bulk(keys, features, attributes_per_key)
+
+    async def track(self, key, traffic_type, event_type, value=None, properties=None):  #pylint: disable=too-many-arguments
+        """
+        Track an event. See `Client.track`.
+
+        :rtype: bool
+        """
+        return self._client.track(key, traffic_type, event_type, value, properties)
+
+    async def destroy(self):
+        """Destroy the underlying factory. See `AsyncSplitFactory.destroy`."""
+        await self._factory.destroy()
+
+
+class AsyncSplitFactory(SplitFactory):  #pylint: disable=too-many-instance-attributes
+    """Split factory whose synchronization tasks run on the event loop."""
+
+    def __init__(self, apikey, storages, labels_enabled, apis, tasks, http_client,  #pylint: disable=too-many-arguments
+                 splits_ready_flag, segments_ready_flag, **kwargs):
+        """
+        Class constructor. Must be called from a coroutine, since it starts the tasks.
+
+        :param storages: Dictionary of storages for all split models.
+        :type storages: dict
+        :param labels_enabled: Whether the impressions should store labels or not.
+        :type labels_enabled: bool
+        :param apis: Dictionary of apis client wrappers
+        :type apis: dict
+        :param tasks: Dictionary of sychronization tasks
+        :type tasks: dict
+        :param http_client: HTTP client closed when the factory is destroyed.
+        :type http_client: splitio.api.aio.AsyncHttpClient
+        :param splits_ready_flag: Event set by the split task after the initial sync.
+        :type splits_ready_flag: asyncio.Event
+        :param segments_ready_flag: Event set by the segment task after the initial sync.
+        :type segments_ready_flag: asyncio.Event
+
+        Other keyword arguments are passed to `SplitFactory`.
+        """
+        SplitFactory.__init__(self, apikey, storages, labels_enabled, apis, tasks, **kwargs)
+        self._status = Status.NOT_INITIALIZED
+        self._http_client = http_client
+        self._sdk_ready_flag = asyncio.Event()
+        self._starter = asyncio.ensure_future(
+            self._start_tasks(splits_ready_flag, segments_ready_flag)
+        )
+
+    async def _start_tasks(self, splits_ready_flag, segments_ready_flag):
+        """
+        Start the tasks, segments once splits are synced, and set the ready flag.
+
+        :param splits_ready_flag: Event set by the split task after the initial sync.
+        :type splits_ready_flag: asyncio.Event
+        :param segments_ready_flag: Event set by the segment task after the initial sync.
+        :type segments_ready_flag: asyncio.Event
+        """
+        for name, task in self._tasks.items():
+            if name != 'segments':
+                task.start()
+
+        await splits_ready_flag.wait()
+        self._tasks['segments'].start()
+        await segments_ready_flag.wait()
+        self._status = Status.READY
+        self._sdk_ready_flag.set()
+
+    def client(self):
+        """
+        Return a new client.
+
+        :rtype: AsyncClient
+        """
+        return AsyncClient(self, SplitFactory.client(self))
+
+    async def block_until_ready(self, timeout=None):
+        """
+        Wait until the sdk is ready or the timeout specified by the user expires.
+
+        :param timeout: Number of seconds to wait (fractions allowed)
+        :type timeout: int
+        """
+        try:
+            await asyncio.wait_for(self._sdk_ready_flag.wait(), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutException('SDK Initialization: time of %d exceeded' % timeout)
+
+    async def destroy(self):  #pylint: disable=arguments-differ
+        """
+        Destroy the factory and render clients unusable.
+
+        Stops the tasks, waiting until they flush impressions & events, and closes the HTTP
+        sessions.
+        """
+        if self.destroyed:
+            self._logger.info('Factory already destroyed.')
+            return
+
+        try:
+            self._starter.cancel()
+            await asyncio.gather(*[task.stop() for task in self._tasks.values()])
+            await self._http_client.close()
+        finally:
+            self._status = Status.DESTROYED
+            with _INSTANTIATED_FACTORIES_LOCK:
+                _INSTANTIATED_FACTORIES.subtract([self._apikey])
+
+
+async def _validate_apikey_type(segment_api):
+    """
+    Try to guess if the apikey is of browser type and let the user know.
+
+    See `splitio.client.input_validator.validate_apikey_type`.
+
+    :param segment_api: Segments API client.
+    :type segment_api: splitio.api.aio.AsyncSegmentsAPI
+    """
+    api_messages_filter = input_validator._ApiLogFilter()  #pylint: disable=protected-access
+    try:
+        segment_api._logger.addFilter(api_messages_filter)  #pylint: disable=protected-access
+        await segment_api.fetch_segment('__SOME_INVALID_SEGMENT__', -1)
+    except APIException as exc:
+        if exc.status_code == 403:
+            _LOGGER.error('factory instantiation: you passed a browser type '
+                          + 'api_key, please grab an api key from the Split '
+                          + 'console that is of type sdk')
+            return False
+    finally:
+        segment_api._logger.removeFilter(api_messages_filter)  #pylint: disable=protected-access
+
+    # True doesn't mean that the APIKEY is right, only that it's not of type "browser"
+    return True
+
+
+async def _build_async_factory(api_key, config, sdk_url=None, events_url=None):  #pylint: disable=too-many-locals
+    """Build and return an asyncio split factory tailored to the supplied config."""
+    if not input_validator.validate_factory_instantiation(api_key):
+        return None
+
+    cfg = DEFAULT_CONFIG.copy()
+    cfg.update(config)
+
+    http_client = AsyncHttpClient(
+        sdk_url=sdk_url,
+        events_url=events_url,
+        timeout=cfg.get('connectionTimeout'),
+        compression=cfg['requestCompressionEnabled'],
+        sdk_pool_size=cfg['sdkConnectionPoolSize'],
+        events_pool_size=cfg['eventsConnectionPoolSize']
+    )
+
+    sdk_metadata = util.get_metadata(cfg)
+    apis = {
+        'splits': AsyncSplitsAPI(http_client, api_key),
+        'segments': AsyncSegmentsAPI(http_client, api_key),
+        'impressions': AsyncImpressionsAPI(http_client, api_key, sdk_metadata),
+        'events': AsyncEventsAPI(http_client, api_key, sdk_metadata),
+        'telemetry': AsyncTelemetryAPI(http_client, api_key, sdk_metadata)
+    }
+
+    if not await _validate_apikey_type(apis['segments']):
+        await http_client.close()
+        return None
+
+    storages = {
+        'splits': InMemorySplitStorage(),
+        'segments': InMemorySegmentStorage(
+            cfg['segmentsCompactThreshold'],
+            cfg['segmentsCompactVerify']
+        ),
+        'impressions': InMemoryImpressionStorage(cfg['impressionsQueueSize']),
+        'events': InMemoryEventStorage(cfg['eventsQueueSize']),
+        'telemetry': InMemoryTelemetryStorage()
+    }
+
+    impressions_counter = ImpressionsCounter()
+    impressions_manager = _build_impressions_manager(cfg, impressions_counter)
+
+    # Synchronization flags
+    splits_ready_flag = asyncio.Event()
+    segments_ready_flag = asyncio.Event()
+
+    tasks = {
+        'splits': AsyncSplitSynchronizationTask(
+            apis['splits'],
+            storages['splits'],
+            cfg['featuresRefreshRate'],
+            splits_ready_flag
+        ),
+
+        'segments': AsyncSegmentSynchronizationTask(
+            apis['segments'],
+            storages['segments'],
+            storages['splits'],
+            cfg['segmentsRefreshRate'],
+            segments_ready_flag,
+            cfg['segmentsWorkerPoolSize'],
+            cfg['segmentsMaxRefreshRate'],
+            cfg['segmentsRequestBudget'],
+            storages['telemetry']
+        ),
+
+        'impressions': AsyncImpressionsSyncTask(
+            apis['impressions'],
+            storages['impressions'],
+            cfg['impressionsRefreshRate'],
+            cfg['impressionsBulkSize']
+        ),
+
+        'events': AsyncEventsSyncTask(
+            apis['events'],
+            storages['events'],
+            cfg['eventsPushRate'],
+            cfg['eventsBulkSize'],
+        ),
+
+        'telemetry': AsyncTelemetrySynchronizationTask(
+            apis['telemetry'],
+            storages['telemetry'],
+            cfg['metricsRefreshRate']
+        )
+    }
+
+    if impressions_manager.mode == ImpressionsMode.OPTIMIZED:
+        tasks['impressions_count'] = AsyncImpressionsCountSyncTask(
+            apis['impressions'],
+            impressions_counter,
+            cfg['impressionsCountRefreshRate']
+        )
+
+    if cfg['impressionsRecorderEnabled'] or cfg['snapshotWritePath']:
+        _LOGGER.warning(
+            'The impressions recorder & snapshot writer run on threads and are not supported '
+            'by the asyncio factory. Ignoring them.'
+        )
+
+    # Clients run on the loop, so a full queue just wakes the flush task up.
+    storages['events'].set_queue_full_hook(tasks['events'].flush)
+    storages['impressions'].set_queue_full_hook(tasks['impressions'].flush)
+
+    impression_listener = _wrap_impression_listener(cfg['impressionListener'], sdk_metadata)
+    return AsyncSplitFactory(
+        api_key,
+        storages,
+        cfg['labelsEnabled'],
+        apis,
+        tasks,
+        http_client,
+        splits_ready_flag,
+        segments_ready_flag,
+        impression_listener=impression_listener,
+        bucket_cache_size=cfg['bucketCacheSize'],
+        impressions_manager=impressions_manager
+    )
+
+
+async def get_async_factory(api_key, **kwargs):
+    """
+    Build and return a factory that synchronizes on the running event loop.
+
+    Only the standalone (in-memory) mode is supported. Redis, uWSGI, snapshot & localhost
+    factories are built with `splitio.get_factory`.
+
+    :rtype: AsyncSplitFactory
+    """
+    config = kwargs.get('config', {})
+    if api_key == 'localhost' or config.get('snapshotReadPath') or \
+            any(key in config for key in ('redisHost', 'redisSentinels', 'uwsgiClient')):
+        _LOGGER.error(
+            'factory instantiation: the asyncio factory only supports the standalone mode. '
+            'Use splitio.get_factory and build_executor_client instead.'
+        )
+        return None
+
+    with _INSTANTIATED_FACTORIES_LOCK:
+        _warn_on_existing_factories(api_key)
+        _INSTANTIATED_FACTORIES.update([api_key])
+
+    return await _build_async_factory(
+        api_key,
+        config,
+        kwargs.get('sdk_api_base_url'),
+        kwargs.get('events_api_base_url')
+    )
+
+
+class ExecutorClient(object):
+    """
+    Client wrapper whose calls return awaitable futures, for factories with blocking storages.
+
+    Every call is handed to an executor with `loop.run_in_executor`, so the event loop thread
+    isn't blocked while the regular client waits on storage I/O (ie: redis). The work itself
+    is still blocking and runs on executor threads, which bound how many calls can be in
+    flight at once.
+    """
+
+    def __init__(self, client, executor=None):
+        """
+        Class constructor.
+
+        :param client: Client to wrap.
+        :type client: splitio.client.client.Client
+        :param executor: Executor to run calls on. Defaults to the event loop's executor.
+        :type executor: concurrent.futures.Executor
+        """
+        self._client = client
+        self._executor = executor
+
+    def _submit(self, method, *args, **kwargs):
+        """
+        Run a client method on the executor.
+
+        :param method: Client method to call.
+        :type method: callable
+
+        :return: Future resolving to the method's result.
+        :rtype: asyncio.Future
+        """
+        loop = asyncio.get_event_loop()
+        return loop.run_in_executor(self._executor, functools.partial(method, *args, **kwargs))
+
+    @property
+    def ready(self):
+        """Return whether the SDK initialization has finished."""
+        return self._client.ready
+
+    @property
+    def destroyed(self):
+        """Return whether the factory holding this client has been destroyed."""
+        return self._client.destroyed
+
+    def get_treatment(self, key, feature, attributes=None):
+        """
+        Get the treatment for a feature and key. See `Client.get_treatment`.
+
+        :rtype: asyncio.Future
+        """
+        return self._submit(self._client.get_treatment, key, feature, attributes)
+
+    def get_treatment_with_config(self, key, feature, attributes=None):
+        """
+        Get the treatment & config for a feature and key. See `Client.get_treatment_with_config`.
+
+        :rtype: asyncio.Future
+        """
+        return self._submit(self._client.get_treatment_with_config, key, feature, attributes)
+
+    def get_treatments(self, key, features, attributes=None):
+        """
+        Get the treatments for a list of features. See `Client.get_treatments`.
+
+        :rtype: asyncio.Future
+        """
+        return self._submit(self._client.get_treatments, key, features, attributes)
+
+    def get_treatments_with_config(self, key, features, attributes=None):
+        """
+        Get treatments & configs for a list of features. See `Client.get_treatments_with_config`.
+
+        :rtype: asyncio.Future
+        """
+        return self._submit(self._client.get_treatments_with_config, key, features, attributes)
+
+    def get_treatments_bulk(self, keys, features, attributes_per_key=None):
+        """
+        Get treatments for many keys & features. See `Client.get_treatments_bulk`.
+
+        :rtype: asyncio.Future
+        """
+        return self._submit(self._client.get_treatments_bulk, keys, features, attributes_per_key)
+
+    def track(self, key, traffic_type, event_type, value=None, properties=None):  #pylint: disable=too-many-arguments
+        """
+        Track an event. See `Client.track`.
+
+        :rtype: asyncio.Future
+        """
+        return self._submit(self._client.track, key, traffic_type, event_type, value, properties)
+
+    def destroy(self):
+        """
+        Destroy the underlying factory. See `Client.destroy`.
+
+        :rtype: asyncio.Future
+        """
+        return self._submit(self._client.destroy)
+
+
+def build_executor_client(factory, max_workers=None):
+    """
+    Build an executor-backed client for a factory, for use from asyncio code.
+
+    :param factory: Split factory.
+    :type factory: splitio.client.factory.SplitFactory
+    :param max_workers: Size of a dedicated executor. Uses the event loop's executor if None.
+    :type max_workers: int
+
+    :rtype: ExecutorClient
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers) if max_workers else None
+    return ExecutorClient(factory.client(), executor)
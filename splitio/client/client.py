@@ -6,6 +6,7 @@ import logging
 import time
 import six
 from splitio.engine.evaluator import Evaluator, CONTROL
+from splitio.engine.impressions import Manager as ImpressionsManager
 from splitio.engine.splitters import Splitter
 from splitio.models.impressions import Impression, Label
 from splitio.models.events import Event, EventWrapper
@@ -21,8 +22,10 @@ class Client(object):  # pylint: disable=too-many-instance-attributes
     _METRIC_GET_TREATMENTS = 'sdk.getTreatments'
     _METRIC_GET_TREATMENT_WITH_CONFIG = 'sdk.getTreatmentWithConfig'
     _METRIC_GET_TREATMENTS_WITH_CONFIG = 'sdk.getTreatmentsWithConfig'
+    _METRIC_GET_TREATMENTS_BULK = 'sdk.getTreatmentsBulk'
 
-    def __init__(self, factory, labels_enabled=True, impression_listener=None):
+    def __init__(self, factory, labels_enabled=True, impression_listener=None,  # pylint: disable=too-many-arguments
+                 bucket_cache_size=0, impressions_recorder=None, impressions_manager=None):
         """
         Construct a Client instance.
 
@@ -35,19 +38,31 @@ class Client(object):  # pylint: disable=too-many-instance-attributes
         :param impression_listener: impression listener implementation
         :type impression_listener: ImpressionListener
 
+        :param bucket_cache_size: Maximum number of key buckets to memoize (0 disables it)
+        :type bucket_cache_size: int
+
+        :param impressions_recorder: Optional task that records impressions off-thread
+        :type impressions_recorder: splitio.tasks.impressions_recorder.ImpressionsRecorderTask
+
+        :param impressions_manager: Decides which impressions are stored (all by default)
+        :type impressions_manager: splitio.engine.impressions.Manager
+
         :rtype: Client
         """
         self._logger = logging.getLogger(self.__class__.__name__)
         self._factory = factory
         self._labels_enabled = labels_enabled
         self._impression_listener = impression_listener
+        self._impressions_recorder = impressions_recorder
+        self._impressions_manager = impressions_manager if impressions_manager is not None \
+            else ImpressionsManager()
 
-        self._splitter = Splitter()
         self._split_storage = factory._get_storage('splits')  # pylint: disable=protected-access
         self._segment_storage = factory._get_storage('segments')  # pylint: disable=protected-access
         self._impressions_storage = factory._get_storage('impressions')  # pylint: disable=protected-access
         self._events_storage = factory._get_storage('events')  # pylint: disable=protected-access
         self._telemetry_storage = factory._get_storage('telemetry')  # pylint: disable=protected-access
+        self._splitter = Splitter(bucket_cache_size, self._telemetry_storage)
         self._evaluator = Evaluator(self._split_storage, self._segment_storage, self._splitter)
 
     def destroy(self):
@@ -138,8 +153,7 @@ class Client(object):  # pylint: disable=too-many-instance-attributes
                 start
             )
 
-            self._record_stats([impression], start, metric_name)
-            self._send_impression_to_listener(impression, attributes)
+            self._record_stats([impression], start, metric_name, [attributes])
             return result['treatment'], result['configurations']
         except Exception:  # pylint: disable=broad-except
             self._logger.error('Error getting treatment for feature')
@@ -154,8 +168,7 @@ class Client(object):  # pylint: disable=too-many-instance-attributes
                     bucketing_key,
                     start
                 )
-                self._record_stats([impression], start, metric_name)
-                self._send_impression_to_listener(impression, attributes)
+                self._record_stats([impression], start, metric_name, [attributes])
             except Exception:  # pylint: disable=broad-except
                 self._logger.error('Error reporting impression into get_treatment exception block')
                 self._logger.debug('Error: ', exc_info=True)
@@ -215,9 +228,8 @@ class Client(object):  # pylint: disable=too-many-instance-attributes
             # Register impressions
             try:
                 if bulk_impressions:
-                    self._record_stats(bulk_impressions, start, self._METRIC_GET_TREATMENTS)
-                    for impression in bulk_impressions:
-                        self._send_impression_to_listener(impression, attributes)
+                    self._record_stats(bulk_impressions, start, self._METRIC_GET_TREATMENTS,
+                                       [attributes] * len(bulk_impressions))
             except Exception:  # pylint: disable=broad-except
                 self._logger.error('%s: An exception when trying to store '
                                    'impressions.' % method_name)
@@ -325,6 +337,124 @@ class Client(object):  # pylint: disable=too-many-instance-attributes
                                              self._METRIC_GET_TREATMENTS)
         return {feature: result[0] for (feature, result) in six.iteritems(with_config)}
 
+    def _evaluate_features_bulk_if_ready(self, matching_keys, bucketing_keys, features,
+                                         attributes=None):
+        if not self.ready:
+            return {
+                feature: {
+                    'treatments': [CONTROL] * len(matching_keys),
+                    'labels': [Label.NOT_READY] * len(matching_keys),
+                    'change_number': None
+                }
+                for feature in features
+            }
+
+        return self._evaluator.evaluate_features_bulk(
+            features,
+            matching_keys,
+            bucketing_keys,
+            attributes
+        )
+
+    def get_treatments_bulk(self, keys, features, attributes_per_key=None):  # pylint: disable=too-many-locals,too-many-return-statements
+        """
+        Evaluate multiple features for multiple keys in a single batch.
+
+        Hashing and bucket-to-treatment mapping are performed for all the keys at once for each
+        feature, and the resulting impressions are recorded with a single storage call. This
+        method never raises an exception. If there's a problem, the appropriate log message
+        will be generated and the method will return the CONTROL treatment.
+
+        :param keys: The keys for which to get the treatments
+        :type keys: list
+        :param features: Array of the names of the features for which to get the treatment
+        :type features: list
+        :param attributes_per_key: An optional list of attribute dictionaries, one per key
+        :type attributes_per_key: list
+        :return: Dictionary with a list of treatments (one per key, in order) for every feature
+        :rtype: dict
+        """
+        method_name = 'get_treatments_bulk'
+
+        def _control_columns(names):
+            return {name: [CONTROL] * len(keys) for name in names}
+
+        try:
+            if self.destroyed:
+                self._logger.error("Client has already been destroyed - no calls possible")
+                return _control_columns(features)
+
+            start = int(round(time.time() * 1000))
+
+            if attributes_per_key is not None and len(attributes_per_key) != len(keys):
+                self._logger.error('%s: attributes_per_key must have one entry per key.',
+                                   method_name)
+                return _control_columns(features)
+
+            features, missing = input_validator.validate_features_get_treatments(
+                method_name,
+                features,
+                self.ready,
+                self._factory._get_storage('splits')  # pylint: disable=protected-access
+            )
+            if features is None:
+                return {}
+            features = list(features)
+
+            rows = []
+            for index, key in enumerate(keys):
+                attributes = attributes_per_key[index] if attributes_per_key is not None else None
+                matching_key, bucketing_key = input_validator.validate_key(key, method_name)
+                if (matching_key is None and bucketing_key is None) \
+                        or not input_validator.validate_attributes(attributes, method_name):
+                    continue
+                rows.append((index, matching_key, bucketing_key, attributes))
+
+            treatments = _control_columns(set(features) | set(missing))
+            if not rows:
+                return treatments
+
+            matching_keys = [row[1] for row in rows]
+            bucketing_keys = [row[2] for row in rows]
+            attributes = [row[3] for row in rows] if attributes_per_key is not None else None
+            evaluations = self._evaluate_features_bulk_if_ready(matching_keys, bucketing_keys,
+                                                                features, attributes)
+
+            bulk_impressions = []
+            impression_attributes = []
+            for feature in features:
+                result = evaluations[feature]
+                column = treatments[feature]
+                for row, treatment, label in zip(rows, result['treatments'], result['labels']):
+                    index, matching_key, bucketing_key, key_attributes = row
+                    column[index] = treatment
+                    bulk_impressions.append(self._build_impression(
+                        matching_key,
+                        feature,
+                        treatment,
+                        label,
+                        result['change_number'],
+                        bucketing_key,
+                        start
+                    ))
+                    impression_attributes.append(key_attributes)
+
+            # Register impressions
+            try:
+                if bulk_impressions:
+                    self._record_stats(bulk_impressions, start, self._METRIC_GET_TREATMENTS_BULK,
+                                       impression_attributes)
+            except Exception:  # pylint: disable=broad-except
+                self._logger.error('%s: An exception when trying to store '
+                                   'impressions.' % method_name)
+                self._logger.debug('Error: ', exc_info=True)
+
+            return treatments
+        except Exception:  # pylint: disable=broad-except
+            self._logger.error('Error getting treatments in bulk')
+            self._logger.debug('Error: ', exc_info=True)
+        return _control_columns(features if features is not None else [])
+
     def _build_impression(  # pylint: disable=too-many-arguments
             self,
             matching_key,
@@ -345,9 +475,12 @@ class Client(object):  # pylint: disable=too-many-instance-attributes
             bucketing_key=bucketing_key, time=imp_time
         )
 
-    def _record_stats(self, impressions, start, operation):
+    def _record_stats(self, impressions, start, operation, attributes):
         """
-        Record impressions and metrics.
+        Record impressions and metrics, and send the impressions to the listener.
+
+        When an impressions recorder is set, impressions are only staged here, and both the
+        storage and the listener are fed from the recorder's thread.
 
         :param impressions: Generated impressions
         :type impressions: list||Impression
@@ -357,15 +490,27 @@ class Client(object):  # pylint: disable=too-many-instance-attributes
 
         :param operation: operation performed.
         :type operation: str
+
+        :param attributes: Attributes used to evaluate each impression
+        :type attributes: list(dict)
         """
         try:
             end = int(round(time.time() * 1000))
-            self._impressions_storage.put(impressions)
+            if self._impressions_recorder is not None:
+                self._impressions_recorder.record(impressions, attributes)
+            else:
+                self._impressions_storage.put(
+                    self._impressions_manager.process_impressions(impressions)
+                )
             self._telemetry_storage.inc_latency(operation, get_latency_bucket_index(end - start))
         except Exception:  # pylint: disable=broad-except
             self._logger.error('Error recording impressions and metrics')
             self._logger.debug('Error: ', exc_info=True)
 
+        if self._impressions_recorder is None:
+            for impression, impression_attributes in zip(impressions, attributes):
+                self._send_impression_to_listener(impression, impression_attributes)
+
     def track(self, key, traffic_type, event_type, value=None, properties=None):
         """
         Track an event.
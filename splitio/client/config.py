@@ -4,22 +4,50 @@ import os.path
 
 DEFAULT_CONFIG = {
     'connectionTimeout': 1500,
+    'requestCompressionEnabled': False,
+    'sdkConnectionPoolSize': 20,
+    'eventsConnectionPoolSize': 5,
     'splitSdkMachineName': None,
     'splitSdkMachineIp': None,
     'featuresRefreshRate': 5,
     'segmentsRefreshRate': 60,
+    'segmentsWorkerPoolSize': 20,
+    'segmentsMaxRefreshRate': None,
+    'segmentsRequestBudget': 0,
+    'segmentsCompactThreshold': 0,
+    'segmentsCompactVerify': False,
     'metricsRefreshRate': 60,
     'impressionsRefreshRate': 10,
     'impressionsBulkSize': 5000,
     'impressionsQueueSize': 10000,
+    # uWSGI mode only: number of impressions batches (one per evaluation call) each worker
+    # can buffer between flushes. Every slot is a uwsgi cache item, and batches that don't
+    # fit are merged into the latest slot.
+    'uwsgiImpressionsSlotsPerWorker': 1000,
+    'impressionsRecorderEnabled': False,
+    'impressionsRecorderRefreshRate': 1,
+    'impressionsRecorderQueueSize': 10000,
+    'impressionsRecorderBulkSize': 500,
+    'impressionsMode': 'debug',
+    'impressionsObserverSize': 500000,
+    'impressionsCountRefreshRate': 1800,
     'eventsPushRate': 10,
     'eventsBulkSize': 5000,
     'eventsQueueSize': 10000,
     'labelsEnabled': True,
     'IPAddressesEnabled': True,
     'impressionListener': None,
+    'bucketCacheSize': 0,
     'redisLocalCacheEnabled': False,
     'redisLocalCacheTTL': 5,
+    'redisLocalCacheMode': 'ttl',
+    # Versioned mode only: how many parsed splits to keep, and how often to check whether
+    # the split change number moved (lookups within the interval don't hit redis).
+    'redisLocalCacheSize': 1000,
+    'redisSplitTillCheckInterval': 1,
+    'redisSegmentCacheSize': 0,
+    'redisSegmentSnapshotMaxSize': 0,
+    'redisSegmentTillCheckInterval': 1,
     'redisHost': 'localhost',
     'redisPort': 6379,
     'redisDb': 0,
@@ -42,6 +70,10 @@ DEFAULT_CONFIG = {
     'redisSslCertReqs': None,
     'redisSslCaCerts': None,
     'redisMaxConnections': None,
+    'snapshotWritePath': None,
+    'snapshotWriteRate': 5,
+    'snapshotReadPath': None,
+    'snapshotCheckInterval': 1,
     'machineName': None,
     'machineIp': None,
     'splitFile': os.path.join(os.path.expanduser('~'), '.split')
@@ -15,6 +15,8 @@ from splitio.client.manager import SplitManager
 from splitio.client.config import DEFAULT_CONFIG
 from splitio.client import util
 from splitio.client.listener import ImpressionListenerWrapper
+from splitio.engine.impressions import ImpressionsMode, Manager as ImpressionsManager, \
+    Counter as ImpressionsCounter
 
 # Storage
 from splitio.storage.inmemmory import InMemorySplitStorage, InMemorySegmentStorage, \
@@ -23,6 +25,7 @@ from splitio.storage.adapters import redis
 from splitio.storage.redis import RedisSplitStorage, RedisSegmentStorage, RedisImpressionsStorage, \
     RedisEventsStorage, RedisTelemetryStorage
 from splitio.storage.adapters.uwsgi_cache import get_uwsgi
+from splitio.storage.mmap_snapshot import SnapshotReader, MmapSplitStorage, MmapSegmentStorage
 from splitio.storage.uwsgi import UWSGIEventStorage, UWSGIImpressionStorage, UWSGISegmentStorage, \
     UWSGISplitStorage, UWSGITelemetryStorage
 
@@ -37,9 +40,11 @@ from splitio.api.telemetry import TelemetryAPI
 # Tasks
 from splitio.tasks.split_sync import SplitSynchronizationTask
 from splitio.tasks.segment_sync import SegmentSynchronizationTask
-from splitio.tasks.impressions_sync import ImpressionsSyncTask
+from splitio.tasks.impressions_sync import ImpressionsSyncTask, ImpressionsCountSyncTask
 from splitio.tasks.events_sync import EventsSyncTask
 from splitio.tasks.telemetry_sync import TelemetrySynchronizationTask
+from splitio.tasks.impressions_recorder import ImpressionsRecorderTask
+from splitio.tasks.snapshot_sync import SnapshotWriterTask, SnapshotLoaderTask
 
 # Localhost stuff
 from splitio.client.localhost import LocalhostEventsStorage, LocalhostImpressionsStorage, \
@@ -68,6 +73,8 @@ class TimeoutException(Exception):
 class SplitFactory(object):  # pylint: disable=too-many-instance-attributes
     """Split Factory/Container class."""
 
+    _RECORDER_STOP_TIMEOUT = 5
+
     def __init__(  # pylint: disable=too-many-arguments
             self,
             apikey,
@@ -76,7 +83,10 @@ class SplitFactory(object):  # pylint: disable=too-many-instance-attributes
             apis=None,
             tasks=None,
             sdk_ready_flag=None,
-            impression_listener=None
+            impression_listener=None,
+            bucket_cache_size=0,
+            impressions_recorder=None,
+            impressions_manager=None
     ):
         """
         Class constructor.
@@ -93,6 +103,12 @@ class SplitFactory(object):  # pylint: disable=too-many-instance-attributes
         :type sdk_ready_flag: threading.Event
         :param impression_listener: User custom listener to handle impressions locally.
         :type impression_listener: splitio.client.listener.ImpressionListener
+        :param bucket_cache_size: Maximum number of key buckets memoized by each client.
+        :type bucket_cache_size: int
+        :param impressions_recorder: Optional task that records impressions off-thread.
+        :type impressions_recorder: splitio.tasks.impressions_recorder.ImpressionsRecorderTask
+        :param impressions_manager: Decides which impressions are stored by each client.
+        :type impressions_manager: splitio.engine.impressions.Manager
         """
         self._apikey = apikey
         self._logger = logging.getLogger(self.__class__.__name__)
@@ -102,6 +118,9 @@ class SplitFactory(object):  # pylint: disable=too-many-instance-attributes
         self._tasks = tasks if tasks else {}
         self._sdk_ready_flag = sdk_ready_flag
         self._impression_listener = impression_listener
+        self._bucket_cache_size = bucket_cache_size
+        self._impressions_recorder = impressions_recorder
+        self._impressions_manager = impressions_manager
 
         # If we have a ready flag, it means we have sync tasks that need to finish
         # before the SDK client becomes ready.
@@ -138,7 +157,9 @@ class SplitFactory(object):  # pylint: disable=too-many-instance-attributes
         This client is only a set of references to structures hold by the factory.
         Creating one a fast operation and safe to be used anywhere.
         """
-        return Client(self, self._labels_enabled, self._impression_listener)
+        return Client(self, self._labels_enabled, self._impression_listener,
+                      self._bucket_cache_size, self._impressions_recorder,
+                      self._impressions_manager)
 
     def manager(self):
         """
@@ -186,6 +207,12 @@ class SplitFactory(object):  # pylint: disable=too-many-instance-attributes
             self._logger.info('Factory already destroyed.')
             return
 
+        if self._impressions_recorder is not None:
+            # Staged impressions must reach the storage before the tasks flush it.
+            recorder_stopped = threading.Event()
+            self._impressions_recorder.stop(recorder_stopped)
+            recorder_stopped.wait(self._RECORDER_STOP_TIMEOUT)
+
         try:
             if destroyed_event is not None:
                 stop_events = {name: threading.Event() for name in self._tasks.keys()}
@@ -233,6 +260,63 @@ def _wrap_impression_listener(listener, metadata):
     return None
 
 
+def _build_impressions_manager(config, counter=None):
+    """
+    Build the impressions manager for the configured impressions mode.
+
+    :param config: Calculated configuration.
+    :type config: dict
+    :param counter: Counter for deduplicated impressions. Optimized mode requires one.
+    :type counter: splitio.engine.impressions.Counter
+
+    :rtype: splitio.engine.impressions.Manager
+    """
+    if config['impressionsMode'].upper() != ImpressionsMode.OPTIMIZED.value:
+        return ImpressionsManager()
+
+    if counter is None:
+        _LOGGER.warning(
+            'Impressions mode `optimized` is only supported in standalone mode. '
+            'Falling back to `debug`.'
+        )
+        return ImpressionsManager()
+
+    return ImpressionsManager(ImpressionsMode.OPTIMIZED, counter, config['impressionsObserverSize'])
+
+
+def _build_impressions_recorder(config, impressions_storage, impression_listener,
+                                impressions_manager=None):
+    """
+    Build the impressions recorder if enabled.
+
+    The recorder starts its thread on first use, so it's never started before a fork.
+
+    :param config: Calculated configuration.
+    :type config: dict
+    :param impressions_storage: Storage where recorded impressions are written.
+    :type impressions_storage: splitio.storage.ImpressionStorage
+    :param impression_listener: Wrapped impression listener or None.
+    :type impression_listener: splitio.client.listener.ImpressionListenerWrapper
+    :param impressions_manager: Decides which impressions are stored.
+    :type impressions_manager: splitio.engine.impressions.Manager
+
+    :return: Impressions recorder task or None.
+    :rtype: splitio.tasks.impressions_recorder.ImpressionsRecorderTask
+    """
+    if not config['impressionsRecorderEnabled']:
+        return None
+
+    recorder = ImpressionsRecorderTask(
+        impressions_storage,
+        impression_listener,
+        config['impressionsRecorderRefreshRate'],
+        config['impressionsRecorderQueueSize'],
+        config['impressionsRecorderBulkSize'],
+        impressions_manager
+    )
+    return recorder
+
+
 def _build_in_memory_factory(api_key, config, sdk_url=None, events_url=None):  # pylint: disable=too-many-locals
     """Build and return a split factory tailored to the supplied config."""
     if not input_validator.validate_factory_instantiation(api_key):
@@ -240,10 +324,16 @@ def _build_in_memory_factory(api_key, config, sdk_url=None, events_url=None):  #
 
     cfg = DEFAULT_CONFIG.copy()
     cfg.update(config)
+    if not input_validator.validate_snapshot_config(cfg):
+        return None
+
     http_client = HttpClient(
         sdk_url=sdk_url,
         events_url=events_url,
-        timeout=cfg.get('connectionTimeout')
+        timeout=cfg.get('connectionTimeout'),
+        compression=cfg['requestCompressionEnabled'],
+        sdk_pool_size=cfg['sdkConnectionPoolSize'],
+        events_pool_size=cfg['eventsConnectionPoolSize']
     )
 
     sdk_metadata = util.get_metadata(cfg)
@@ -260,12 +350,18 @@ def _build_in_memory_factory(api_key, config, sdk_url=None, events_url=None):  #
 
     storages = {
         'splits': InMemorySplitStorage(),
-        'segments': InMemorySegmentStorage(),
+        'segments': InMemorySegmentStorage(
+            cfg['segmentsCompactThreshold'],
+            cfg['segmentsCompactVerify']
+        ),
         'impressions': InMemoryImpressionStorage(cfg['impressionsQueueSize']),
         'events': InMemoryEventStorage(cfg['eventsQueueSize']),
         'telemetry': InMemoryTelemetryStorage()
     }
 
+    impressions_counter = ImpressionsCounter()
+    impressions_manager = _build_impressions_manager(cfg, impressions_counter)
+
     # Synchronization flags
     splits_ready_flag = threading.Event()
     segments_ready_flag = threading.Event()
@@ -284,7 +380,11 @@ def _build_in_memory_factory(api_key, config, sdk_url=None, events_url=None):  #
             storages['segments'],
             storages['splits'],
             cfg['segmentsRefreshRate'],
-            segments_ready_flag
+            segments_ready_flag,
+            cfg['segmentsWorkerPoolSize'],
+            cfg['segmentsMaxRefreshRate'],
+            cfg['segmentsRequestBudget'],
+            storages['telemetry']
         ),
 
         'impressions': ImpressionsSyncTask(
@@ -304,15 +404,33 @@ def _build_in_memory_factory(api_key, config, sdk_url=None, events_url=None):  #
         'telemetry': TelemetrySynchronizationTask(
             apis['telemetry'],
             storages['telemetry'],
-            cfg['metricsRefreshRate']
+            cfg['metricsRefreshRate'],
+            http_client
         )
     }
 
+    if impressions_manager.mode == ImpressionsMode.OPTIMIZED:
+        tasks['impressions_count'] = ImpressionsCountSyncTask(
+            apis['impressions'],
+            impressions_counter,
+            cfg['impressionsCountRefreshRate']
+        )
+
+    if cfg['snapshotWritePath']:
+        tasks['snapshot'] = SnapshotWriterTask(
+            storages['splits'],
+            storages['segments'],
+            cfg['snapshotWritePath'],
+            cfg['snapshotWriteRate']
+        )
+
     # Start tasks that have no dependencies
     tasks['splits'].start()
     tasks['impressions'].start()
     tasks['events'].start()
     tasks['telemetry'].start()
+    if 'impressions_count' in tasks:
+        tasks['impressions_count'].start()
 
     storages['events'].set_queue_full_hook(tasks['events'].flush)
     storages['impressions'].set_queue_full_hook(tasks['impressions'].flush)
@@ -325,6 +443,8 @@ def _build_in_memory_factory(api_key, config, sdk_url=None, events_url=None):  #
     def segment_ready_task():
         """Wait for segments to be ready and set the main ready flag."""
         segments_ready_flag.wait()
+        if 'snapshot' in tasks:
+            tasks['snapshot'].start()
         sdk_ready_flag.set()
 
     split_completion_thread = threading.Thread(target=split_ready_task)
@@ -333,6 +453,105 @@ def _build_in_memory_factory(api_key, config, sdk_url=None, events_url=None):  #
     segment_completion_thread = threading.Thread(target=segment_ready_task)
     segment_completion_thread.setDaemon(True)
     segment_completion_thread.start()
+    impression_listener = _wrap_impression_listener(cfg['impressionListener'], sdk_metadata)
+    return SplitFactory(
+        api_key,
+        storages,
+        cfg['labelsEnabled'],
+        apis,
+        tasks,
+        sdk_ready_flag,
+        impression_listener=impression_listener,
+        bucket_cache_size=cfg['bucketCacheSize'],
+        impressions_recorder=_build_impressions_recorder(
+            cfg, storages['impressions'], impression_listener, impressions_manager
+        ),
+        impressions_manager=impressions_manager
+    )
+
+
+def _build_snapshot_factory(api_key, config, events_url=None):
+    """Build and return a split factory reading splits & segments from a snapshot file."""
+    if not input_validator.validate_factory_instantiation(api_key):
+        return None
+
+    cfg = DEFAULT_CONFIG.copy()
+    cfg.update(config)
+    if not input_validator.validate_snapshot_config(cfg):
+        return None
+
+    http_client = HttpClient(
+        events_url=events_url,
+        timeout=cfg.get('connectionTimeout'),
+        compression=cfg['requestCompressionEnabled'],
+        sdk_pool_size=1,
+        events_pool_size=cfg['eventsConnectionPoolSize']
+    )
+
+    sdk_metadata = util.get_metadata(cfg)
+    apis = {
+        'impressions': ImpressionsAPI(http_client, api_key, sdk_metadata),
+        'events': EventsAPI(http_client, api_key, sdk_metadata),
+        'telemetry': TelemetryAPI(http_client, api_key, sdk_metadata)
+    }
+
+    # The factory is ready once the first snapshot written by the synchronizer is loaded.
+    sdk_ready_flag = threading.Event()
+    snapshot_reader = SnapshotReader(
+        cfg['snapshotReadPath'],
+        cfg['snapshotCheckInterval'],
+        sdk_ready_flag
+    )
+    storages = {
+        'splits': MmapSplitStorage(snapshot_reader),
+        'segments': MmapSegmentStorage(snapshot_reader),
+        'impressions': InMemoryImpressionStorage(cfg['impressionsQueueSize']),
+        'events': InMemoryEventStorage(cfg['eventsQueueSize']),
+        'telemetry': InMemoryTelemetryStorage()
+    }
+
+    impressions_counter = ImpressionsCounter()
+    impressions_manager = _build_impressions_manager(cfg, impressions_counter)
+
+    tasks = {
+        'snapshot': SnapshotLoaderTask(snapshot_reader, cfg['snapshotCheckInterval']),
+
+        'impressions': ImpressionsSyncTask(
+            apis['impressions'],
+            storages['impressions'],
+            cfg['impressionsRefreshRate'],
+            cfg['impressionsBulkSize']
+        ),
+
+        'events': EventsSyncTask(
+            apis['events'],
+            storages['events'],
+            cfg['eventsPushRate'],
+            cfg['eventsBulkSize'],
+        ),
+
+        'telemetry': TelemetrySynchronizationTask(
+            apis['telemetry'],
+            storages['telemetry'],
+            cfg['metricsRefreshRate'],
+            http_client
+        )
+    }
+
+    if impressions_manager.mode == ImpressionsMode.OPTIMIZED:
+        tasks['impressions_count'] = ImpressionsCountSyncTask(
+            apis['impressions'],
+            impressions_counter,
+            cfg['impressionsCountRefreshRate']
+        )
+
+    for task in tasks.values():
+        task.start()
+
+    storages['events'].set_queue_full_hook(tasks['events'].flush)
+    storages['impressions'].set_queue_full_hook(tasks['impressions'].flush)
+
+    impression_listener = _wrap_impression_listener(cfg['impressionListener'], sdk_metadata)
     return SplitFactory(
         api_key,
         storages,
@@ -340,7 +559,12 @@ def _build_in_memory_factory(api_key, config, sdk_url=None, events_url=None):  #
         apis,
         tasks,
         sdk_ready_flag,
-        impression_listener=_wrap_impression_listener(cfg['impressionListener'], sdk_metadata)
+        impression_listener=impression_listener,
+        bucket_cache_size=cfg['bucketCacheSize'],
+        impressions_recorder=_build_impressions_recorder(
+            cfg, storages['impressions'], impression_listener, impressions_manager
+        ),
+        impressions_manager=impressions_manager
     )
 
 
@@ -352,18 +576,40 @@ def _build_redis_factory(api_key, config):
     redis_adapter = redis.build(cfg)
     cache_enabled = cfg.get('redisLocalCacheEnabled', False)
     cache_ttl = cfg.get('redisLocalCacheTTL', 5)
+    cache_mode = cfg.get('redisLocalCacheMode', 'ttl')
+    telemetry_storage = RedisTelemetryStorage(redis_adapter, sdk_metadata)
     storages = {
-        'splits': RedisSplitStorage(redis_adapter, cache_enabled, cache_ttl),
-        'segments': RedisSegmentStorage(redis_adapter),
+        'splits': RedisSplitStorage(
+            redis_adapter,
+            cache_enabled,
+            cache_ttl,
+            cache_mode,
+            cfg['redisSplitTillCheckInterval'],
+            cfg['redisLocalCacheSize']
+        ),
+        'segments': RedisSegmentStorage(
+            redis_adapter,
+            cfg['redisSegmentCacheSize'],
+            cfg['redisSegmentSnapshotMaxSize'],
+            cfg['redisSegmentTillCheckInterval'],
+            telemetry_storage
+        ),
         'impressions': RedisImpressionsStorage(redis_adapter, sdk_metadata),
         'events': RedisEventsStorage(redis_adapter, sdk_metadata),
-        'telemetry': RedisTelemetryStorage(redis_adapter, sdk_metadata)
+        'telemetry': telemetry_storage
     }
+    impression_listener = _wrap_impression_listener(cfg['impressionListener'], sdk_metadata)
+    impressions_manager = _build_impressions_manager(cfg)
     return SplitFactory(
         api_key,
         storages,
         cfg['labelsEnabled'],
-        impression_listener=_wrap_impression_listener(cfg['impressionListener'], sdk_metadata)
+        impression_listener=impression_listener,
+        bucket_cache_size=cfg['bucketCacheSize'],
+        impressions_recorder=_build_impressions_recorder(
+            cfg, storages['impressions'], impression_listener, impressions_manager
+        ),
+        impressions_manager=impressions_manager
     )
 
 
@@ -376,15 +622,25 @@ def _build_uwsgi_factory(api_key, config):
     storages = {
         'splits': UWSGISplitStorage(uwsgi_adapter),
         'segments': UWSGISegmentStorage(uwsgi_adapter),
-        'impressions': UWSGIImpressionStorage(uwsgi_adapter),
+        'impressions': UWSGIImpressionStorage(
+            uwsgi_adapter,
+            cfg['uwsgiImpressionsSlotsPerWorker']
+        ),
         'events': UWSGIEventStorage(uwsgi_adapter),
         'telemetry': UWSGITelemetryStorage(uwsgi_adapter)
     }
+    impression_listener = _wrap_impression_listener(cfg['impressionListener'], sdk_metadata)
+    impressions_manager = _build_impressions_manager(cfg)
     return SplitFactory(
         api_key,
         storages,
         cfg['labelsEnabled'],
-        impression_listener=_wrap_impression_listener(cfg['impressionListener'], sdk_metadata)
+        impression_listener=impression_listener,
+        bucket_cache_size=cfg['bucketCacheSize'],
+        impressions_recorder=_build_impressions_recorder(
+            cfg, storages['impressions'], impression_listener, impressions_manager
+        ),
+        impressions_manager=impressions_manager
     )
 
 
@@ -411,26 +667,38 @@ def _build_localhost_factory(config):
     return SplitFactory('localhost', storages, False, None, tasks, ready_event)
 
 
+def _warn_on_existing_factories(api_key):
+    """
+    Warn if other factories were already instantiated. Call while holding the factories lock.
+
+    :param api_key: API key of the factory being built.
+    :type api_key: str
+    """
+    if not _INSTANTIATED_FACTORIES:
+        return
+
+    if api_key in _INSTANTIATED_FACTORIES:
+        _LOGGER.warning(
+            "factory instantiation: You already have %d %s with this API Key. "
+            "We recommend keeping only one instance of the factory at all times "
+            "(Singleton pattern) and reusing it throughout your application.",
+            _INSTANTIATED_FACTORIES[api_key],
+            'factory' if _INSTANTIATED_FACTORIES[api_key] == 1 else 'factories'
+        )
+    else:
+        _LOGGER.warning(
+            "factory instantiation: You already have an instance of the Split factory. "
+            "Make sure you definitely want this additional instance. "
+            "We recommend keeping only one instance of the factory at all times "
+            "(Singleton pattern) and reusing it throughout your application."
+        )
+
+
 def get_factory(api_key, **kwargs):
     """Build and return the appropriate factory."""
     try:
         _INSTANTIATED_FACTORIES_LOCK.acquire()
-        if _INSTANTIATED_FACTORIES:
-            if api_key in _INSTANTIATED_FACTORIES:
-                _LOGGER.warning(
-                    "factory instantiation: You already have %d %s with this API Key. "
-                    "We recommend keeping only one instance of the factory at all times "
-                    "(Singleton pattern) and reusing it throughout your application.",
-                    _INSTANTIATED_FACTORIES[api_key],
-                    'factory' if _INSTANTIATED_FACTORIES[api_key] == 1 else 'factories'
-                )
-            else:
-                _LOGGER.warning(
-                    "factory instantiation: You already have an instance of the Split factory. "
-                    "Make sure you definitely want this additional instance. "
-                    "We recommend keeping only one instance of the factory at all times "
-                    "(Singleton pattern) and reusing it throughout your application."
-                )
+        _warn_on_existing_factories(api_key)
 
         config = kwargs.get('config', {})
 
@@ -443,6 +711,9 @@ def get_factory(api_key, **kwargs):
         if 'uwsgiClient' in config:
             return _build_uwsgi_factory(api_key, config)
 
+        if config.get('snapshotReadPath'):
+            return _build_snapshot_factory(api_key, config, kwargs.get('events_api_base_url'))
+
         return _build_in_memory_factory(
             api_key,
             config,
@@ -494,6 +494,27 @@ def validate_factory_instantiation(apikey):
     return True
 
 
+def validate_snapshot_config(config):
+    """
+    Check that snapshot storages aren't combined with settings they can't honour.
+
+    Snapshots only store key hashes, so segment lookups can't be verified against the keys.
+
+    :param config: Factory configuration.
+    :type config: dict
+    :return: bool
+    :rtype: True|False
+    """
+    if (config.get('snapshotWritePath') or config.get('snapshotReadPath')) \
+            and config.get('segmentsCompactVerify'):
+        _LOGGER.error(
+            'factory_instantiation: segmentsCompactVerify is not supported with snapshots, '
+            'since they only store key hashes.'
+        )
+        return False
+    return True
+
+
 def valid_properties(properties):
     """
     Check if properties is a valid dict and returns the properties
@@ -0,0 +1,3 @@
+"""Split evaluation engine package."""
+
+CONTROL = 'control'
@@ -0,0 +1,251 @@
+"""
+Split compiler module.
+
+This module turns split definitions into flat evaluation plans which can be
+executed by the evaluator without walking the condition/matcher object graph
+on every call.
+"""
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+from splitio.engine.splitters import Splitter
+from splitio.models.grammar.condition import ConditionType
+from splitio.models.grammar.matchers import DependencyMatcher
+from splitio.models.impressions import Label
+
+
+_PLAN_ATTRIBUTE = '_evaluation_plan'
+
+# Buckets produced by Splitter.get_bucket go from 1 to 100 (inclusive).
+_BUCKETS = range(1, 101)
+
+
+class EvaluationPlan(object):  #pylint: disable=too-many-instance-attributes
+    """Precomputed evaluation plan for a split."""
+
+    __slots__ = (
+        '_seed', '_algo', '_default_treatment', '_traffic_allocation',
+        '_traffic_allocation_seed', '_whitelist_conditions', '_rollout_conditions',
+        '_check_traffic_allocation', '_needs_bucketing_key'
+    )
+
+    def __init__(self, split):
+        """
+        Class constructor.
+
+        :param split: Split to compile.
+        :type split: splitio.models.splits.Split
+        """
+        self._seed = split.seed
+        self._algo = split.algo
+        self._default_treatment = split.default_treatment
+        self._traffic_allocation = split.traffic_allocation
+        self._traffic_allocation_seed = split.traffic_allocation_seed
+
+        whitelist = []
+        rollout = []
+        for position, condition in enumerate(split.conditions):
+            if not rollout and condition.condition_type != ConditionType.ROLLOUT:
+                whitelist.append(_compile_condition(position, condition))
+            else:
+                rollout.append(_compile_condition(position, condition))
+
+        self._whitelist_conditions = tuple(whitelist)
+        self._rollout_conditions = tuple(rollout)
+        self._check_traffic_allocation = bool(rollout) and split.traffic_allocation < 100
+        self._needs_bucketing_key = any(
+            isinstance(matcher, DependencyMatcher)
+            for cond in split.conditions for matcher in cond.matchers
+        )
+
+    @property
+    def needs_bucketing_key(self):
+        """Return whether the evaluation context must carry the bucketing key."""
+        return self._needs_bucketing_key
+
+    @staticmethod
+    def _match(conditions, matching_key, attributes, context):
+        """
+        Return the first compiled condition whose matchers all succeed.
+
+        :return: Compiled condition or None.
+        :rtype: tuple
+        """
+        for condition in conditions:
+            for matcher in condition[1]:
+                if not matcher(matching_key, attributes, context):
+                    break
+            else:
+                return condition
+        return None
+
+    def _context_for(self, context, bucketing_key):
+        """Add the bucketing key to the context if a dependency matcher requires it."""
+        if self._needs_bucketing_key:
+            return dict(context, bucketing_key=bucketing_key)
+        return context
+
+    def evaluate(self, splitter, matching_key, bucketing_key, attributes, context):  #pylint: disable=too-many-arguments
+        """
+        Run the plan for a key.
+
+        :param splitter: Splitter used to calculate buckets.
+        :type splitter: splitio.engine.splitters.Splitter
+        :param matching_key: The key for which to get the treatment
+        :type matching_key: str
+        :param bucketing_key: The key used for bucketing (already defaulted to matching_key).
+        :type bucketing_key: str
+        :param attributes: An optional dictionary of attributes
+        :type attributes: dict
+        :param context: Evaluation context passed to the matchers.
+        :type context: dict
+
+        :return: The resulting treatment and label, or (None, None) if no condition matches.
+        :rtype: tuple
+        """
+        context = self._context_for(context, bucketing_key)
+        condition = self._match(self._whitelist_conditions, matching_key, attributes, context)
+        if condition is None:
+            if self._check_traffic_allocation:
+                bucket = splitter.get_bucket(
+                    bucketing_key,
+                    self._traffic_allocation_seed,
+                    self._algo
+                )
+                if bucket > self._traffic_allocation:
+                    return self._default_treatment, Label.NOT_IN_SPLIT
+
+            condition = self._match(self._rollout_conditions, matching_key, attributes, context)
+            if condition is None:
+                return None, None
+
+        _, _, label, treatment, buckets = condition
+        if buckets is None:
+            return treatment, label
+        return buckets[splitter.get_bucket(bucketing_key, self._seed, self._algo)], label
+
+    def evaluate_many(self, splitter, matching_keys, bucketing_keys, attributes, context):  #pylint: disable=too-many-arguments,too-many-locals
+        """
+        Run the plan for many keys at once.
+
+        Matchers are still evaluated per key, but hashing is done in batches (one per seed),
+        and buckets are mapped to treatments for all the keys falling in the same condition
+        at once.
+
+        :param splitter: Splitter used to calculate buckets.
+        :type splitter: splitio.engine.splitters.Splitter
+        :param matching_keys: Keys for which to get the treatment
+        :type matching_keys: list(str)
+        :param bucketing_keys: Keys used for bucketing (already defaulted to matching keys).
+        :type bucketing_keys: list(str)
+        :param attributes: Optional list of attribute dictionaries, one per key.
+        :type attributes: list(dict)
+        :param context: Evaluation context passed to the matchers.
+        :type context: dict
+
+        :return: List of (treatment, label) tuples in the same order as the keys.
+        :rtype: list(tuple)
+        """
+        results = [None] * len(matching_keys)
+        pending = {}
+        allocation_buckets = None
+        for index, matching_key in enumerate(matching_keys):
+            key_attributes = attributes[index] if attributes is not None else None
+            key_context = self._context_for(context, bucketing_keys[index])
+            condition = self._match(
+                self._whitelist_conditions,
+                matching_key,
+                key_attributes,
+                key_context
+            )
+            if condition is None:
+                if self._check_traffic_allocation:
+                    if allocation_buckets is None:
+                        allocation_buckets = splitter.get_buckets(
+                            bucketing_keys,
+                            self._traffic_allocation_seed,
+                            self._algo
+                        )
+                    if allocation_buckets[index] > self._traffic_allocation:
+                        results[index] = (self._default_treatment, Label.NOT_IN_SPLIT)
+                        continue
+
+                condition = self._match(
+                    self._rollout_conditions,
+                    matching_key,
+                    key_attributes,
+                    key_context
+                )
+                if condition is None:
+                    results[index] = (None, None)
+                    continue
+
+            position, _, label, treatment, buckets = condition
+            if buckets is None:
+                results[index] = (treatment, label)
+            else:
+                pending.setdefault(position, (condition, []))[1].append(index)
+
+        for condition, indexes in pending.values():
+            _, _, label, _, table = condition
+            buckets = splitter.get_buckets(
+                [bucketing_keys[index] for index in indexes],
+                self._seed,
+                self._algo
+            )
+            treatments = splitter.get_treatments_for_buckets(buckets, table)
+            for index, treatment in zip(indexes, treatments):
+                results[index] = (treatment, label)
+
+        return results
+
+
+def _compile_condition(position, condition):
+    """
+    Flatten a condition into a tuple of (position, matchers, label, treatment, bucket table).
+
+    When every bucket maps to the same treatment, the bucket table is None and no
+    hashing is needed to resolve the treatment.
+
+    :param position: Position of the condition within the split.
+    :type position: int
+    :param condition: Condition to compile.
+    :type condition: splitio.models.grammar.condition.Condition
+
+    :return: Compiled condition.
+    :rtype: tuple
+    """
+    matchers = tuple(matcher.evaluate for matcher in condition.matchers)
+    partitions = condition.partitions
+    table = tuple(Splitter.get_treatment_for_bucket(bucket, partitions) for bucket in _BUCKETS)
+    if len(set(table)) == 1:
+        return position, matchers, condition.label, table[0], None
+    return position, matchers, condition.label, None, (None,) + table
+
+
+def compile_split(split):
+    """
+    Build an evaluation plan for a split and attach it to the split object.
+
+    :param split: Split to compile.
+    :type split: splitio.models.splits.Split
+
+    :return: The evaluation plan.
+    :rtype: EvaluationPlan
+    """
+    plan = EvaluationPlan(split)
+    setattr(split, _PLAN_ATTRIBUTE, plan)
+    return plan
+
+
+def get_plan(split):
+    """
+    Return the evaluation plan attached to a split, if any.
+
+    :param split: Split whose plan should be returned.
+    :type split: splitio.models.splits.Split
+
+    :return: Evaluation plan or None if the split hasn't been compiled.
+    :rtype: EvaluationPlan
+    """
+    return getattr(split, _PLAN_ATTRIBUTE, None)
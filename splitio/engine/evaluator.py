@@ -1,13 +1,12 @@
 """Split evaluator module."""
 import logging
 import six
+from splitio.engine import CONTROL
+from splitio.engine.compiler import compile_split, get_plan
 from splitio.models.grammar.condition import ConditionType
 from splitio.models.impressions import Label
 
 
-CONTROL = 'control'
-
-
 class Evaluator(object):  # pylint: disable=too-few-public-methods
     """Split Evaluator class."""
 
@@ -25,8 +24,13 @@ class Evaluator(object):  # pylint: disable=too-few-public-methods
         self._split_storage = split_storage
         self._segment_storage = segment_storage
         self._splitter = splitter
+        self._context = {
+            'segment_storage': segment_storage,
+            'evaluator': self
+        }
 
-    def _evaluate_treatment(self, feature, matching_key, bucketing_key, attributes, split):
+    def _evaluate_treatment(self, feature, matching_key, bucketing_key, attributes, split,  #pylint: disable=too-many-arguments
+                            context=None):
         """
         Evaluate the user submitted data against a feature and return the resulting treatment.
 
@@ -45,6 +49,9 @@ class Evaluator(object):  # pylint: disable=too-few-public-methods
         :param split: Split object
         :type attributes: splitio.models.splits.Split|None
 
+        :param context: Evaluation context to use instead of the default one
+        :type context: dict
+
         :return: The treatment for the key and split
         :rtype: object
         """
@@ -65,7 +72,8 @@ class Evaluator(object):  # pylint: disable=too-few-public-methods
                     split,
                     matching_key,
                     bucketing_key,
-                    attributes
+                    attributes,
+                    context
                 )
                 if treatment is None:
                     label = Label.NO_CONDITION_MATCHED
@@ -134,11 +142,13 @@ class Evaluator(object):  # pylint: disable=too-few-public-methods
 
         # Fetching Split definition
         splits = self._split_storage.fetch_many(features)
+        context = self._prefetch_segments(splits, matching_key)
         # Calling evaluations
         for feature in features:
             split = splits[feature]
             evaluations[feature] = self._evaluate_treatment(feature, matching_key,
-                                                            bucketing_key, attributes, split)
+                                                            bucketing_key, attributes, split,
+                                                            context)
         return evaluations
         return {
             feature: self._evaluate_treatment(feature, matching_key,
@@ -146,12 +156,133 @@ class Evaluator(object):  # pylint: disable=too-few-public-methods
             for (feature, split) in six.iteritems(self._split_storage.fetch_many(features))
         }
 
-    def _get_treatment_for_split(self, split, matching_key, bucketing_key, attributes=None):
+    def _prefetch_segments(self, splits, matching_key):
+        """
+        Check the key against every segment referenced by the splits in a single storage call.
+
+        Only storages that batch membership checks are prefetched from. Others are queried
+        lazily, for the conditions actually reached.
+
+        :param splits: Splits about to be evaluated, indexed by name.
+        :type splits: dict
+        :param matching_key: The matching_key for which to get the treatments
+        :type matching_key: str
+
+        :return: Evaluation context carrying the prefetched memberships.
+        :rtype: dict
+        """
+        if not getattr(self._segment_storage, 'batches_membership_checks', False):
+            return self._context
+
+        segment_names = set(
+            segment_name
+            for split in six.itervalues(splits) if split is not None and not split.killed
+            for condition in split.conditions
+            for segment_name in condition.get_segment_names()
+        )
+        if not segment_names:
+            return self._context
+
+        memberships = self._segment_storage.segment_contains_many(segment_names, matching_key)
+        return dict(self._context, segment_memberships={
+            (segment_name, matching_key): contained
+            for (segment_name, contained) in six.iteritems(memberships)
+        })
+
+    def evaluate_features_bulk(self, features, matching_keys, bucketing_keys, attributes=None):
+        """
+        Evaluate multiple keys against multiple features and return columnar results.
+
+        :param features: The features for which to get the treatments
+        :type features: list(str)
+
+        :param matching_keys: The matching keys for which to get the treatments
+        :type matching_keys: list(str)
+
+        :param bucketing_keys: The bucketing keys (or None) for each matching key
+        :type bucketing_keys: list(str)
+
+        :param attributes: An optional list of attribute dictionaries, one per key
+        :type attributes: list(dict)
+
+        :return: For each feature, the treatments & labels of every key (in the same order)
+            and the change number of the split.
+        :rtype: dict
+        """
+        bucketing_keys = [
+            bucketing_key if bucketing_key is not None else matching_key
+            for (matching_key, bucketing_key) in zip(matching_keys, bucketing_keys)
+        ]
+        splits = self._split_storage.fetch_many(features)
+        return {
+            feature: self._evaluate_treatments_bulk(feature, matching_keys, bucketing_keys,
+                                                    attributes, splits[feature])
+            for feature in features
+        }
+
+    def _evaluate_treatments_bulk(self, feature, matching_keys, bucketing_keys, attributes, split):  # pylint: disable=too-many-arguments
+        """
+        Evaluate many keys against a single feature.
+
+        :param feature: The feature for which to get the treatments
+        :type feature:  str
+
+        :param matching_keys: The matching keys for which to get the treatments
+        :type matching_keys: list(str)
+
+        :param bucketing_keys: The bucketing keys, already defaulted to the matching keys
+        :type bucketing_keys: list(str)
+
+        :param attributes: An optional list of attribute dictionaries, one per key
+        :type attributes: list(dict)
+
+        :param split: Split object
+        :type attributes: splitio.models.splits.Split|None
+
+        :return: Treatments, labels & change number for the feature.
+        :rtype: dict
+        """
+        if split is None:
+            self._logger.warning('Unknown or invalid feature: %s', feature)
+            return {
+                'treatments': [CONTROL] * len(matching_keys),
+                'labels': [Label.SPLIT_NOT_FOUND] * len(matching_keys),
+                'change_number': -1
+            }
+
+        if split.killed:
+            return {
+                'treatments': [split.default_treatment] * len(matching_keys),
+                'labels': [Label.KILLED] * len(matching_keys),
+                'change_number': split.change_number
+            }
+
+        plan = get_plan(split)
+        if plan is None:
+            plan = compile_split(split)
+
+        results = plan.evaluate_many(self._splitter, matching_keys, bucketing_keys, attributes,
+                                     self._context)
+        return {
+            'treatments': [
+                treatment if treatment is not None else split.default_treatment
+                for (treatment, _) in results
+            ],
+            'labels': [
+                label if treatment is not None else Label.NO_CONDITION_MATCHED
+                for (treatment, label) in results
+            ],
+            'change_number': split.change_number
+        }
+
+    def _get_treatment_for_split(self, split, matching_key, bucketing_key, attributes=None,  #pylint: disable=too-many-arguments
+                                 context=None):
         """
         Evaluate the feature considering the conditions.
 
         If there is a match, it will return the condition and the label.
-        Otherwise, it will return (None, None)
+        Otherwise, it will return (None, None). Splits compiled by the storage are
+        evaluated through their precomputed plan instead of walking the conditions.
 
         :param split: The split for which to get the treatment
         :type split: Split
@@ -165,19 +296,31 @@ class Evaluator(object):  # pylint: disable=too-few-public-methods
         :param attributes: An optional dictionary of attributes
         :type attributes: dict
 
+        :param context: Evaluation context to use instead of the default one
+        :type context: dict
+
         :return: The resulting treatment and label
         :rtype: tuple
         """
         if bucketing_key is None:
             bucketing_key = matching_key
 
+        if context is None:
+            context = self._context
+
+        plan = get_plan(split)
+        if plan is not None:
+            return plan.evaluate(
+                self._splitter,
+                matching_key,
+                bucketing_key,
+                attributes,
+                context
+            )
+
         roll_out = False
 
-        context = {
-            'segment_storage': self._segment_storage,
-            'evaluator': self,
-            'bucketing_key': bucketing_key
-        }
+        context = dict(context, bucketing_key=bucketing_key)
 
         for condition in split.conditions:
             if (not roll_out and
@@ -11,16 +11,26 @@ from __future__ import absolute_import, division, print_function, \
 from splitio.models.splits import HashAlgorithm
 from splitio.engine.hashfns import legacy
 
+try:
+    # Vectorized bucket calculations when numpy is available.
+    import numpy
+except ImportError:
+    numpy = None  #pylint: disable=invalid-name
+
 try:
     # First attempt to import module with C++ core (faster)
     import mmh3cffi
 
     def _murmur_hash(key, seed):
         return mmh3cffi.hash_str(key, seed)
+
+    def _murmur_hash_many(keys, seed):
+        return [mmh3cffi.hash_str(key, seed) for key in keys]
 except ImportError:
     # Fallback to interpreted python hash algoritm (slower)
     from splitio.engine.hashfns import murmur3py  #pylint: disable=ungrouped-imports
     _murmur_hash = murmur3py.murmur32_py  #pylint: disable=invalid-name
+    _murmur_hash_many = murmur3py.murmur32_py_many  #pylint: disable=invalid-name
 
 
 _HASH_ALGORITHMS = {
@@ -28,6 +38,11 @@ _HASH_ALGORITHMS = {
     HashAlgorithm.MURMUR: _murmur_hash
 }
 
+_HASH_MANY_ALGORITHMS = {
+    HashAlgorithm.LEGACY: legacy.legacy_hash_many,
+    HashAlgorithm.MURMUR: _murmur_hash_many
+}
+
 
 def get_hash_fn(algo):
     """
@@ -39,3 +54,41 @@ def get_hash_fn(algo):
     :rtype: function
     """
     return _HASH_ALGORITHMS.get(algo, legacy.legacy_hash)
+
+
+def hash_many(keys, seed, algo):
+    """
+    Hash many keys with the same seed and algorithm in a single pass.
+
+    :param keys: Keys to hash
+    :type keys: list(str)
+    :param seed: The feature seed
+    :type seed: int
+    :param algo: Algoritm to use
+    :type algo: int
+    :return: Hashes for each key, in the same order (numpy array if numpy is installed)
+    :rtype: list(int)|numpy.ndarray
+    """
+    hashes = _HASH_MANY_ALGORITHMS.get(algo, legacy.legacy_hash_many)(keys, seed)
+    if numpy is not None and not isinstance(hashes, numpy.ndarray):
+        return numpy.array(hashes, dtype=numpy.int64)
+    return hashes
+
+
+def buckets_many(keys, seed, algo):
+    """
+    Get the buckets (1 to 100) for many keys hashed with the same seed and algorithm.
+
+    :param keys: Keys for which to calculate the buckets
+    :type keys: list(str)
+    :param seed: The feature seed
+    :type seed: int
+    :param algo: Algoritm to use
+    :type algo: int
+    :return: Buckets for each key, in the same order (numpy array if numpy is installed)
+    :rtype: list(int)|numpy.ndarray
+    """
+    hashes = hash_many(keys, seed, algo)
+    if numpy is not None:
+        return numpy.abs(hashes) % 100 + 1
+    return [abs(hashed) % 100 + 1 for hashed in hashes]
@@ -2,6 +2,12 @@
 from __future__ import absolute_import, division, print_function, \
     unicode_literals
 
+try:
+    # Vectorized hashing of many keys when numpy is available.
+    import numpy
+except ImportError:
+    numpy = None  #pylint: disable=invalid-name
+
 
 def as_int32(value):
     """Handle overflow when working with 32 lower bits of 64 bit ints."""
@@ -27,3 +33,37 @@ def legacy_hash(key, seed):
         current_hash = as_int32(as_int32(31 * as_int32(current_hash)) + char)
 
     return int(as_int32(current_hash ^ as_int32(seed)))
+
+
+def legacy_hash_many(keys, seed):
+    """
+    Generate hashes for many keys and a feature seed.
+
+    When numpy is available keys are laid out as right-aligned rows of code points
+    (leading zeros leave the hash untouched) and each column is accumulated for all
+    the keys at once. Otherwise `legacy_hash` is called for each key.
+
+    :param keys: The keys for which to get the hashes
+    :type keys: list(str)
+    :param seed: The feature seed
+    :type seed: int
+    :return: The hashes for the keys and seed, in the same order as the keys
+    :rtype: list(int)|numpy.ndarray
+    """
+    if numpy is None or not keys:
+        return [legacy_hash(key, seed) for key in keys]
+
+    encoded = [key.encode('utf-32-le') for key in keys]
+    count = len(encoded)
+    width = max(len(key) for key in encoded)
+    codes = numpy.frombuffer(
+        b''.join(key.rjust(width, b'\0') for key in encoded),
+        dtype='<u4'
+    ).reshape(count, width // 4)
+
+    current_hash = numpy.zeros(count, dtype=numpy.uint32)
+    for column in range(codes.shape[1]):
+        current_hash = current_hash * numpy.uint32(31) + codes[:, column]
+
+    current_hash = current_hash ^ numpy.uint32(seed & 0xFFFFFFFF)
+    return current_hash.view(numpy.int32).astype(numpy.int64)
@@ -5,6 +5,12 @@ from __future__ import absolute_import, division, print_function, \
 
 from six.moves import range
 
+try:
+    # Vectorized hashing of many keys when numpy is available.
+    import numpy
+except ImportError:
+    numpy = None  #pylint: disable=invalid-name
+
 
 def murmur32_py(key, seed=0x0):
     """
@@ -74,3 +80,61 @@ def murmur32_py(key, seed=0x0):
 
     unsigned_val = fmix(hash1 ^ length)
     return unsigned_val
+
+
+def murmur32_py_many(keys, seed=0x0):  #pylint: disable=too-many-locals
+    """
+    Hash many keys with the same seed.
+
+    When numpy is available keys are laid out in a zero-padded matrix of 32 bit blocks
+    and every block column is mixed for all the keys at once. Otherwise `murmur32_py`
+    is called for each key.
+
+    :param keys: Keys to hash
+    :type keys: list(str)
+    :param seed: Seed to use when hashing
+    :type seed: int
+
+    :return: hashed values, in the same order as the keys
+    :rtype: list(int)|numpy.ndarray
+    """
+    if numpy is None or not keys:
+        return [murmur32_py(key, seed) for key in keys]
+
+    encoded = [bytearray(key, 'utf-8') for key in keys]
+    count = len(encoded)
+    lengths = numpy.fromiter((len(key) for key in encoded), dtype=numpy.uint32, count=count)
+    width = (int(lengths.max()) // 4 + 1) * 4
+    blocks = numpy.frombuffer(
+        b''.join(key.ljust(width, b'\0') for key in encoded),
+        dtype='<u4'
+    ).reshape(count, width // 4)
+
+    calc1 = numpy.uint32(0xcc9e2d51)
+    calc2 = numpy.uint32(0x1b873593)
+    nblocks = lengths // 4
+    has_tail = (lengths & 3) > 0
+    hash1 = numpy.full(count, seed & 0xFFFFFFFF, dtype=numpy.uint32)
+
+    for column in range(blocks.shape[1]):
+        key1 = blocks[:, column] * calc1
+        key1 = (key1 << 15) | (key1 >> 17)  # ROTL32
+        key1 = key1 * calc2
+
+        # Zero padding makes the block right after the last full one equal to the tail.
+        mixed = hash1 ^ key1
+        body = (mixed << 13) | (mixed >> 19)  # ROTL32
+        body = body * numpy.uint32(5) + numpy.uint32(0xe6546b64)
+        hash1 = numpy.where(
+            nblocks > column,
+            body,
+            numpy.where((nblocks == column) & has_tail, mixed, hash1)
+        )
+
+    hash1 = hash1 ^ lengths
+    hash1 = hash1 ^ (hash1 >> 16)
+    hash1 = hash1 * numpy.uint32(0x85ebca6b)
+    hash1 = hash1 ^ (hash1 >> 13)
+    hash1 = hash1 * numpy.uint32(0xc2b2ae35)
+    hash1 = hash1 ^ (hash1 >> 16)
+    return hash1.astype(numpy.int64)
@@ -0,0 +1,161 @@
+"""Impressions deduplication & counting module."""
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+import threading
+from collections import defaultdict
+
+from enum import Enum
+import six
+
+from splitio.models.impressions import ImpressionCount
+from splitio.util.lru import LRUCache
+
+
+_TIME_FRAME_MS = 3600 * 1000
+
+DEFAULT_OBSERVER_SIZE = 500000
+
+
+class ImpressionsMode(Enum):
+    """Impressions tracking mode."""
+
+    OPTIMIZED = 'OPTIMIZED'
+    DEBUG = 'DEBUG'
+
+
+def truncate_time_frame(timestamp_ms):
+    """
+    Return the start of the hour a timestamp falls in.
+
+    :param timestamp_ms: Timestamp in milliseconds.
+    :type timestamp_ms: int
+
+    :return: Start of the hour, in milliseconds.
+    :rtype: int
+    """
+    return timestamp_ms - (timestamp_ms % _TIME_FRAME_MS)
+
+
+class Observer(object):  # pylint: disable=too-few-public-methods
+    """Bounded LRU of impression hashes -> time the impression was last seen."""
+
+    def __init__(self, size):
+        """
+        Class constructor.
+
+        :param size: Maximum number of impressions to remember.
+        :type size: int
+        """
+        self._cache = LRUCache(size)
+
+    def test_and_set(self, impression):
+        """
+        Record an impression and return when an identical one was last seen.
+
+        :param impression: Impression to record.
+        :type impression: splitio.models.impressions.Impression
+
+        :return: Time of the previous identical impression, or None.
+        :rtype: int
+        """
+        impression_hash = hash((
+            impression.matching_key,
+            impression.feature_name,
+            impression.treatment,
+            impression.label,
+            impression.change_number
+        ))
+        previous = self._cache.get(impression_hash)
+        self._cache.put(impression_hash, impression.time)
+        return previous
+
+
+class Counter(object):
+    """Counts impressions per feature per hour."""
+
+    def __init__(self):
+        """Class constructor."""
+        self._data = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def track(self, impressions):
+        """
+        Count impressions.
+
+        :param impressions: Impressions to count.
+        :type impressions: list(splitio.models.impressions.Impression)
+        """
+        with self._lock:
+            for impression in impressions:
+                self._data[(impression.feature_name, truncate_time_frame(impression.time))] += 1
+
+    def pop_all(self):
+        """
+        Return the counts gathered so far and reset them.
+
+        :rtype: list(splitio.models.impressions.ImpressionCount)
+        """
+        with self._lock:
+            data, self._data = self._data, defaultdict(int)
+        return [
+            ImpressionCount(feature, time_frame, count)
+            for ((feature, time_frame), count) in six.iteritems(data)
+        ]
+
+
+class Manager(object):
+    """
+    Decide which impressions must be stored.
+
+    In optimized mode, an impression identical to one already seen within the same hour is
+    not stored, and only counted per feature per hour. In debug mode every impression is
+    stored.
+    """
+
+    def __init__(self, mode=ImpressionsMode.DEBUG, counter=None,
+                 observer_size=DEFAULT_OBSERVER_SIZE):
+        """
+        Class constructor.
+
+        :param mode: Impressions tracking mode.
+        :type mode: ImpressionsMode
+        :param counter: Counter for the dropped impressions (required in optimized mode).
+        :type counter: Counter
+        :param observer_size: Maximum number of impressions to remember in optimized mode.
+        :type observer_size: int
+        """
+        self._mode = mode
+        self._counter = counter
+        self._observer = Observer(observer_size) if mode == ImpressionsMode.OPTIMIZED else None
+
+    @property
+    def mode(self):
+        """Return the impressions tracking mode."""
+        return self._mode
+
+    def process_impressions(self, impressions):
+        """
+        Return the impressions that must be stored.
+
+        :param impressions: Generated impressions.
+        :type impressions: list(splitio.models.impressions.Impression)
+
+        :rtype: list(splitio.models.impressions.Impression)
+        """
+        if self._observer is None:
+            return impressions
+
+        to_store = []
+        dropped = []
+        for impression in impressions:
+            previous = self._observer.test_and_set(impression)
+            if previous is not None and \
+                    truncate_time_frame(previous) == truncate_time_frame(impression.time):
+                dropped.append(impression)
+            else:
+                to_store.append(impression)
+
+        if dropped:
+            self._counter.track(dropped)
+        return to_store
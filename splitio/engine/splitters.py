@@ -1,14 +1,37 @@
 """A module for implementation of the Splitter engine."""
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+import logging
 
-from splitio.engine.evaluator import CONTROL
-from splitio.engine.hashfns import get_hash_fn
+from splitio.engine import CONTROL
+from splitio.engine.hashfns import get_hash_fn, buckets_many
+from splitio.util.lru import LRUCache
+
+try:
+    # Vectorized bucket calculations when numpy is available.
+    import numpy
+except ImportError:
+    numpy = None  #pylint: disable=invalid-name
 
 
 class Splitter(object):
     """Class responsible for choosing the right partition."""
 
+    _METRIC_CACHE_PREFIX = 'splitter.bucketCache'
+
+    def __init__(self, cache_size=0, telemetry_storage=None):
+        """
+        Class constructor.
+
+        :param cache_size: Maximum number of buckets to memoize (0 disables the cache).
+        :type cache_size: int
+        :param telemetry_storage: Optional storage where cache size & hit rate are reported.
+        :type telemetry_storage: splitio.storage.TelemetryStorage
+        """
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._cache = LRUCache(cache_size, telemetry_storage, self._METRIC_CACHE_PREFIX) \
+            if cache_size > 0 else None
+
     def get_treatment(self, key, seed, partitions, algo):
         """
         Return the appropriate treatment or CONTROL if no partitions are found.
@@ -33,20 +56,73 @@ class Splitter(object):
             partitions
         )
 
-    @staticmethod
-    def get_bucket(key, seed, algo):
+    def get_bucket(self, key, seed, algo):
         """
         Get the bucket for a key hash.
 
+        If the bucket cache is enabled, buckets are memoized by (key, seed, algo).
+
         :param key_hash: The hash for a key
         :type key_hash: int
         :return: The bucked for a hash
         :rtype: int
         """
+        if self._cache is None:
+            return self._calculate_bucket(key, seed, algo)
+
+        cache_key = (key, seed, algo)
+        bucket = self._cache.get(cache_key)
+        if bucket is None:
+            bucket = self._calculate_bucket(key, seed, algo)
+            self._cache.put(cache_key, bucket)
+        return bucket
+
+    @staticmethod
+    def _calculate_bucket(key, seed, algo):
+        """
+        Hash a key and get it's bucket.
+
+        :return: The bucked for the key
+        :rtype: int
+        """
         hashfn = get_hash_fn(algo)
         key_hash = hashfn(key, seed)
         return abs(key_hash) % 100 + 1
 
+    @staticmethod
+    def get_buckets(keys, seed, algo):
+        """
+        Get the buckets for many keys hashed with the same seed.
+
+        Batches are hashed in a single vectorized pass and bypass the bucket cache.
+
+        :param keys: Keys for which to calculate the buckets.
+        :type keys: list(str)
+        :param seed: The feature seed
+        :type seed: int
+        :param algo: Hash algorithm to use.
+        :type algo: splitio.models.splits.HashAlgorithm
+        :return: The buckets for each key, in the same order.
+        :rtype: list(int)|numpy.ndarray
+        """
+        return buckets_many(keys, seed, algo)
+
+    @staticmethod
+    def get_treatments_for_buckets(buckets, table):
+        """
+        Map many buckets to treatments using a precomputed bucket->treatment table.
+
+        :param buckets: Buckets as returned by get_buckets.
+        :type buckets: list(int)|numpy.ndarray
+        :param table: Sequence where the item at position `n` is the treatment for bucket `n`.
+        :type table: tuple
+        :return: The treatments for each bucket, in the same order.
+        :rtype: list(str)
+        """
+        if numpy is not None:
+            return numpy.asarray(table, dtype=object)[numpy.asarray(buckets)].tolist()
+        return [table[bucket] for bucket in buckets]
+
     @staticmethod
     def get_treatment_for_bucket(bucket, partitions):
         """
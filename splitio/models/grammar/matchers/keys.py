@@ -74,6 +74,12 @@ class UserDefinedSegmentMatcher(Matcher):
         matching_data = self._get_matcher_input(key, attributes)
         if matching_data is None:
             return False
+
+        memberships = context.get('segment_memberships')
+        if memberships:
+            contained = memberships.get((self._segment_name, matching_data))
+            if contained is not None:
+                return contained
         return segment_storage.segment_contains(self._segment_name, matching_data)
 
     def _add_matcher_specific_properties_to_json(self):
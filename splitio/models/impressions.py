@@ -18,6 +18,15 @@ Impression = namedtuple(
     ]
 )
 
+ImpressionCount = namedtuple(
+    'ImpressionCount',
+    [
+        'feature_name',
+        'time_frame',
+        'count'
+    ]
+)
+
 
 class Label(object):  # pylint: disable=too-few-public-methods
     """Impressions labels."""
@@ -1,4 +1,19 @@
 """Segment module."""
+from array import array
+from bisect import bisect_left
+import hashlib
+import struct
+
+import six
+
+try:
+    _HASH_TYPECODE = 'Q'
+    array(_HASH_TYPECODE)
+except ValueError:
+    # Python 2 arrays have no 'Q' typecode.
+    _HASH_TYPECODE = 'L'
+
+_HASH_MASK = (1 << (array(_HASH_TYPECODE).itemsize * 8)) - 1
 
 
 class Segment(object):
@@ -23,6 +38,10 @@ class Segment(object):
         """Return segment name."""
         return self._name
 
+    def __len__(self):
+        """Return the number of keys in the segment."""
+        return len(self._keys)
+
     def contains(self, key):
         """
         Return whether the supplied key belongs to the segment.
@@ -35,26 +54,43 @@ class Segment(object):
         """
         return key in self._keys
 
+    def __iter__(self):
+        """
+        Iterate over the segment keys, without copying them.
+
+        The segment must not be updated while iterating.
+
+        :rtype: iterator
+        """
+        return iter(self._keys)
+
     def update(self, to_add, to_remove):
         """
-        Add supplied keys to the segment.
+        Add & remove supplied keys, in place.
+
+        Only the delta is touched: the key set is never copied. Each membership check running
+        concurrently sees a key either before or after it's updated.
 
         :param to_add: List of keys to add.
         :type to_add: list
         :param to_remove: List of keys to remove.
         :type to_remove: list
         """
-        self._keys = self._keys.union(set(to_add)).difference(to_remove)
+        self._keys.update(to_add)
+        self._keys.difference_update(to_remove)
 
     @property
     def keys(self):
         """
-        Return the segment keys.
+        Return a snapshot of the segment keys.
+
+        The key set is updated in place, so a copy is returned to keep callers iterating it
+        safe from concurrent updates.
 
         :return: A set of the segment keys
-        :rtype: set
+        :rtype: frozenset
         """
-        return self._keys
+        return frozenset(self._keys)
 
     @property
     def change_number(self):
@@ -72,6 +108,279 @@ class Segment(object):
         self._change_number = new_value
 
 
+def _encode_key(key):
+    """
+    Return the utf-8 encoded key.
+
+    :param key: Segment key.
+    :type key: str
+
+    :rtype: bytes
+    """
+    return key.encode('utf-8') if isinstance(key, six.text_type) else key
+
+
+def _hash_key(encoded_key):
+    """
+    Return a stable 64 bit (or the platform's array long size) hash of an encoded key.
+
+    :param encoded_key: utf-8 encoded key.
+    :type encoded_key: bytes
+
+    :rtype: int
+    """
+    return struct.unpack('<Q', hashlib.sha1(encoded_key).digest()[:8])[0] & _HASH_MASK
+
+
+def hash_key(key):
+    """
+    Return the hash compact segments store for a key.
+
+    :param key: Segment key.
+    :type key: str
+
+    :rtype: int
+    """
+    return _hash_key(_encode_key(key))
+
+
+class CompactSegment(object):
+    """
+    Memory-compact segment, for segments with millions of keys.
+
+    Keys are stored as a sorted array of 64 bit hashes and looked up by binary search, taking
+    8 bytes per key instead of a python string in a set. A hash collision can make `contains`
+    return True for a key that isn't in the segment. With `verify` enabled, the utf-8 encoded
+    keys are also kept, concatenated in a single buffer, and matching hashes are checked
+    against them so results are exact.
+
+    Deltas are kept in a small overlay of added & removed keys that is checked before the
+    arrays. Once the overlay grows past a fraction of the segment, it's merged into new arrays
+    by copying the slices between the positions of the changed keys. Every update swaps in the
+    whole state at once, so lookups never see a partially updated segment.
+    """
+
+    _MIN_OVERLAY_SIZE = 1024
+    _OVERLAY_RATIO = 16
+
+    def __init__(self, name, keys, change_number, verify=False):
+        """
+        Class constructor.
+
+        :param name: Segment name.
+        :type name: str
+        :param keys: Keys belonging to the segment.
+        :type keys: iterable
+        :param change_number: Segment change number.
+        :type change_number: int
+        :param verify: Whether to keep the keys to avoid false positives on hash collisions.
+        :type verify: bool
+        """
+        self._name = name
+        self._change_number = change_number
+        self._verify = verify
+        self._data = self._build(keys) + (frozenset(), frozenset())
+
+    def _build(self, keys):
+        """
+        Build the segment arrays from its keys.
+
+        :param keys: Keys belonging to the segment.
+        :type keys: iterable
+
+        :return: Tuple of hashes, key offsets & keys buffer. The last two are None if not
+            verifying.
+        :rtype: tuple
+        """
+        if not self._verify:
+            return array(_HASH_TYPECODE, _unique(sorted(hash_key(key) for key in keys))), \
+                None, None
+
+        hashes = array(_HASH_TYPECODE)
+        offsets = array(_HASH_TYPECODE, [0])
+        buf = bytearray()
+        encoded_keys = (_encode_key(key) for key in keys)
+        for key_hash, encoded in _unique(sorted((_hash_key(key), key) for key in encoded_keys)):
+            hashes.append(key_hash)
+            buf.extend(encoded)
+            offsets.append(len(buf))
+        return hashes, offsets, bytes(buf)
+
+    @staticmethod
+    def _find(data, encoded, key_hash, start=0):
+        """
+        Return the position of a key in the segment arrays, ignoring the overlay.
+
+        :param data: Segment state.
+        :type data: tuple
+        :param encoded: utf-8 encoded key.
+        :type encoded: bytes
+        :param key_hash: Hash of the key.
+        :type key_hash: int
+        :param start: Position to start searching from.
+        :type start: int
+
+        :return: Position of the key, or -1 if it's not in the arrays.
+        :rtype: int
+        """
+        hashes, offsets, buf = data[:3]
+        index = bisect_left(hashes, key_hash, start)
+        while index < len(hashes) and hashes[index] == key_hash:
+            if offsets is None or buf[offsets[index]:offsets[index + 1]] == encoded:
+                return index
+            index += 1
+        return -1
+
+    @staticmethod
+    def _compact(data):
+        """
+        Merge the overlay into new segment arrays.
+
+        Only the added & removed keys are handled one by one: the arrays between them are
+        copied as slices.
+
+        :param data: Segment state.
+        :type data: tuple
+
+        :return: New segment state, with an empty overlay.
+        :rtype: tuple
+        """
+        hashes, offsets, buf, added, removed = data
+        changes = sorted(
+            [(_hash_key(encoded), encoded, True) for encoded in added] +
+            [(_hash_key(encoded), encoded, False) for encoded in removed]
+        )
+
+        new_hashes = array(_HASH_TYPECODE)
+        new_offsets = array(_HASH_TYPECODE, [0]) if offsets is not None else None
+        chunks = []
+
+        def _copy(start, stop):
+            new_hashes.extend(hashes[start:stop])
+            if new_offsets is not None and stop > start:
+                shift = new_offsets[-1] - offsets[start]
+                new_offsets.extend(offset + shift for offset in offsets[start + 1:stop + 1])
+                chunks.append(buf[offsets[start]:offsets[stop]])
+
+        position = 0
+        for key_hash, encoded, is_add in changes:
+            if is_add:
+                index = bisect_left(hashes, key_hash, position)
+                _copy(position, index)
+                new_hashes.append(key_hash)
+                if new_offsets is not None:
+                    chunks.append(encoded)
+                    new_offsets.append(new_offsets[-1] + len(encoded))
+                position = index
+            else:
+                index = CompactSegment._find(data, encoded, key_hash, position)
+                if index >= 0:
+                    _copy(position, index)
+                    position = index + 1
+        _copy(position, len(hashes))
+
+        new_buf = b''.join(chunks) if new_offsets is not None else None
+        return new_hashes, new_offsets, new_buf, frozenset(), frozenset()
+
+    @property
+    def name(self):
+        """Return segment name."""
+        return self._name
+
+    def __len__(self):
+        """Return the number of keys in the segment."""
+        hashes, _, _, added, removed = self._data
+        return len(hashes) + len(added) - len(removed)
+
+    @property
+    def hashes(self):
+        """
+        Return the sorted key hashes. The array must not be modified.
+
+        :rtype: array.array
+        """
+        data = self._data
+        if data[3] or data[4]:
+            data = self._compact(data)
+        return data[0]
+
+    def contains(self, key):
+        """
+        Return whether the supplied key belongs to the segment.
+
+        :param key: User key.
+        :type key: str
+
+        :return: True if the user is in the segment. False otherwise.
+        :rtype: bool
+        """
+        data = self._data
+        encoded = _encode_key(key)
+        if encoded in data[3]:
+            return True
+        if encoded in data[4]:
+            return False
+        return self._find(data, encoded, _hash_key(encoded)) >= 0
+
+    def update(self, to_add, to_remove):
+        """
+        Add & remove supplied keys.
+
+        :param to_add: List of keys to add.
+        :type to_add: list
+        :param to_remove: List of keys to remove.
+        :type to_remove: list
+        """
+        data = self._data
+        added = set(data[3])
+        removed = set(data[4])
+        for encoded in (_encode_key(key) for key in to_add):
+            removed.discard(encoded)
+            if self._find(data, encoded, _hash_key(encoded)) < 0:
+                added.add(encoded)
+        for encoded in (_encode_key(key) for key in to_remove):
+            added.discard(encoded)
+            if self._find(data, encoded, _hash_key(encoded)) >= 0:
+                removed.add(encoded)
+
+        updated = data[:3] + (frozenset(added), frozenset(removed))
+        if len(added) + len(removed) > \
+                max(self._MIN_OVERLAY_SIZE, len(data[0]) // self._OVERLAY_RATIO):
+            updated = self._compact(updated)
+        self._data = updated
+
+    @property
+    def change_number(self):
+        """Return segment change number."""
+        return self._change_number
+
+    @change_number.setter
+    def change_number(self, new_value):
+        """
+        Set new change number.
+
+        :param new_value: New change number.
+        :type new_value: int
+        """
+        self._change_number = new_value
+
+
+def _unique(items):
+    """
+    Skip repeated items of a sorted iterable.
+
+    :param items: Sorted items.
+    :type items: iterable
+
+    :rtype: generator
+    """
+    previous = None
+    for item in items:
+        if item != previous:
+            yield item
+        previous = item
+
+
 def from_raw(raw_segment):
     """
     Parse a new segment from a raw segment_changes response.
@@ -57,6 +57,25 @@ class SplitStorage(object):
         """
         pass
 
+    def apply_changes(self, to_put, to_remove, change_number):
+        """
+        Apply a whole split changeset and update the change number.
+
+        Storages should override this method to apply the changeset in a single step.
+
+        :param to_put: Splits to add or update.
+        :type to_put: list(splitio.models.splits.Split)
+        :param to_remove: Names of the splits to remove.
+        :type to_remove: list(str)
+        :param change_number: Change number of the changeset.
+        :type change_number: int
+        """
+        for split in to_put:
+            self.put(split)
+        for split_name in to_remove:
+            self.remove(split_name)
+        self.set_change_number(change_number)
+
     @abc.abstractmethod
     def get_change_number(self):
         """
@@ -123,6 +142,9 @@ class SplitStorage(object):
 class SegmentStorage(object):
     """Segment storage interface implemented as an abstract class."""
 
+    # Whether `segment_contains_many` is cheaper than checking each segment on demand.
+    batches_membership_checks = False
+
     @abc.abstractmethod
     def get(self, segment_name):
         """
@@ -148,7 +170,7 @@ class SegmentStorage(object):
     @abc.abstractmethod
     def update(self, segment_name, to_add, to_remove, change_number=None):
         """
-        Store a split.
+        Update a segment. Create it if it doesn't exist.
 
         :param segment_name: Name of the segment to update.
         :type segment_name: str
@@ -198,6 +220,29 @@ class SegmentStorage(object):
         """
         pass
 
+    def segment_contains_many(self, segment_names, key):
+        """
+        Check whether a specific key belongs to each of many segments.
+
+        Storages backed by remote services should override this to check every segment in
+        a single round trip, and set `batches_membership_checks` so the evaluator uses it.
+
+        :param segment_names: Names of the segments to search in.
+        :type segment_names: list(str)
+        :param key: Key to search for.
+        :type key: str
+
+        :return: Dict of segment name -> membership. Segments that couldn't be checked are
+            left out.
+        :rtype: dict
+        """
+        results = {}
+        for segment_name in segment_names:
+            contained = self.segment_contains(segment_name, key)
+            if contained is not None:
+                results[segment_name] = contained
+        return results
+
 
 @add_metaclass(abc.ABCMeta)
 class ImpressionStorage(object):
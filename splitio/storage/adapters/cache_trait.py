@@ -6,9 +6,12 @@ from functools import update_wrapper
 
 import six
 
+from splitio.util.lru import LRUCache
+
 
 DEFAULT_MAX_AGE = 5
 DEFAULT_MAX_SIZE = 100
+DEFAULT_VERSIONED_MAX_SIZE = 1000
 
 
 class LocalMemoryCache(object):  #pylint: disable=too-many-instance-attributes
@@ -154,6 +157,73 @@ class LocalMemoryCache(object):  #pylint: disable=too-many-instance-attributes
         return '<MRU>\n' + '\n'.join(nodes) + '\n<LRU>'
 
 
+class VersionedLocalCache(object):
+    """
+    Key/Value local memory cache invalidated whenever the version of the data changes.
+
+    Items never expire on their own. Callers supply the current version on every access
+    and the whole cache is dropped as soon as it differs from the one items were stored for.
+    At most `max_size` items are kept, evicting the least recently used ones, and None values
+    (misses) are never cached.
+    """
+
+    def __init__(self, max_size=DEFAULT_VERSIONED_MAX_SIZE):
+        """
+        Class constructor.
+
+        :param max_size: Maximum number of items to keep.
+        :type max_size: int
+        """
+        self._max_size = max_size
+        self._data = LRUCache(max_size)
+        self._version = None
+        self._lock = threading.Lock()
+
+    def get_many(self, version, keys, fetch_func):
+        """
+        Fetch items from the cache, calling `fetch_func` to retrieve the missing ones.
+
+        :param version: Current version of the data.
+        :type version: object
+        :param keys: Keys of the items to fetch.
+        :type keys: list
+        :param fetch_func: Function that receives a list of keys and returns a dict with the
+            items to cache. Keys not present in the result, or mapped to None, are not cached.
+        :type fetch_func: callable
+
+        :return: Dict with every key found in the cache or returned by `fetch_func`.
+        :rtype: dict
+        """
+        with self._lock:
+            if version != self._version:
+                self._version = version
+                self._data = LRUCache(self._max_size)
+            data = self._data
+
+        found = {}
+        for key in keys:
+            value = data.get(key)
+            if value is not None:
+                found[key] = value
+
+        missing = [key for key in keys if key not in found]
+        if missing:
+            fetched = fetch_func(missing)
+            with self._lock:
+                if version == self._version:
+                    for key, value in six.iteritems(fetched):
+                        if value is not None:
+                            data.put(key, value)
+            found.update(fetched)
+        return found
+
+    def clear(self):
+        """Clear the cache."""
+        with self._lock:
+            self._data = LRUCache(self._max_size)
+            self._version = None
+
+
 def decorate(key_func, max_age_seconds=DEFAULT_MAX_AGE, max_size=DEFAULT_MAX_SIZE):
     """
     Decorate a function or method to cache results up  to `max_age_seconds`.
@@ -140,6 +140,14 @@ class RedisAdapter(object):  #pylint: disable=too-many-public-methods
         except RedisError as exc:
             raise_from(RedisAdapterException('Failed to execute keys operation'), exc)
 
+    def scan_iter(self, pattern, count=None):
+        """Mimic original redis function but using user custom prefix."""
+        try:
+            for key in self._decorated.scan_iter(match=self._add_prefix(pattern), count=count):
+                yield self._remove_prefix(_bytes_to_string(key))
+        except RedisError as exc:
+            raise_from(RedisAdapterException('Failed to execute scan operation'), exc)
+
     def set(self, name, value, *args, **kwargs):
         """Mimic original redis function but using user custom prefix."""
         try:
@@ -295,6 +303,133 @@ class RedisAdapter(object):  #pylint: disable=too-many-public-methods
         except RedisError as exc:
             raise_from(RedisAdapterException('Error executing lpop operation'), exc)
 
+    def pipeline(self, transaction=False):
+        """
+        Return a pipeline that queues commands (using user custom prefix) until executed.
+
+        :param transaction: Whether the commands should be wrapped in a MULTI/EXEC block.
+        :type transaction: bool
+
+        :rtype: RedisPipelineAdapter
+        """
+        try:
+            return RedisPipelineAdapter(self._decorated.pipeline(transaction=transaction), self)
+        except RedisError as exc:
+            raise_from(RedisAdapterException('Error creating pipeline'), exc)
+
+
+class RedisPipelineAdapter(object):
+    """
+    Instance decorator for redis pipelines.
+
+    Commands are queued with the user prefix applied and sent in a single round trip when
+    `execute` is called. Results are post-processed the same way `RedisAdapter` does.
+    """
+
+    def __init__(self, decorated, adapter):
+        """
+        Store the pipeline and the adapter used to handle prefixes.
+
+        :param decorated: Redis pipeline to decorate.
+        :param adapter: Adapter used to add the user prefix to keys.
+        :type adapter: RedisAdapter
+        """
+        self._decorated = decorated
+        self._adapter = adapter
+        self._post_processors = []
+
+    def _queue(self, post_processor, command, key, *args):
+        """
+        Queue a command with the user prefix applied to its key.
+
+        :param post_processor: Function applied to the command result upon execution.
+        :type post_processor: callable
+        :param command: Name of the redis command to queue.
+        :type command: str
+        :param key: Key the command operates on.
+        :type key: str
+
+        :return: This pipeline, so that calls can be chained.
+        :rtype: RedisPipelineAdapter
+        """
+        getattr(self._decorated, command)(
+            self._adapter._add_prefix(key),  #pylint: disable=protected-access
+            *args
+        )
+        self._post_processors.append(post_processor)
+        return self
+
+    def get(self, name):
+        """Queue a get command."""
+        return self._queue(_bytes_to_string, 'get', name)
+
+    def set(self, name, value):
+        """Queue a set command."""
+        return self._queue(_identity, 'set', name, value)
+
+    def delete(self, name):
+        """Queue a delete command."""
+        return self._queue(_identity, 'delete', name)
+
+    def smembers(self, name):
+        """Queue a smembers command."""
+        return self._queue(_items_to_string, 'smembers', name)
+
+    def sadd(self, name, *values):
+        """Queue a sadd command."""
+        return self._queue(_identity, 'sadd', name, *values)
+
+    def srem(self, name, *values):
+        """Queue a srem command."""
+        return self._queue(_identity, 'srem', name, *values)
+
+    def sismember(self, name, value):
+        """Queue a sismember command."""
+        return self._queue(_identity, 'sismember', name, value)
+
+    def scard(self, name):
+        """Queue a scard command."""
+        return self._queue(_identity, 'scard', name)
+
+    def incr(self, name, amount=1):
+        """Queue an incr command."""
+        return self._queue(_identity, 'incr', name, amount)
+
+    def rpush(self, key, *values):
+        """Queue a rpush command."""
+        return self._queue(_identity, 'rpush', key, *values)
+
+    def expire(self, key, value):
+        """Queue an expire command."""
+        return self._queue(_identity, 'expire', key, value)
+
+    def execute(self):
+        """
+        Send all queued commands in a single round trip.
+
+        :return: Results of every queued command, in order.
+        :rtype: list
+        """
+        try:
+            results = self._decorated.execute()
+        except RedisError as exc:
+            raise_from(RedisAdapterException('Error executing pipeline'), exc)
+        finally:
+            post_processors = self._post_processors
+            self._post_processors = []
+        return [
+            post_processor(result)
+            for post_processor, result in zip(post_processors, results)
+        ]
+
+
+def _identity(value):
+    return value
+
+
+def _items_to_string(items):
+    return [_bytes_to_string(item) for item in items]
+
 
 def _build_default_client(config):  #pylint: disable=too-many-locals
     """
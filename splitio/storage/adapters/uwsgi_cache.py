@@ -125,6 +125,11 @@ class UWSGICacheEmulator(object):
         """Delete all elements in cache."""
         self._cache.pop(cache_namespace, None)
 
+    @staticmethod
+    def worker_id():
+        """Return the id of the current worker (0 outside workers, as in the master)."""
+        return 0
+
 
 def get_uwsgi(emulator=False):
     """Return a uwsgi imported module or an emulator to use in unit test."""
@@ -6,7 +6,8 @@ import threading
 from collections import Counter
 
 from six.moves import queue
-from splitio.models.segments import Segment
+from splitio.engine.compiler import compile_split
+from splitio.models.segments import Segment, CompactSegment
 from splitio.storage import SplitStorage, SegmentStorage, ImpressionStorage, EventStorage, \
     TelemetryStorage
 
@@ -14,7 +15,14 @@ MAX_SIZE_BYTES = 5 * 1024 * 1024
 
 
 class InMemorySplitStorage(SplitStorage):
-    """InMemory implementation of a split storage."""
+    """
+    InMemory implementation of a split storage.
+
+    Changesets applied through `apply_changes` replace an immutable snapshot atomically (under
+    a lock that serializes writers only), so that reads never block and never see half a
+    changeset. Single `put`/`remove` calls update the current mapping in place instead of
+    copying it on every call.
+    """
 
     def __init__(self):
         """Constructor."""
@@ -33,8 +41,7 @@ class InMemorySplitStorage(SplitStorage):
 
         :rtype: splitio.models.splits.Split
         """
-        with self._lock:
-            return self._splits.get(split_name)
+        return self._splits.get(split_name)
 
     def fetch_many(self, split_names):
         """
@@ -46,7 +53,8 @@ class InMemorySplitStorage(SplitStorage):
         :return: A dict with split objects parsed from queue.
         :rtype: dict(split_name, splitio.models.splits.Split)
         """
-        return {split_name: self.get(split_name) for split_name in split_names}
+        splits = self._splits
+        return {split_name: splits.get(split_name) for split_name in split_names}
 
     def put(self, split):
         """
@@ -55,11 +63,14 @@ class InMemorySplitStorage(SplitStorage):
         :param split: Split object.
         :type split: splitio.models.split.Split
         """
+        self._compile(split)
         with self._lock:
-            if split.name in self._splits:
-                self._decrease_traffic_type_count(self._splits[split.name].traffic_type_name)
+            # The traffic type is counted before the split becomes visible.
+            self._increase_traffic_type_count(self._traffic_types, split.traffic_type_name)
+            current = self._splits.get(split.name)
             self._splits[split.name] = split
-            self._increase_traffic_type_count(split.traffic_type_name)
+            if current is not None:
+                self._decrease_traffic_type_count(self._traffic_types, current.traffic_type_name)
 
     def remove(self, split_name):
         """
@@ -72,23 +83,58 @@ class InMemorySplitStorage(SplitStorage):
         :rtype: bool
         """
         with self._lock:
-            split = self._splits.get(split_name)
+            split = self._splits.pop(split_name, None)
             if not split:
                 self._logger.warning("Tried to delete nonexistant split %s. Skipping", split_name)
                 return False
 
-            self._splits.pop(split_name)
-            self._decrease_traffic_type_count(split.traffic_type_name)
+            self._decrease_traffic_type_count(self._traffic_types, split.traffic_type_name)
             return True
 
+    def apply_changes(self, to_put, to_remove, change_number):
+        """
+        Apply a whole split changeset and update the change number in a single swap.
+
+        :param to_put: Splits to add or update.
+        :type to_put: list(splitio.models.splits.Split)
+        :param to_remove: Names of the splits to remove.
+        :type to_remove: list(str)
+        :param change_number: Change number of the changeset.
+        :type change_number: int
+        """
+        for split in to_put:
+            self._compile(split)
+
+        with self._lock:
+            splits = dict(self._splits)
+            traffic_types = Counter(self._traffic_types)
+            for split in to_put:
+                current = splits.get(split.name)
+                if current is not None:
+                    self._decrease_traffic_type_count(traffic_types, current.traffic_type_name)
+                splits[split.name] = split
+                self._increase_traffic_type_count(traffic_types, split.traffic_type_name)
+
+            for split_name in to_remove:
+                current = splits.pop(split_name, None)
+                if current is None:
+                    self._logger.warning(
+                        "Tried to delete nonexistant split %s. Skipping",
+                        split_name
+                    )
+                    continue
+                self._decrease_traffic_type_count(traffic_types, current.traffic_type_name)
+
+            self._swap(splits, traffic_types)
+            self._change_number = change_number
+
     def get_change_number(self):
         """
         Retrieve latest split change number.
 
         :rtype: int
         """
-        with self._lock:
-            return self._change_number
+        return self._change_number
 
     def set_change_number(self, new_change_number):
         """
@@ -107,8 +153,7 @@ class InMemorySplitStorage(SplitStorage):
         :return: List of split names.
         :rtype: list(str)
         """
-        with self._lock:
-            return list(self._splits.keys())
+        return list(self._splits.keys())
 
     def get_all_splits(self):
         """
@@ -117,8 +162,7 @@ class InMemorySplitStorage(SplitStorage):
         :return: List of all the splits.
         :rtype: list
         """
-        with self._lock:
-            return list(self._splits.values())
+        return list(self._splits.values())
 
     def is_valid_traffic_type(self, traffic_type_name):
         """
@@ -130,35 +174,88 @@ class InMemorySplitStorage(SplitStorage):
         :return: True if the traffic type is valid. False otherwise.
         :rtype: bool
         """
-        with self._lock:
-            return traffic_type_name in self._traffic_types
+        return traffic_type_name in self._traffic_types
+
+    def _swap(self, splits, traffic_types):
+        """
+        Replace the current snapshot. Must be called while holding the lock.
+
+        Traffic types are swapped first so that a split is never visible before its traffic type.
 
-    def _increase_traffic_type_count(self, traffic_type_name):
+        :param splits: New split name -> split mapping.
+        :type splits: dict
+        :param traffic_types: New traffic type counters.
+        :type traffic_types: collections.Counter
+        """
+        self._traffic_types = traffic_types
+        self._splits = splits
+
+    def _compile(self, split):
+        """
+        Build the evaluation plan for a split prior to storing it.
+
+        If the split cannot be compiled, it's stored as is and evaluated by walking its conditions.
+
+        :param split: Split object.
+        :type split: splitio.models.split.Split
+        """
+        try:
+            compile_split(split)
+        except Exception:  #pylint: disable=broad-except
+            self._logger.warning('Could not build evaluation plan for split %s.', split.name)
+            self._logger.debug('Error: ', exc_info=True)
+
+    @staticmethod
+    def _increase_traffic_type_count(traffic_types, traffic_type_name):
         """
         Increase by one the count for a specific traffic type name.
 
+        :param traffic_types: Traffic type counters to update.
+        :type traffic_types: collections.Counter
         :param traffic_type_name: Traffic type to increase the count.
         :type traffic_type_name: str
         """
-        self._traffic_types.update([traffic_type_name])
+        traffic_types.update([traffic_type_name])
 
-    def _decrease_traffic_type_count(self, traffic_type_name):
+    @staticmethod
+    def _decrease_traffic_type_count(traffic_types, traffic_type_name):
         """
         Decrease by one the count for a specific traffic type name.
 
+        :param traffic_types: Traffic type counters to update.
+        :type traffic_types: collections.Counter
         :param traffic_type_name: Traffic type to decrease the count.
         :type traffic_type_name: str
         """
-        self._traffic_types.subtract([traffic_type_name])
-        self._traffic_types += Counter()
+        traffic_types.subtract([traffic_type_name])
+        if traffic_types[traffic_type_name] <= 0:
+            del traffic_types[traffic_type_name]
 
 
 class InMemorySegmentStorage(SegmentStorage):
-    """In-memory implementation of a segment storage."""
+    """
+    In-memory implementation of a segment storage.
 
-    def __init__(self):
-        """Constructor."""
+    New segments are stored by swapping in a new snapshot of the segments dict, and deltas are
+    applied in place to the stored segment. A lock serializes writers only, so reads never
+    block, and a membership check sees each key either before or after it's updated.
+
+    Segments with at least `compact_threshold` keys are stored as `CompactSegment`s.
+    """
+
+    def __init__(self, compact_threshold=0, compact_verify=False):
+        """
+        Constructor.
+
+        :param compact_threshold: Minimum number of keys for a segment to be stored compacted.
+            0 disables compaction.
+        :type compact_threshold: int
+        :param compact_verify: Whether compacted segments keep their keys for exact lookups.
+        :type compact_verify: bool
+        """
         self._logger = logging.getLogger(self.__class__.__name__)
+        self._compact_threshold = compact_threshold
+        self._compact_verify = compact_verify
         self._segments = {}
         self._change_numbers = {}
         self._lock = threading.RLock()
@@ -172,14 +269,13 @@ class InMemorySegmentStorage(SegmentStorage):
 
         :rtype: str
         """
-        with self._lock:
-            fetched = self._segments.get(segment_name)
-            if fetched is None:
-                self._logger.warning(
-                    "Tried to retrieve nonexistant segment %s. Skipping",
-                    segment_name
-                )
-            return fetched
+        fetched = self._segments.get(segment_name)
+        if fetched is None:
+            self._logger.warning(
+                "Tried to retrieve nonexistant segment %s. Skipping",
+                segment_name
+            )
+        return fetched
 
     def put(self, segment):
         """
@@ -189,7 +285,7 @@ class InMemorySegmentStorage(SegmentStorage):
         :type segment: splitio.models.segment.Segment
         """
         with self._lock:
-            self._segments[segment.name] = segment
+            self._swap(self._maybe_compact(segment))
 
     def update(self, segment_name, to_add, to_remove, change_number=None):
         """
@@ -203,13 +299,17 @@ class InMemorySegmentStorage(SegmentStorage):
         :type to_remove: Set
         """
         with self._lock:
-            if segment_name not in self._segments:
-                self._segments[segment_name] = Segment(segment_name, to_add, change_number)
+            current = self._segments.get(segment_name)
+            if current is None:
+                self._swap(self._build_segment(segment_name, to_add, to_remove, change_number))
                 return
 
-            self._segments[segment_name].update(to_add, to_remove)
+            current.update(to_add, to_remove)
             if change_number is not None:
-                self._segments[segment_name].change_number = change_number
+                current.change_number = change_number
+            compacted = self._maybe_compact(current)
+            if compacted is not current:
+                self._swap(compacted)
 
     def get_change_number(self, segment_name):
         """
@@ -220,10 +320,10 @@ class InMemorySegmentStorage(SegmentStorage):
 
         :rtype: int
         """
-        with self._lock:
-            if segment_name not in self._segments:
-                return None
-            return self._segments[segment_name].change_number
+        segment = self._segments.get(segment_name)
+        if segment is None:
+            return None
+        return segment.change_number
 
     def set_change_number(self, segment_name, new_change_number):
         """
@@ -235,9 +335,10 @@ class InMemorySegmentStorage(SegmentStorage):
         :type new_change_number: int
         """
         with self._lock:
-            if segment_name not in self._segments:
+            current = self._segments.get(segment_name)
+            if current is None:
                 return
-            self._segments[segment_name].change_number = new_change_number
+            current.change_number = new_change_number
 
     def segment_contains(self, segment_name, key):
         """
@@ -251,14 +352,70 @@ class InMemorySegmentStorage(SegmentStorage):
         :return: True if the segment contains the key. False otherwise.
         :rtype: bool
         """
-        with self._lock:
-            if segment_name not in self._segments:
-                self._logger.warning(
-                    "Tried to query members for nonexistant segment %s. Returning False",
-                    segment_name
-                )
-                return False
-            return self._segments[segment_name].contains(key)
+        segment = self._segments.get(segment_name)
+        if segment is None:
+            self._logger.warning(
+                "Tried to query members for nonexistant segment %s. Returning False",
+                segment_name
+            )
+            return False
+        return segment.contains(key)
+
+    def _build_segment(self, segment_name, to_add, to_remove, change_number):
+        """
+        Build a new segment straight from the fetched keys, compacted if it's big enough.
+
+        :param segment_name: Name of the segment.
+        :type segment_name: str
+        :param to_add: List of members of the segment.
+        :type to_add: list
+        :param to_remove: List of members to leave out.
+        :type to_remove: list
+        :param change_number: Segment change number.
+        :type change_number: int
+
+        :rtype: splitio.models.segment.Segment|splitio.models.segment.CompactSegment
+        """
+        removed = set(to_remove)
+        keys = (key for key in to_add if key not in removed)
+        if self._compact_threshold and len(to_add) >= self._compact_threshold:
+            return CompactSegment(segment_name, keys, change_number, self._compact_verify)
+        return Segment(segment_name, keys, change_number)
+
+    def _maybe_compact(self, segment):
+        """
+        Return a compacted copy of the segment if it's big enough. Otherwise return it as is.
+
+        Must be called while holding the lock, since the segment keys are read without copying
+        them.
+
+        :param segment: Segment to store.
+        :type segment: splitio.models.segment.Segment
+
+        :rtype: splitio.models.segment.Segment|splitio.models.segment.CompactSegment
+        """
+        if not self._compact_threshold or isinstance(segment, CompactSegment) \
+                or len(segment) < self._compact_threshold:
+            return segment
+        return CompactSegment(
+            segment.name,
+            segment,
+            segment.change_number,
+            self._compact_verify
+        )
+
+    def _swap(self, segment):
+        """
+        Replace the current snapshot with one holding the supplied segment.
+
+        Must be called while holding the lock.
+
+        :param segment: Segment to store.
+        :type segment: splitio.models.segment.Segment
+        """
+        segments = dict(self._segments)
+        segments[segment.name] = segment
+        self._segments = segments
 
 
 class InMemoryImpressionStorage(ImpressionStorage):
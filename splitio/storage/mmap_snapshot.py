@@ -0,0 +1,433 @@
+"""
+Memory-mapped snapshot storages, for prefork servers.
+
+A single synchronizer process writes splits & segments to a versioned snapshot file, and
+every worker maps it read-only. The file is replaced atomically (written to a temporary file
+and renamed over the previous one) whenever the data changes.
+
+Layout:
+    - 8 bytes magic (`SPLITSNP`).
+    - 8 bytes little endian length of the index.
+    - JSON index: splits (raw), splits change number and, for each segment, its change
+      number, and the offset (from the end of the index) & count of its key hashes.
+    - Sorted little endian 64 bit key hashes of each segment, looked up in place by binary
+      search.
+
+Only key hashes are stored, so lookups can't be verified against the keys: factories reject
+`segmentsCompactVerify` together with snapshots.
+"""
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+
+import six
+
+from splitio.engine.compiler import compile_split
+from splitio.models import splits
+from splitio.models.segments import CompactSegment, hash_key
+from splitio.storage import SplitStorage, SegmentStorage
+
+
+_MAGIC = b'SPLITSNP'
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct('<8sQ')
+_HASH = struct.Struct('<Q')
+_WRITE_CHUNK_SIZE = 65536
+
+DEFAULT_CHECK_INTERVAL = 1
+
+
+class SnapshotFormatException(Exception):
+    """Exception to be thrown when a snapshot file cannot be read."""
+
+    pass
+
+
+def _segment_hashes(segment):
+    """
+    Return the sorted key hashes of a segment.
+
+    :param segment: Segment to hash.
+    :type segment: splitio.models.segments.Segment|splitio.models.segments.CompactSegment
+
+    :rtype: iterable(int)
+    """
+    if isinstance(segment, CompactSegment):
+        return segment.hashes
+    return CompactSegment(segment.name, segment.keys, segment.change_number).hashes
+
+
+def _write_hashes(snapshot, hashes):
+    """
+    Write key hashes as little endian 64 bit integers.
+
+    :param snapshot: File to write to.
+    :type snapshot: file
+    :param hashes: Sorted key hashes.
+    :type hashes: array.array
+    """
+    if hashes.itemsize == _HASH.size and sys.byteorder == 'little':
+        hashes.tofile(snapshot)
+        return
+
+    for start in range(0, len(hashes), _WRITE_CHUNK_SIZE):
+        chunk = hashes[start:start + _WRITE_CHUNK_SIZE]
+        snapshot.write(struct.pack('<%dQ' % len(chunk), *chunk))
+
+
+def write_snapshot(path, split_storage, segment_storage, hashes_cache=None):
+    """
+    Write the current splits & segments to a snapshot file, replacing it atomically.
+
+    :param path: Path of the snapshot file.
+    :type path: str
+    :param split_storage: Storage to read splits from.
+    :type split_storage: splitio.storage.SplitStorage
+    :param segment_storage: Storage to read segments from.
+    :type segment_storage: splitio.storage.SegmentStorage
+    :param hashes_cache: Key hashes of each segment written before, keyed by segment name, as
+        (change number, hashes) tuples. Only segments whose change number moved are hashed
+        again. Updated in place.
+    :type hashes_cache: dict
+    """
+    all_splits = split_storage.get_all_splits()
+    if hashes_cache is None:
+        hashes_cache = {}
+
+    segments = {}
+    for segment_name in split_storage.get_segment_names():
+        segment = segment_storage.get(segment_name)
+        if segment is None:
+            continue
+        # The change number is read first, so hashes from a concurrent update are re-hashed
+        # on the next write instead of being cached under the newer change number.
+        change_number = segment.change_number
+        cached = hashes_cache.get(segment_name)
+        if cached is None or cached[0] != change_number:
+            cached = (change_number, _segment_hashes(segment))
+        segments[segment_name] = cached
+
+    hashes_cache.clear()
+    hashes_cache.update(segments)
+
+    index = {
+        'version': _FORMAT_VERSION,
+        'till': split_storage.get_change_number(),
+        'splits': {split.name: split.to_json() for split in all_splits},
+        'segments': {}
+    }
+
+    # Offsets are relative to the end of the index, since its length depends on them.
+    relative_offset = 0
+    for segment_name, (change_number, hashes) in six.iteritems(segments):
+        index['segments'][segment_name] = {
+            'till': change_number,
+            'offset': relative_offset,
+            'count': len(hashes)
+        }
+        relative_offset += len(hashes) * _HASH.size
+    encoded_index = json.dumps(index).encode('utf-8')
+
+    tmp_path = '%s.%d.tmp' % (path, os.getpid())
+    with open(tmp_path, 'wb') as snapshot:
+        snapshot.write(_HEADER.pack(_MAGIC, len(encoded_index)))
+        snapshot.write(encoded_index)
+        for (_, hashes) in segments.values():
+            _write_hashes(snapshot, hashes)
+        snapshot.flush()
+        os.fsync(snapshot.fileno())
+    getattr(os, 'replace', os.rename)(tmp_path, path)
+
+
+class _Snapshot(object):  #pylint: disable=too-few-public-methods
+    """Mapped snapshot file, with its index parsed."""
+
+    def __init__(self, path):
+        """
+        Map a snapshot file and parse its index.
+
+        :param path: Path of the snapshot file.
+        :type path: str
+        """
+        with open(path, 'rb') as snapshot:
+            stat = os.fstat(snapshot.fileno())
+            self.file_id = (stat.st_ino, stat.st_mtime, stat.st_size)
+            self.buffer = mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, index_length = _HEADER.unpack_from(self.buffer, 0)
+        if magic != _MAGIC:
+            raise SnapshotFormatException('%s is not a split snapshot file.' % path)
+
+        self.base = _HEADER.size + index_length
+        index = json.loads(self.buffer[_HEADER.size:self.base].decode('utf-8'))
+        if index['version'] != _FORMAT_VERSION:
+            raise SnapshotFormatException('Unsupported snapshot version %s.' % index['version'])
+
+        self.till = index['till']
+        self.segments = index['segments']
+        self.splits = {}
+        for split_name, raw_split in six.iteritems(index['splits']):
+            split = splits.from_raw(raw_split)
+            compile_split(split)
+            self.splits[split_name] = split
+        self.traffic_types = frozenset(split.traffic_type_name for split in self.splits.values())
+
+    def segment_contains(self, segment_name, key):
+        """
+        Binary search a key hash in a segment's mapped hashes.
+
+        :param segment_name: Name of the segment.
+        :type segment_name: str
+        :param key: Key to search for.
+        :type key: str
+
+        :return: Whether the key is in the segment, or None if the segment doesn't exist.
+        :rtype: bool
+        """
+        segment_info = self.segments.get(segment_name)
+        if segment_info is None:
+            return None
+
+        key_hash = hash_key(key)
+        offset = self.base + segment_info['offset']
+        low, high = 0, segment_info['count']
+        while low < high:
+            middle = (low + high) // 2
+            current = _HASH.unpack_from(self.buffer, offset + middle * _HASH.size)[0]
+            if current == key_hash:
+                return True
+            if current < key_hash:
+                low = middle + 1
+            else:
+                high = middle
+        return False
+
+
+class SnapshotReader(object):  #pylint: disable=too-few-public-methods
+    """
+    Keep the latest snapshot mapped.
+
+    The snapshot file is checked for replacements at most once every `check_interval`
+    seconds. Replaced snapshots are unmapped once no lookup references them anymore.
+    """
+
+    def __init__(self, path, check_interval=DEFAULT_CHECK_INTERVAL, ready_event=None):
+        """
+        Class constructor.
+
+        :param path: Path of the snapshot file.
+        :type path: str
+        :param check_interval: Seconds between checks for a new snapshot.
+        :type check_interval: int
+        :param ready_event: Event to set once a snapshot has been loaded.
+        :type ready_event: threading.Event
+        """
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._path = path
+        self._check_interval = check_interval
+        self._ready_event = ready_event
+        self._snapshot = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """
+        Return the latest snapshot.
+
+        :return: Mapped snapshot, or None if no snapshot has been written yet.
+        :rtype: _Snapshot
+        """
+        now = time.time()
+        if self._checked_at is not None and now - self._checked_at < self._check_interval:
+            return self._snapshot
+
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self._check_interval:
+                return self._snapshot
+            self._checked_at = now
+            try:
+                stat = os.stat(self._path)
+                file_id = (stat.st_ino, stat.st_mtime, stat.st_size)
+                if self._snapshot is None or self._snapshot.file_id != file_id:
+                    self._snapshot = _Snapshot(self._path)
+                    if self._ready_event is not None:
+                        self._ready_event.set()
+            except (OSError, IOError):
+                self._logger.debug('Snapshot %s not available yet.', self._path)
+            except Exception:  #pylint: disable=broad-except
+                self._logger.error('Error reading snapshot %s', self._path)
+                self._logger.debug('Error: ', exc_info=True)
+            return self._snapshot
+
+
+class MmapSplitStorage(SplitStorage):
+    """Read-only split storage backed by a mapped snapshot."""
+
+    def __init__(self, reader):
+        """
+        Class constructor.
+
+        :param reader: Snapshot reader.
+        :type reader: SnapshotReader
+        """
+        self._reader = reader
+
+    def get(self, split_name):
+        """
+        Retrieve a split.
+
+        :param split_name: Name of the feature to fetch.
+        :type split_name: str
+
+        :rtype: splitio.models.splits.Split
+        """
+        snapshot = self._reader.get()
+        return snapshot.splits.get(split_name) if snapshot is not None else None
+
+    def fetch_many(self, split_names):
+        """
+        Retrieve splits, all from the same snapshot.
+
+        :param split_names: Names of the features to fetch.
+        :type split_name: list(str)
+
+        :return: A dict with split objects.
+        :rtype: dict(split_name, splitio.models.splits.Split)
+        """
+        snapshot = self._reader.get()
+        found = snapshot.splits if snapshot is not None else {}
+        return {split_name: found.get(split_name) for split_name in split_names}
+
+    def put(self, split):
+        """Not supported: snapshots are written by the synchronizer process only."""
+        raise NotImplementedError('Snapshot storages are read-only.')
+
+    def remove(self, split_name):
+        """Not supported: snapshots are written by the synchronizer process only."""
+        raise NotImplementedError('Snapshot storages are read-only.')
+
+    def get_change_number(self):
+        """
+        Retrieve latest split change number.
+
+        :rtype: int
+        """
+        snapshot = self._reader.get()
+        return snapshot.till if snapshot is not None else None
+
+    def set_change_number(self, new_change_number):
+        """Not supported: snapshots are written by the synchronizer process only."""
+        raise NotImplementedError('Snapshot storages are read-only.')
+
+    def get_split_names(self):
+        """
+        Retrieve a list of all split names.
+
+        :return: List of split names.
+        :rtype: list(str)
+        """
+        snapshot = self._reader.get()
+        return list(snapshot.splits.keys()) if snapshot is not None else []
+
+    def get_all_splits(self):
+        """
+        Return all the splits.
+
+        :return: List of all the splits.
+        :rtype: list
+        """
+        snapshot = self._reader.get()
+        return list(snapshot.splits.values()) if snapshot is not None else []
+
+    def is_valid_traffic_type(self, traffic_type_name):
+        """
+        Return whether the traffic type exists in at least one split in cache.
+
+        :param traffic_type_name: Traffic type to validate.
+        :type traffic_type_name: str
+
+        :return: True if the traffic type is valid. False otherwise.
+        :rtype: bool
+        """
+        snapshot = self._reader.get()
+        return snapshot is not None and traffic_type_name in snapshot.traffic_types
+
+
+class MmapSegmentStorage(SegmentStorage):
+    """
+    Read-only segment storage backed by a mapped snapshot.
+
+    Only key hashes are mapped, so segments can't be retrieved as a whole. A hash collision
+    can make `segment_contains` return True for a key that isn't in the segment, since there are
+    no keys to verify it against.
+    """
+
+    def __init__(self, reader):
+        """
+        Class constructor.
+
+        :param reader: Snapshot reader.
+        :type reader: SnapshotReader
+        """
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._reader = reader
+
+    def get(self, segment_name):
+        """Not supported: only key hashes are stored in snapshots."""
+        raise NotImplementedError('Snapshot storages only support membership checks.')
+
+    def put(self, segment):
+        """Not supported: snapshots are written by the synchronizer process only."""
+        raise NotImplementedError('Snapshot storages are read-only.')
+
+    def update(self, segment_name, to_add, to_remove, change_number=None):
+        """Not supported: snapshots are written by the synchronizer process only."""
+        raise NotImplementedError('Snapshot storages are read-only.')
+
+    def get_change_number(self, segment_name):
+        """
+        Retrieve latest change number for a segment.
+
+        :param segment_name: Name of the segment.
+        :type segment_name: str
+
+        :rtype: int
+        """
+        snapshot = self._reader.get()
+        if snapshot is None or segment_name not in snapshot.segments:
+            return None
+        return snapshot.segments[segment_name]['till']
+
+    def set_change_number(self, segment_name, new_change_number):
+        """Not supported: snapshots are written by the synchronizer process only."""
+        raise NotImplementedError('Snapshot storages are read-only.')
+
+    def segment_contains(self, segment_name, key):
+        """
+        Check whether a specific key belongs to a segment in storage.
+
+        :param segment_name: Name of the segment to search in.
+        :type segment_name: str
+        :param key: Key to search for.
+        :type key: str
+
+        :return: True if the segment contains the key. False otherwise.
+        :rtype: bool
+        """
+        snapshot = self._reader.get()
+        contained = snapshot.segment_contains(segment_name, key) if snapshot is not None else None
+        if contained is None:
+            self._logger.warning(
+                "Tried to query members for nonexistant segment %s. Returning False",
+                segment_name
+            )
+            return False
+        return contained
@@ -4,35 +4,107 @@ from __future__ import absolute_import, division, print_function, \
 
 import json
 import logging
+import time
 
+from splitio.engine.compiler import compile_split
 from splitio.models.impressions import Impression
 from splitio.models import splits, segments
 from splitio.storage import SplitStorage, SegmentStorage, ImpressionStorage, EventStorage
 from splitio.storage.adapters.redis import RedisAdapterException
-from splitio.storage.adapters.cache_trait import decorate as add_cache, DEFAULT_MAX_AGE
+from splitio.storage.adapters.cache_trait import decorate as add_cache, DEFAULT_MAX_AGE, \
+    DEFAULT_VERSIONED_MAX_SIZE, VersionedLocalCache
+from splitio.util.lru import LRUCache
+
+
+CACHE_MODE_TTL = 'ttl'
+CACHE_MODE_VERSIONED = 'versioned'
+DEFAULT_TILL_CHECK_INTERVAL = 1
 
 
 class RedisSplitStorage(SplitStorage):
-    """Redis-based storage for splits."""
+    """
+    Redis-based storage for splits.
+
+    Split names are read from an index set tagged with the change number it was built for,
+    when the synchronizer maintains one. When the index is missing or stale, split keys are
+    found with SCAN (never KEYS). Consumers never write the index: the process writing splits
+    to redis keeps it up to date, and `build_split_names_index` builds it for existing
+    keyspaces.
+    """
 
     _SPLIT_KEY = 'SPLITIO.split.{split_name}'
     _SPLIT_TILL_KEY = 'SPLITIO.splits.till'
+    _SPLIT_NAMES_KEY = 'SPLITIO.splits.names'
+    _SPLIT_NAMES_TILL_KEY = 'SPLITIO.splits.names.till'
     _TRAFFIC_TYPE_KEY = 'SPLITIO.trafficType.{traffic_type_name}'
+    _SCAN_COUNT = 1000
 
-    def __init__(self, redis_client, enable_caching=False, max_age=DEFAULT_MAX_AGE):
+    def __init__(self, redis_client, enable_caching=False, max_age=DEFAULT_MAX_AGE,  #pylint: disable=too-many-arguments
+                 cache_mode=CACHE_MODE_TTL, till_check_interval=DEFAULT_TILL_CHECK_INTERVAL,
+                 cache_size=DEFAULT_VERSIONED_MAX_SIZE):
         """
         Class constructor.
 
         :param redis_client: Redis client or compliant interface.
         :type redis_client: splitio.storage.adapters.redis.RedisAdapter
+        :param enable_caching: Whether to keep a local cache of splits.
+        :type enable_caching: bool
+        :param max_age: Seconds during which cached items are valid (ttl mode only).
+        :type max_age: int
+        :param cache_mode: `ttl` to refetch items after `max_age` seconds, or `versioned` to
+            keep parsed splits until the split change number moves.
+        :type cache_mode: str
+        :param till_check_interval: Seconds between checks of the split change number
+            (versioned mode only).
+        :type till_check_interval: int
+        :param cache_size: Maximum number of splits & traffic types to keep (versioned mode
+            only).
+        :type cache_size: int
         """
         self._logger = logging.getLogger(self.__class__.__name__)
         self._redis = redis_client
-        if enable_caching:
+        self._till_check_interval = till_check_interval
+        self._cache_version = (None, None)
+        if enable_caching and cache_mode == CACHE_MODE_VERSIONED:
+            self._split_cache = VersionedLocalCache(cache_size)
+            self._traffic_type_cache = VersionedLocalCache(cache_size)
+            self.get = self._get_versioned
+            self.is_valid_traffic_type = self._is_valid_traffic_type_versioned
+            self.fetch_many = self._fetch_many_versioned
+        elif enable_caching:
             self.get = add_cache(lambda *p, **_: p[0], max_age)(self.get)
             self.is_valid_traffic_type = add_cache(lambda *p, **_: p[0], max_age)(self.is_valid_traffic_type)  # pylint: disable=line-too-long
             self.fetch_many = add_cache(lambda *p, **_: frozenset(p[0]), max_age)(self.fetch_many)
 
+    @classmethod
+    def build_split_names_index(cls, redis_client):
+        """
+        Build the split names index from the split keys currently in redis.
+
+        Meant for the process that writes splits to redis, after every change, or once to
+        migrate an existing keyspace. The change number is read before scanning, so if splits
+        change meanwhile the index is tagged with a stale one and consumers keep scanning
+        until it's built again.
+
+        :param redis_client: Redis client or compliant interface.
+        :type redis_client: splitio.storage.adapters.redis.RedisAdapter
+
+        :return: Number of split names indexed, or None if there's no change number yet.
+        :rtype: int
+        """
+        till = redis_client.get(cls._SPLIT_TILL_KEY)
+        if till is None:
+            return None
+
+        prefix = cls._SPLIT_KEY.format(split_name='')
+        pattern = cls._SPLIT_KEY.format(split_name='*')
+        names = [key[len(prefix):] for key in redis_client.scan_iter(pattern, cls._SCAN_COUNT)]
+        pipeline = redis_client.pipeline(transaction=True).delete(cls._SPLIT_NAMES_KEY)
+        if names:
+            pipeline.sadd(cls._SPLIT_NAMES_KEY, *names)
+        pipeline.set(cls._SPLIT_NAMES_TILL_KEY, till).execute()
+        return len(names)
+
     def _get_key(self, split_name):
         """
         Use the provided split_name to build the appropriate redis key.
@@ -75,7 +147,7 @@ class RedisSplitStorage(SplitStorage):
             self._logger.debug('Error: ', exc_info=True)
             return None
 
-    def fetch_many(self, split_names):
+    def fetch_many(self, split_names):  # pylint: disable=method-hidden
         """
         Retrieve splits.
 
@@ -85,6 +157,18 @@ class RedisSplitStorage(SplitStorage):
         :return: A dict with split objects parsed from redis.
         :rtype: dict(split_name, splitio.models.splits.Split)
         """
+        return self._fetch_many_from_redis(split_names)
+
+    def _fetch_many_from_redis(self, split_names):
+        """
+        Retrieve and parse splits from redis, bypassing any local cache.
+
+        :param split_names: Names of the features to fetch.
+        :type split_name: list(str)
+
+        :return: A dict with split objects parsed from redis (empty if redis fails).
+        :rtype: dict(split_name, splitio.models.splits.Split)
+        """
         to_return = dict()
         try:
             keys = [self._get_key(split_name) for split_name in split_names]
@@ -121,6 +205,119 @@ class RedisSplitStorage(SplitStorage):
             self._logger.debug('Error: ', exc_info=True)
             return False
 
+    def _get_cache_version(self):
+        """
+        Return the split change number stored in redis, used to version the local cache.
+
+        It's re-read at most once every `till_check_interval` seconds, so most lookups don't
+        hit redis at all. The (version, checked_at) tuple is replaced (never mutated), so
+        readers don't need to lock.
+
+        :rtype: str
+        """
+        version, checked_at = self._cache_version
+        now = time.time()
+        if checked_at is not None and now - checked_at < self._till_check_interval:
+            return version
+
+        version = self._redis.get(self._SPLIT_TILL_KEY)
+        self._cache_version = (version, now)
+        return version
+
+    def _fetch_and_compile(self, split_names):
+        """
+        Fetch splits from redis and build their evaluation plans.
+
+        :param split_names: Names of the features to fetch.
+        :type split_name: list(str)
+
+        :return: A dict with the split objects that could be fetched.
+        :rtype: dict(split_name, splitio.models.splits.Split)
+        """
+        fetched = self._fetch_many_from_redis(split_names)
+        for split in fetched.values():
+            if split is None:
+                continue
+            try:
+                compile_split(split)
+            except Exception:  #pylint: disable=broad-except
+                self._logger.warning('Could not build evaluation plan for split %s.', split.name)
+                self._logger.debug('Error: ', exc_info=True)
+        return fetched
+
+    def _fetch_many_versioned(self, split_names):
+        """
+        Retrieve splits from the versioned local cache, fetching the missing ones.
+
+        :param split_names: Names of the features to fetch.
+        :type split_name: list(str)
+
+        :return: A dict with split objects.
+        :rtype: dict(split_name, splitio.models.splits.Split)
+        """
+        try:
+            version = self._get_cache_version()
+        except RedisAdapterException:
+            self._logger.error('Error fetching split change number from storage')
+            self._logger.debug('Error: ', exc_info=True)
+            return {split_name: None for split_name in split_names}
+
+        found = self._split_cache.get_many(version, split_names, self._fetch_and_compile)
+        return {split_name: found.get(split_name) for split_name in split_names}
+
+    def _get_versioned(self, split_name):
+        """
+        Retrieve a split from the versioned local cache, fetching it if missing.
+
+        :param split_name: Name of the feature to fetch.
+        :type split_name: str
+
+        :rtype: splitio.models.splits.Split
+        """
+        return self._fetch_many_versioned([split_name])[split_name]
+
+    def _fetch_traffic_types(self, traffic_type_names):
+        """
+        Fetch whether traffic types are valid. Failed lookups are left out of the result.
+
+        :param traffic_type_names: Traffic types to validate.
+        :type traffic_type_names: list(str)
+
+        :rtype: dict(str, bool)
+        """
+        to_return = {}
+        for traffic_type_name in traffic_type_names:
+            try:
+                raw = self._redis.get(self._get_traffic_type_key(traffic_type_name))
+                to_return[traffic_type_name] = (json.loads(raw) if raw else 0) > 0
+            except RedisAdapterException:
+                self._logger.error('Error fetching traffic type from storage')
+                self._logger.debug('Error: ', exc_info=True)
+        return to_return
+
+    def _is_valid_traffic_type_versioned(self, traffic_type_name):
+        """
+        Return whether the traffic type exists, using the versioned local cache.
+
+        :param traffic_type_name: Traffic type to validate.
+        :type traffic_type_name: str
+
+        :rtype: bool
+        """
+        try:
+            version = self._get_cache_version()
+        except RedisAdapterException:
+            self._logger.error('Error fetching split change number from storage')
+            self._logger.debug('Error: ', exc_info=True)
+            return False
+
+        found = self._traffic_type_cache.get_many(
+            version,
+            [traffic_type_name],
+            self._fetch_traffic_types
+        )
+        return found.get(traffic_type_name, False)
+
     def put(self, split):
         """
         Store a split.
@@ -165,6 +362,31 @@ class RedisSplitStorage(SplitStorage):
         """
         raise NotImplementedError('Only redis-consumer mode is supported.')
 
+    def _fetch_split_names(self):
+        """
+        Return the names of all the splits in redis.
+
+        The index is used if the synchronizer maintains one for the current change number.
+        Otherwise split keys are scanned. Consumers never write the index, since the keyspace is
+        owned by the synchronizer.
+
+        :return: List of split names.
+        :rtype: list(str)
+        """
+        till, index_till, names = self._redis.pipeline() \
+            .get(self._SPLIT_TILL_KEY) \
+            .get(self._SPLIT_NAMES_TILL_KEY) \
+            .smembers(self._SPLIT_NAMES_KEY) \
+            .execute()
+        if till is not None and till == index_till:
+            return names
+
+        prefix = self._get_key('')
+        return [
+            key[len(prefix):]
+            for key in self._redis.scan_iter(self._get_key('*'), self._SCAN_COUNT)
+        ]
+
     def get_split_names(self):
         """
         Retrieve a list of all split names.
@@ -173,8 +395,7 @@ class RedisSplitStorage(SplitStorage):
         :rtype: list(str)
         """
         try:
-            keys = self._redis.keys(self._get_key('*'))
-            return [key.replace(self._get_key(''), '') for key in keys]
+            return self._fetch_split_names()
         except RedisAdapterException:
             self._logger.error('Error fetching split names from storage')
             self._logger.debug('Error: ', exc_info=True)
@@ -187,10 +408,10 @@ class RedisSplitStorage(SplitStorage):
         :return: List of all splits in cache.
         :rtype: list(splitio.models.splits.Split)
         """
-        keys = self._redis.keys(self._get_key('*'))
         to_return = []
         try:
-            raw_splits = self._redis.mget(keys)
+            keys = [self._get_key(name) for name in self._fetch_split_names()]
+            raw_splits = self._redis.mget(keys) if keys else []
             for raw in raw_splits:
                 try:
                     to_return.append(splits.from_raw(json.loads(raw)))
@@ -203,21 +424,45 @@ class RedisSplitStorage(SplitStorage):
         return to_return
 
 
-class RedisSegmentStorage(SegmentStorage):
-    """Redis based segment storage class."""
+class RedisSegmentStorage(SegmentStorage):  #pylint: disable=too-many-instance-attributes
+    """
+    Redis based segment storage class.
+
+    Membership checks can optionally be answered locally. Results are stored in a bounded LRU
+    keyed by (segment, till, key) when `cache_size` is set, and segments with at most
+    `snapshot_max_size` members are copied locally as a whole, independently. The till of a
+    segment is re-read at most once every `till_check_interval` seconds; when it changes,
+    previous results stop being used.
+    """
 
     _SEGMENTS_KEY = 'SPLITIO.segment.{segment_name}'
     _SEGMENTS_TILL_KEY = 'SPLITIO.segment.{segment_name}.till'
+    _METRIC_CACHE_PREFIX = 'segments.membershipCache'
+    batches_membership_checks = True
 
-    def __init__(self, redis_client):
+    def __init__(self, redis_client, cache_size=0, snapshot_max_size=0,  #pylint: disable=too-many-arguments
+                 till_check_interval=DEFAULT_TILL_CHECK_INTERVAL, telemetry_storage=None):
         """
         Class constructor.
 
         :param redis_client: Redis client or compliant interface.
         :type redis_client: splitio.storage.adapters.redis.RedisAdapter
+        :param cache_size: Maximum number of membership results to keep (0 disables caching).
+        :type cache_size: int
+        :param snapshot_max_size: Segments with up to this many keys are cached entirely.
+        :type snapshot_max_size: int
+        :param till_check_interval: Seconds between checks of a segment's till.
+        :type till_check_interval: int
+        :param telemetry_storage: Optional storage where cache size & hit rate are reported.
+        :type telemetry_storage: splitio.storage.TelemetryStorage
         """
         self._redis = redis_client
         self._logger = logging.getLogger(self.__class__.__name__)
+        self._cache = LRUCache(cache_size, telemetry_storage, self._METRIC_CACHE_PREFIX) \
+            if cache_size > 0 else None
+        self._snapshot_max_size = snapshot_max_size
+        self._till_check_interval = till_check_interval
+        self._segment_states = {}
 
     def _get_till_key(self, segment_name):
         """
@@ -254,11 +499,13 @@ class RedisSegmentStorage(SegmentStorage):
         :rtype: splitio.models.segments.Segment
         """
         try:
-            keys = (self._redis.smembers(self._get_key(segment_name)))
-            till = self.get_change_number(segment_name)
+            keys, till = self._redis.pipeline() \
+                .smembers(self._get_key(segment_name)) \
+                .get(self._get_till_key(segment_name)) \
+                .execute()
             if not keys or till is None:
                 return None
-            return segments.Segment(segment_name, keys, till)
+            return segments.Segment(segment_name, keys, json.loads(till))
         except RedisAdapterException:
             self._logger.error('Error fetching segment from storage')
             self._logger.debug('Error: ', exc_info=True)
@@ -326,6 +573,104 @@ class RedisSegmentStorage(SegmentStorage):
         :return: True if the segment contains the key. False otherwise.
         :rtype: bool
         """
+        cache_key, contained = self._get_cached_membership(segment_name, key)
+        if contained is None:
+            contained = self._fetch_membership(segment_name, key)
+            if cache_key is not None and contained is not None:
+                self._cache.put(cache_key, contained)
+        return contained
+
+    def segment_contains_many(self, segment_names, key):
+        """
+        Check whether a specific key belongs to each of many segments.
+
+        Memberships not found in the local cache are checked with pipelined SISMEMBER
+        commands, in a single round trip.
+
+        :param segment_names: Names of the segments to search in.
+        :type segment_names: list(str)
+        :param key: Key to search for.
+        :type key: str
+
+        :return: Dict of segment name -> membership. Segments that couldn't be checked are
+            left out.
+        :rtype: dict
+        """
+        results = {}
+        pending = []
+        cache_keys = {}
+        for segment_name in segment_names:
+            if segment_name in results or segment_name in cache_keys:
+                continue
+            cache_key, contained = self._get_cached_membership(segment_name, key)
+            if contained is not None:
+                results[segment_name] = contained
+            else:
+                pending.append(segment_name)
+                cache_keys[segment_name] = cache_key
+
+        if pending:
+            try:
+                pipeline = self._redis.pipeline()
+                for segment_name in pending:
+                    pipeline.sismember(self._get_key(segment_name), key)
+                fetched = pipeline.execute()
+            except RedisAdapterException:
+                self._logger.error('Error testing members in segments stored in redis')
+                self._logger.debug('Error: ', exc_info=True)
+                fetched = []
+            for segment_name, contained in zip(pending, fetched):
+                results[segment_name] = contained
+                if cache_keys[segment_name] is not None:
+                    self._cache.put(cache_keys[segment_name], contained)
+        return results
+
+    def _get_cached_membership(self, segment_name, key):
+        """
+        Look a membership up in the local cache.
+
+        :param segment_name: Name of the segment to search in.
+        :type segment_name: str
+        :param key: Key to search for.
+        :type key: str
+
+        :return: Tuple of (cache key, membership). The membership is None if it must be
+            fetched from redis, and the cache key is None if the result shouldn't be cached.
+        :rtype: tuple
+        """
+        if self._cache is None and self._snapshot_max_size <= 0:
+            return None, None
+
+        try:
+            till, _, snapshot = self._get_segment_state(segment_name)
+        except RedisAdapterException:
+            self._logger.error('Error fetching segment change number from storage')
+            self._logger.debug('Error: ', exc_info=True)
+            return None, None
+
+        if snapshot is not None:
+            if self._cache is not None:
+                self._cache.record_hit()
+            return None, key in snapshot
+
+        if self._cache is None:
+            return None, None
+
+        cache_key = (segment_name, till, key)
+        return cache_key, self._cache.get(cache_key)
+
+    def _fetch_membership(self, segment_name, key):
+        """
+        Check whether a key belongs to a segment, going straight to redis.
+
+        :param segment_name: Name of the segment to search in.
+        :type segment_name: str
+        :param key: Key to search for.
+        :type key: str
+
+        :return: True if the segment contains the key. False otherwise. None on error.
+        :rtype: bool
+        """
         try:
             return self._redis.sismember(self._get_key(segment_name), key)
         except RedisAdapterException:
@@ -333,6 +678,43 @@ class RedisSegmentStorage(SegmentStorage):
             self._logger.debug('Error: ', exc_info=True)
             return None
 
+    def _get_segment_state(self, segment_name):
+        """
+        Return the locally known state of a segment, refreshing it if it's due.
+
+        The state is a (till, checked_at, snapshot) tuple, where snapshot is a frozenset of
+        every key in the segment if it's small enough to be cached entirely, or None.
+        States are replaced (never mutated), so readers don't need to lock.
+
+        :param segment_name: Name of the segment.
+        :type segment_name: str
+
+        :return: Segment state.
+        :rtype: tuple
+        """
+        state = self._segment_states.get(segment_name)
+        now = time.time()
+        if state is not None and now - state[1] < self._till_check_interval:
+            return state
+
+        if self._snapshot_max_size > 0:
+            till, size = self._redis.pipeline() \
+                .get(self._get_till_key(segment_name)) \
+                .scard(self._get_key(segment_name)) \
+                .execute()
+        else:
+            till, size = self._redis.get(self._get_till_key(segment_name)), None
+
+        snapshot = None
+        if state is not None and state[0] == till:
+            snapshot = state[2]
+        elif till is not None and size is not None and size <= self._snapshot_max_size:
+            snapshot = frozenset(self._redis.smembers(self._get_key(segment_name)))
+
+        state = (till, now, snapshot)
+        self._segment_states[segment_name] = state
+        return state
+
 
 class RedisImpressionsStorage(ImpressionStorage):
     """Redis based event storage class."""
@@ -1,9 +1,18 @@
 """UWSGI Cache based storages implementation module."""
+import atexit
 import logging
 import json
+import os
+import threading
+import time
+import zlib
 
+import six
+
+from splitio.engine.compiler import compile_split
 from splitio.storage import SplitStorage, SegmentStorage, ImpressionStorage, EventStorage, \
     TelemetryStorage
+from splitio.storage.adapters.cache_trait import VersionedLocalCache
 from splitio.models import splits, segments
 from splitio.models.impressions import Impression
 from splitio.models.events import Event
@@ -14,8 +23,16 @@ from splitio.storage.adapters.uwsgi_cache import _SPLITIO_CHANGE_NUMBERS, \
     _SPLITIO_LOCK_CACHE_NAMESPACE
 
 
+DEFAULT_IMPRESSIONS_SLOTS_PER_LANE = 1000
+
+
 class UWSGISplitStorage(SplitStorage):
-    """UWSGI-Cache based implementation of a split storage."""
+    """
+    UWSGI-Cache based implementation of a split storage.
+
+    Each worker keeps the splits it parses (with their evaluation plans) in a local cache
+    keyed on `splits.till`, so a split is only parsed again after the change number moves.
+    """
 
     _KEY_TEMPLATE = 'split.{suffix}'
     _KEY_TILL = 'splits.till'
@@ -34,6 +51,7 @@ class UWSGISplitStorage(SplitStorage):
         """
         self._logger = logging.getLogger(self.__class__.__name__)
         self._uwsgi = uwsgi_entrypoint
+        self._split_cache = VersionedLocalCache()
 
     def get(self, split_name):
         """
@@ -44,26 +62,69 @@ class UWSGISplitStorage(SplitStorage):
 
         :rtype: str
         """
+        return self.fetch_many([split_name])[split_name]
+
+    def fetch_many(self, split_names):
+        """
+        Retrieve splits.
+
+        :param split_names: Names of the features to fetch.
+        :type split_name: list(str)
+
+        :return: A dict with split objects parsed from queue.
+        :rtype: dict(split_name, splitio.models.splits.Split)
+        """
+        version = self._uwsgi.cache_get(self._KEY_TILL, _SPLITIO_CHANGE_NUMBERS)
+        if version is None:
+            fetched = self._parse_splits(split_names)
+        else:
+            fetched = self._split_cache.get_many(version, split_names, self._parse_splits)
+
+        for split_name in split_names:
+            if fetched.get(split_name) is None:
+                self._logger.warning(
+                    "Trying to retrieve nonexistant split %s. Ignoring.", split_name
+                )
+        return {split_name: fetched.get(split_name) for split_name in split_names}
+
+    def _fetch_split(self, split_name):
+        """
+        Read & parse a split from the uwsgi cache, bypassing the local cache.
+
+        :param split_name: Name of the feature to fetch.
+        :type split_name: str
+
+        :return: Split object or None.
+        :rtype: splitio.models.splits.Split
+        """
         raw = self._uwsgi.cache_get(
             self._KEY_TEMPLATE.format(suffix=split_name),
             _SPLITIO_SPLITS_CACHE_NAMESPACE
         )
-        to_return = splits.from_raw(json.loads(raw)) if raw is not None else None
-        if not to_return:
-            self._logger.warning("Trying to retrieve nonexistant split %s. Ignoring.", split_name)
-        return to_return
+        return splits.from_raw(json.loads(raw)) if raw is not None else None
 
-    def fetch_many(self, split_names):
+    def _parse_splits(self, split_names):
         """
-        Retrieve splits.
+        Read splits from the uwsgi cache and build their evaluation plans.
 
         :param split_names: Names of the features to fetch.
         :type split_name: list(str)
 
-        :return: A dict with split objects parsed from queue.
+        :return: A dict with the split objects that could be fetched.
         :rtype: dict(split_name, splitio.models.splits.Split)
         """
-        return {split_name: self.get(split_name) for split_name in split_names}
+        parsed = {}
+        for split_name in split_names:
+            split = self._fetch_split(split_name)
+            if split is None:
+                continue
+            try:
+                compile_split(split)
+            except Exception:  #pylint: disable=broad-except
+                self._logger.warning('Could not build evaluation plan for split %s.', split_name)
+                self._logger.debug('Error: ', exc_info=True)
+            parsed[split_name] = split
+        return parsed
 
     def put(self, split):
         """
@@ -92,7 +153,7 @@ class UWSGISplitStorage(SplitStorage):
         :rtype: bool
         """
         # We need to fetch the split to get the traffic type name prior to deleting.
-        fetched = self.get(split_name)
+        fetched = self._fetch_split(split_name)
         if fetched is None:
             self._logger.warning(
                 "Tried to remove feature \"%s\" not present in cache. Ignoring.", split_name
@@ -111,6 +172,73 @@ class UWSGISplitStorage(SplitStorage):
 
         return result
 
+    def apply_changes(self, to_put, to_remove, change_number):
+        """
+        Apply a whole split changeset and update the change number.
+
+        The split list & traffic type locks are acquired once for the whole changeset, and
+        both structures are read and written once.
+
+        :param to_put: Splits to add or update.
+        :type to_put: list(splitio.models.splits.Split)
+        :param to_remove: Names of the splits to remove.
+        :type to_remove: list(str)
+        :param change_number: Change number of the changeset.
+        :type change_number: int
+        """
+        with UWSGILock(self._uwsgi, self._KEY_FEATURE_LIST_LOCK), \
+                UWSGILock(self._uwsgi, self._KEY_TRAFFIC_TYPES_LOCK):
+            try:
+                split_names = set(json.loads(
+                    self._uwsgi.cache_get(self._KEY_FEATURE_LIST, _SPLITIO_MISC_NAMESPACE)
+                ))
+            except TypeError:
+                split_names = set()
+            try:
+                tts = json.loads(
+                    self._uwsgi.cache_get(self._KEY_TRAFFIC_TYPES, _SPLITIO_MISC_NAMESPACE)
+                )
+            except TypeError:
+                tts = {}
+
+            for split in to_put:
+                self._uwsgi.cache_update(
+                    self._KEY_TEMPLATE.format(suffix=split.name),
+                    json.dumps(split.to_json()),
+                    0,
+                    _SPLITIO_SPLITS_CACHE_NAMESPACE
+                )
+                split_names.add(split.name)
+                tts[split.traffic_type_name] = tts.get(split.traffic_type_name, 0) + 1
+
+            for split_name in to_remove:
+                fetched = self._fetch_split(split_name)
+                if fetched is None:
+                    self._logger.warning(
+                        "Tried to remove feature \"%s\" not present in cache. Ignoring.",
+                        split_name
+                    )
+                    continue
+                self._uwsgi.cache_del(
+                    self._KEY_TEMPLATE.format(suffix=split_name),
+                    _SPLITIO_SPLITS_CACHE_NAMESPACE
+                )
+                split_names.discard(split_name)
+                tts[fetched.traffic_type_name] = tts.get(fetched.traffic_type_name, 0) - 1
+                if tts[fetched.traffic_type_name] <= 0:
+                    del tts[fetched.traffic_type_name]
+
+            self._uwsgi.cache_update(
+                self._KEY_FEATURE_LIST,
+                json.dumps(list(split_names)),
+                0,
+                _SPLITIO_MISC_NAMESPACE
+            )
+            self._uwsgi.cache_update(
+                self._KEY_TRAFFIC_TYPES, json.dumps(tts), 0, _SPLITIO_MISC_NAMESPACE
+            )
+            self.set_change_number(change_number)
+
     def get_change_number(self):
         """
         Retrieve latest split change number.
@@ -154,7 +282,9 @@ class UWSGISplitStorage(SplitStorage):
         :return: List of splits.
         :rtype: list(splitio.models.splits.Split)
         """
-        return [self.get(split_name) for split_name in self.get_split_names()]
+        split_names = self.get_split_names()
+        fetched = self.fetch_many(split_names)
+        return [fetched[split_name] for split_name in split_names]
 
     def is_valid_traffic_type(self, traffic_type_name):
         """
@@ -268,11 +398,17 @@ class UWSGISplitStorage(SplitStorage):
 
 
 class UWSGISegmentStorage(SegmentStorage):
-    """UWSGI-Cache based implementation of a split storage."""
+    """
+    UWSGI-Cache based implementation of a split storage.
+
+    Segment members are spread over `_BUCKETS` cache items by a hash of the key, so updates
+    only rewrite the buckets touched by the delta.
+    """
 
     _KEY_TEMPLATE = 'segments.{suffix}'
-    _SEGMENT_DATA_KEY_TEMPLATE = 'segmentData.{segment_name}'
+    _SEGMENT_DATA_KEY_TEMPLATE = 'segmentData.{segment_name}.{bucket}'
     _SEGMENT_CHANGE_NUMBER_KEY_TEMPLATE = 'segment.{segment_name}.till'
+    _BUCKETS = 64
 
     def __init__(self, uwsgi_entrypoint):
         """
@@ -283,6 +419,7 @@ class UWSGISegmentStorage(SegmentStorage):
         """
         self._logger = logging.getLogger(self.__class__.__name__)
         self._uwsgi = uwsgi_entrypoint
+        self._members_cache = {}
 
     def get(self, segment_name):
         """
@@ -294,11 +431,14 @@ class UWSGISegmentStorage(SegmentStorage):
         :return: Parsed segment if present. None otherwise.
         :rtype: splitio.models.segments.Segment
         """
-        key = self._SEGMENT_DATA_KEY_TEMPLATE.format(segment_name=segment_name)
         cn_key = self._SEGMENT_CHANGE_NUMBER_KEY_TEMPLATE.format(segment_name=segment_name)
         try:
-            segment_data = json.loads(self._uwsgi.cache_get(key, _SPLITIO_SEGMENTS_CACHE_NAMESPACE))
             change_number = json.loads(self._uwsgi.cache_get(cn_key, _SPLITIO_CHANGE_NUMBERS))
+            segment_data = [
+                key
+                for bucket in range(self._BUCKETS)
+                for key in self._get_bucket(segment_name, bucket)
+            ]
             return segments.from_raw({
                 'name': segment_name,
                 'added': segment_data,
@@ -323,18 +463,17 @@ class UWSGISegmentStorage(SegmentStorage):
         :param to_remove: List of members to remove from the segment.
         :type to_remove: list
         """
-        key = self._SEGMENT_DATA_KEY_TEMPLATE.format(segment_name=segment_name)
-        try:
-            segment_data = json.loads(self._uwsgi.cache_get(key, _SPLITIO_SEGMENTS_CACHE_NAMESPACE))
-        except TypeError:
-            segment_data = []
-        updated = set(segment_data).union(set(to_add)).difference(to_remove)
-        self._uwsgi.cache_update(
-            key,
-            json.dumps(list(updated)),
-            0,
-            _SPLITIO_SEGMENTS_CACHE_NAMESPACE
-        )
+        deltas = {}
+        for key in to_add:
+            deltas.setdefault(self._bucket_for(key), (set(), set()))[0].add(key)
+        for key in to_remove:
+            deltas.setdefault(self._bucket_for(key), (set(), set()))[1].add(key)
+
+        for bucket, (bucket_add, bucket_remove) in six.iteritems(deltas):
+            members = set(self._get_bucket(segment_name, bucket))
+            members.update(bucket_add)
+            members.difference_update(bucket_remove)
+            self._put_bucket(segment_name, bucket, members)
 
         if change_number is not None:
             self.set_change_number(segment_name, change_number)
@@ -346,14 +485,62 @@ class UWSGISegmentStorage(SegmentStorage):
         :param segment: Segment to store.
         :type segment: splitio.models.segments.Segent
         """
-        key = self._SEGMENT_DATA_KEY_TEMPLATE.format(segment_name=segment.name)
+        buckets = [[] for _ in range(self._BUCKETS)]
+        for key in segment.keys:
+            buckets[self._bucket_for(key)].append(key)
+        for bucket, members in enumerate(buckets):
+            self._put_bucket(segment.name, bucket, members)
+        self.set_change_number(segment.name, segment.change_number)
+
+    def _bucket_for(self, key):
+        """
+        Return the bucket a segment member is stored in.
+
+        The hash must be stable across processes, since the sync process writes the buckets
+        that the workers read.
+
+        :param key: Segment member.
+        :type key: str
+
+        :rtype: int
+        """
+        encoded = key.encode('utf-8') if isinstance(key, six.text_type) else key
+        return (zlib.crc32(encoded) & 0xffffffff) % self._BUCKETS
+
+    def _get_bucket(self, segment_name, bucket):
+        """
+        Read the members of a segment bucket.
+
+        :param segment_name: Name of the segment.
+        :type segment_name: str
+        :param bucket: Bucket number.
+        :type bucket: int
+
+        :return: Members of the bucket.
+        :rtype: list
+        """
+        key = self._SEGMENT_DATA_KEY_TEMPLATE.format(segment_name=segment_name, bucket=bucket)
+        raw = self._uwsgi.cache_get(key, _SPLITIO_SEGMENTS_CACHE_NAMESPACE)
+        return json.loads(raw) if raw is not None else []
+
+    def _put_bucket(self, segment_name, bucket, members):
+        """
+        Write the members of a segment bucket.
+
+        :param segment_name: Name of the segment.
+        :type segment_name: str
+        :param bucket: Bucket number.
+        :type bucket: int
+        :param members: Members of the bucket.
+        :type members: iterable
+        """
+        key = self._SEGMENT_DATA_KEY_TEMPLATE.format(segment_name=segment_name, bucket=bucket)
         self._uwsgi.cache_update(
             key,
-            json.dumps(list(segment.keys)),
+            json.dumps(list(members)),
             0,
             _SPLITIO_SEGMENTS_CACHE_NAMESPACE
         )
-        self.set_change_number(segment.name, segment.change_number)
 
     def get_change_number(self, segment_name):
         """
@@ -395,27 +582,330 @@ class UWSGISegmentStorage(SegmentStorage):
         :return: True if the segment contains the key. False otherwise.
         :rtype: bool
         """
-        segment = self.get(segment_name)
-        return segment.contains(key)
+        members = self._get_members(segment_name)
+        if members is None:
+            self._logger.warning(
+                "Tried to query members for nonexistant segment %s. Returning False",
+                segment_name
+            )
+            return False
+        return key in members
+
+    def _get_members(self, segment_name):
+        """
+        Return the members of a segment, decoding them at most once per change number.
+
+        Decoded members are kept in this worker's memory along with the change number they
+        were read for. Only the change number is read from the uwsgi cache while it stays the
+        same, since segment data is always written before its change number.
+
+        :param segment_name: Name of the segment.
+        :type segment_name: str
+
+        :return: Segment members, or None if the segment doesn't exist.
+        :rtype: frozenset
+        """
+        change_number = self.get_change_number(segment_name)
+        if change_number is None:
+            return None
+
+        cached = self._members_cache.get(segment_name)
+        if cached is not None and cached[0] == change_number:
+            return cached[1]
+
+        members = frozenset(
+            key
+            for bucket in range(self._BUCKETS)
+            for key in self._get_bucket(segment_name, bucket)
+        )
+
+        self._members_cache[segment_name] = (change_number, members)
+        return members
+
+
+class _WorkerRingBuffer(object):
+    """
+    Ring buffers kept in the uwsgi cache, one per uwsgi worker (lane).
+
+    Each `append` writes a batch to the next free slot of the calling worker's lane and
+    advances the lane head, so appending takes a constant number of cache operations and
+    workers never wait on each other. Processes that aren't uwsgi workers share lane 0,
+    guarded by a lock. `pop` drains the lanes and advances their tails.
+
+    When a lane is full, batches are merged into its newest slot (under the lane lock, which
+    `pop` also holds while draining the lane) until that slot holds `max_slot_items` items.
+    Only then are new batches dropped.
+    """
+
+    def __init__(self, adapter, namespace, key_prefix, lock_key, slots_per_lane,  #pylint: disable=too-many-arguments
+                 max_slot_items=0):
+        """
+        Class constructor.
+
+        :param adapter: UWSGI Adapter/Emulator/Module.
+        :type adapter: object
+        :param namespace: Cache namespace where the buffers are stored.
+        :type namespace: str
+        :param key_prefix: Prefix of every key used by the buffer.
+        :type key_prefix: str
+        :param lock_key: Key of the lock guarding readers & lane registration.
+        :type lock_key: str
+        :param slots_per_lane: Number of batches each lane can hold.
+        :type slots_per_lane: int
+        :param max_slot_items: Maximum number of items merged into a slot of a full lane
+            (0 drops batches as soon as the lane is full).
+        :type max_slot_items: int
+        """
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._uwsgi = adapter
+        self._namespace = namespace
+        self._lanes_key = key_prefix + '.lanes'
+        self._head_key = key_prefix + '.{lane}.head'
+        self._tail_key = key_prefix + '.{lane}.tail'
+        self._slot_key = key_prefix + '.{lane}.{slot}'
+        self._lock_key = lock_key
+        self._lane_lock_key = lock_key + '.{lane}'
+        self._slots_per_lane = slots_per_lane
+        self._max_slot_items = max_slot_items
+        self._lock = threading.Lock()
+        self._registered_lane = None
+
+    def _get_lane(self):
+        """
+        Return the lane where this process appends batches, registering it if needed.
+
+        :return: Lane number (the uwsgi worker id, or 0 outside workers).
+        :rtype: int
+        """
+        lane = self._uwsgi.worker_id()
+        if lane != self._registered_lane:
+            with UWSGILock(self._uwsgi, self._lock_key):
+                lanes = self._get_lanes()
+                if lane not in lanes:
+                    self._uwsgi.cache_update(
+                        self._lanes_key,
+                        json.dumps(lanes + [lane]),
+                        0,
+                        self._namespace
+                    )
+            self._registered_lane = lane
+        return lane
+
+    def _get_lanes(self):
+        """
+        Return every lane that has been registered.
+
+        :rtype: list(int)
+        """
+        try:
+            return json.loads(
+                self._uwsgi.cache_get(self._lanes_key, self._namespace)
+            )
+        except TypeError:
+            return []
+
+    def _get_cursor(self, template, lane):
+        """
+        Read the head or tail of a lane.
+
+        :param template: Key template of the cursor.
+        :type template: str
+        :param lane: Lane number.
+        :type lane: int
+
+        :rtype: int
+        """
+        value = self._uwsgi.cache_get(template.format(lane=lane), self._namespace)
+        return int(value) if value is not None else 0
+
+    def _set_cursor(self, template, lane, value):
+        """
+        Write the head or tail of a lane.
+
+        :param template: Key template of the cursor.
+        :type template: str
+        :param lane: Lane number.
+        :type lane: int
+        :param value: New cursor position.
+        :type value: int
+        """
+        self._uwsgi.cache_update(
+            template.format(lane=lane),
+            str(value),
+            0,
+            self._namespace
+        )
+
+    def _get_slot_key(self, lane, position):
+        """Return the key of the slot that holds a lane position."""
+        return self._slot_key.format(lane=lane, slot=position % self._slots_per_lane)
+
+    def append(self, items):
+        """
+        Append a batch of items to the lane of the calling worker.
+
+        :param items: JSON serializable items.
+        :type items: list
+
+        :return: Number of slots in use in the lane after appending, or None if the batch
+            was dropped.
+        :rtype: int
+        """
+        with self._lock:
+            lane = self._get_lane()
+            lane_lock_key = self._lane_lock_key.format(lane=lane)
+            if lane != 0:
+                used = self._append(lane, items)
+                if used is not None:
+                    return used
+                with UWSGILock(self._uwsgi, lane_lock_key):
+                    return self._append(lane, items, merge=True)
+
+            # Lane 0 is shared by every process that isn't a uwsgi worker.
+            with UWSGILock(self._uwsgi, lane_lock_key):
+                used = self._append(lane, items)
+                return used if used is not None else self._append(lane, items, merge=True)
+
+    def _append(self, lane, items, merge=False):
+        """
+        Write a batch in the next slot of a lane, or merge it into the newest one if full.
+
+        Merging must be done while holding the lane lock.
+
+        :param lane: Lane number.
+        :type lane: int
+        :param items: JSON serializable items.
+        :type items: list
+        :param merge: Whether to merge the batch into the newest slot when the lane is full.
+        :type merge: bool
+
+        :return: Number of slots in use after appending, or None if the lane is full.
+        :rtype: int
+        """
+        head = self._get_cursor(self._head_key, lane)
+        used = head - self._get_cursor(self._tail_key, lane)
+        if used < self._slots_per_lane:
+            self._uwsgi.cache_update(
+                self._get_slot_key(lane, head),
+                json.dumps(items),
+                0,
+                self._namespace
+            )
+            self._set_cursor(self._head_key, lane, head + 1)
+            return used + 1
+
+        if not merge:
+            return None
+
+        slot_key = self._get_slot_key(lane, head - 1)
+        try:
+            current = json.loads(self._uwsgi.cache_get(slot_key, self._namespace))
+        except TypeError:
+            current = []
+        if len(current) + len(items) > self._max_slot_items:
+            return None
+
+        self._uwsgi.cache_update(slot_key, json.dumps(current + items), 0, self._namespace)
+        return used
+
+    def pop(self, count=None):
+        """
+        Pop up to N items from every lane, oldest first within each lane.
+
+        :param count: Maximum number of items to pop (None pops everything).
+        :type count: int
+
+        :rtype: list
+        """
+        popped = []
+        with UWSGILock(self._uwsgi, self._lock_key):
+            for lane in self._get_lanes():
+                if count is not None and len(popped) >= count:
+                    break
+                with UWSGILock(self._uwsgi, self._lane_lock_key.format(lane=lane)):
+                    popped.extend(self._pop_from_lane(
+                        lane,
+                        count - len(popped) if count is not None else None
+                    ))
+        return popped
+
+    def _pop_from_lane(self, lane, count):
+        """
+        Pop up to N items from a lane, oldest first.
+
+        :param lane: Lane number.
+        :type lane: int
+        :param count: Maximum number of items to pop (None pops everything).
+        :type count: int
+
+        :rtype: list
+        """
+        head = self._get_cursor(self._head_key, lane)
+        tail = self._get_cursor(self._tail_key, lane)
+        popped = []
+        while tail < head and (count is None or len(popped) < count):
+            slot_key = self._get_slot_key(lane, tail)
+            try:
+                batch = json.loads(self._uwsgi.cache_get(slot_key, self._namespace))
+            except TypeError:
+                batch = []
+
+            missing = count - len(popped) if count is not None else len(batch)
+            popped.extend(batch[:missing])
+            if len(batch) > missing:
+                # Keep the rest of the batch in the slot for the next pop.
+                self._uwsgi.cache_update(
+                    slot_key,
+                    json.dumps(batch[missing:]),
+                    0,
+                    self._namespace
+                )
+                break
+
+            self._uwsgi.cache_del(slot_key, self._namespace)
+            tail += 1
+
+        self._set_cursor(self._tail_key, lane, tail)
+        return popped
 
 
 class UWSGIImpressionStorage(ImpressionStorage):
-    """Impressions storage interface."""
+    """
+    Impressions storage interface.
 
-    _IMPRESSIONS_KEY = 'SPLITIO.impressions.'
+    Impressions are kept in per-worker ring buffers, so appending takes a constant number of
+    cache operations and workers don't serialize behind a lock. A flush is requested as soon as
+    a worker's buffer is half full.
+
+    Every process sharing the cache must use the same `slots_per_lane`.
+    """
+
+    _IMPRESSIONS_KEY = 'SPLITIO.impressions'
     _LOCK_IMPRESSION_KEY = 'SPLITIO.impressions_lock'
     _IMPRESSIONS_FLUSH = 'SPLITIO.impressions_flush'
     _OVERWRITE_LOCK_SECONDS = 5
+    _MAX_SLOT_ITEMS = 100
 
-    def __init__(self, adapter):
+    def __init__(self, adapter, slots_per_lane=DEFAULT_IMPRESSIONS_SLOTS_PER_LANE):
         """
         Class Constructor.
 
         :param adapter: UWSGI Adapter/Emulator/Module.
         :type: object
+        :param slots_per_lane: Number of `put` calls each worker can buffer between flushes.
+        :type slots_per_lane: int
         """
         self._logger = logging.getLogger(self.__class__.__name__)
         self._uwsgi = adapter
+        self._slots_per_lane = slots_per_lane
+        self._buffer = _WorkerRingBuffer(
+            adapter,
+            _SPLITIO_IMPRESSIONS_CACHE_NAMESPACE,
+            self._IMPRESSIONS_KEY,
+            self._LOCK_IMPRESSION_KEY,
+            slots_per_lane,
+            self._MAX_SLOT_ITEMS
+        )
 
     def put(self, impressions):
         """
@@ -425,20 +915,16 @@ class UWSGIImpressionStorage(ImpressionStorage):
         :type impressions: list
         """
         to_store = [i._asdict() for i in impressions]
-        with UWSGILock(self._uwsgi, self._LOCK_IMPRESSION_KEY):
-            try:
-                current = json.loads(self._uwsgi.cache_get(
-                    self._IMPRESSIONS_KEY, _SPLITIO_IMPRESSIONS_CACHE_NAMESPACE
-                ))
-            except TypeError:
-                current = []
+        if not to_store:
+            return
 
-            self._uwsgi.cache_update(
-                self._IMPRESSIONS_KEY,
-                json.dumps(current + to_store),
-                0,
-                _SPLITIO_IMPRESSIONS_CACHE_NAMESPACE
+        used = self._buffer.append(to_store)
+        if used is None:
+            self._logger.warning(
+                'Impressions buffer is full. Dropping %d impressions.', len(to_store)
             )
+        if used is None or used * 2 >= self._slots_per_lane:
+            self.request_flush()
 
     def pop_many(self, count):
         """
@@ -447,21 +933,6 @@ class UWSGIImpressionStorage(ImpressionStorage):
         :param count: Number of impressions to pop.
         :type count: int
         """
-        with UWSGILock(self._uwsgi, self._LOCK_IMPRESSION_KEY):
-            try:
-                current = json.loads(self._uwsgi.cache_get(
-                    self._IMPRESSIONS_KEY, _SPLITIO_IMPRESSIONS_CACHE_NAMESPACE
-                ))
-            except TypeError:
-                return []
-
-            self._uwsgi.cache_update(
-                self._IMPRESSIONS_KEY,
-                json.dumps(current[count:]),
-                0,
-                _SPLITIO_IMPRESSIONS_CACHE_NAMESPACE
-            )
-
         return [
             Impression(
                 impression['matching_key'],
@@ -471,7 +942,7 @@ class UWSGIImpressionStorage(ImpressionStorage):
                 impression['change_number'],
                 impression['bucketing_key'],
                 impression['time']
-            ) for impression in current[:count]
+            ) for impression in self._buffer.pop(count)
         ]
 
     def request_flush(self):
@@ -585,8 +1056,18 @@ class UWSGIEventStorage(EventStorage):
         self._uwsgi.cache_del(self._EVENTS_FLUSH, _SPLITIO_LOCK_CACHE_NAMESPACE)
 
 
-class UWSGITelemetryStorage(TelemetryStorage):
-    """Telemetry storage interface."""
+class UWSGITelemetryStorage(TelemetryStorage):  #pylint: disable=too-many-instance-attributes
+    """
+    Telemetry storage interface.
+
+    Metrics are accumulated in process-local structures and merged into per-worker ring
+    buffers every `_FLUSH_INTERVAL` seconds, so recording a metric never takes a
+    cross-process lock in uwsgi workers. Popping a metric kind drains every buffer.
+
+    Each process flushes from its own daemon thread (started on the first metric recorded
+    after a fork, so it requires uwsgi's `enable-threads`) and once more when it exits, so
+    metrics from idle or stopped workers aren't held back.
+    """
 
     _LATENCIES_KEY = 'SPLITIO.latencies'
     _GAUGES_KEY = 'SPLITIO.gauges'
@@ -596,6 +1077,9 @@ class UWSGITelemetryStorage(TelemetryStorage):
     _GAUGES_LOCK_KEY = 'SPLITIO.gauges.lock'
     _COUNTERS_LOCK_KEY = 'SPLITIO.counters.lock'
 
+    _FLUSH_INTERVAL = 5
+    _SLOTS_PER_LANE = 100
+
     def __init__(self, uwsgi_entrypoint):
         """
         Class constructor.
@@ -605,6 +1089,34 @@ class UWSGITelemetryStorage(TelemetryStorage):
         """
         self._uwsgi = uwsgi_entrypoint
         self._logger = logging.getLogger(self.__class__.__name__)
+        self._lock = threading.Lock()
+        self._latencies = {}
+        self._counters = {}
+        self._gauges = {}
+        self._flusher_pid = None
+        self._buffers = {
+            self._LATENCIES_KEY: _WorkerRingBuffer(
+                uwsgi_entrypoint,
+                _SPLITIO_METRICS_CACHE_NAMESPACE,
+                self._LATENCIES_KEY,
+                self._LATENCIES_LOCK_KEY,
+                self._SLOTS_PER_LANE
+            ),
+            self._COUNTERS_KEY: _WorkerRingBuffer(
+                uwsgi_entrypoint,
+                _SPLITIO_METRICS_CACHE_NAMESPACE,
+                self._COUNTERS_KEY,
+                self._COUNTERS_LOCK_KEY,
+                self._SLOTS_PER_LANE
+            ),
+            self._GAUGES_KEY: _WorkerRingBuffer(
+                uwsgi_entrypoint,
+                _SPLITIO_METRICS_CACHE_NAMESPACE,
+                self._GAUGES_KEY,
+                self._GAUGES_LOCK_KEY,
+                self._SLOTS_PER_LANE
+            )
+        }
 
     def inc_latency(self, name, bucket):
         """
@@ -619,19 +1131,12 @@ class UWSGITelemetryStorage(TelemetryStorage):
             self._logger.error('Incorect bucket "%d" for latency "%s". Ignoring.', bucket, name)
             return
 
-        with UWSGILock(self._uwsgi, self._LATENCIES_LOCK_KEY):
-            latencies_raw = self._uwsgi.cache_get(
-                self._LATENCIES_KEY, _SPLITIO_METRICS_CACHE_NAMESPACE)
-            latencies = json.loads(latencies_raw) if latencies_raw else {}
-            to_update = latencies.get(name, [0] * 22)
-            to_update[bucket] += 1
-            latencies[name] = to_update
-            self._uwsgi.cache_set(
-                self._LATENCIES_KEY,
-                json.dumps(latencies),
-                0,
-                _SPLITIO_METRICS_CACHE_NAMESPACE
-            )
+        with self._lock:
+            latencies = self._latencies.get(name)
+            if latencies is None:
+                latencies = self._latencies[name] = [0] * 22
+            latencies[bucket] += 1
+        self._ensure_flusher()
 
     def inc_counter(self, name):
         """
@@ -640,19 +1145,9 @@ class UWSGITelemetryStorage(TelemetryStorage):
         :param name: Name of the counter metric.
         :type name: str
         """
-        with UWSGILock(self._uwsgi, self._COUNTERS_LOCK_KEY):
-            counters_raw = self._uwsgi.cache_get(
-                self._COUNTERS_KEY, _SPLITIO_METRICS_CACHE_NAMESPACE)
-            counters = json.loads(counters_raw) if counters_raw else {}
-            value = counters.get(name, 0)
-            value += 1
-            counters[name] = value
-            self._uwsgi.cache_set(
-                self._COUNTERS_KEY,
-                json.dumps(counters),
-                0,
-                _SPLITIO_METRICS_CACHE_NAMESPACE
-            )
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + 1
+        self._ensure_flusher()
 
     def put_gauge(self, name, value):
         """
@@ -663,16 +1158,51 @@ class UWSGITelemetryStorage(TelemetryStorage):
         :param value: Value of the gauge metric.
         :type value: int
         """
-        with UWSGILock(self._uwsgi, self._GAUGES_LOCK_KEY):
-            gauges_raw = self._uwsgi.cache_get(self._GAUGES_KEY, _SPLITIO_METRICS_CACHE_NAMESPACE)
-            gauges = json.loads(gauges_raw) if gauges_raw else {}
-            gauges[name] = value
-            self._uwsgi.cache_set(
-                self._GAUGES_KEY,
-                json.dumps(gauges),
-                0,
-                _SPLITIO_METRICS_CACHE_NAMESPACE
-            )
+        with self._lock:
+            self._gauges[name] = value
+        self._ensure_flusher()
+
+    def _ensure_flusher(self):
+        """Start the periodic flush of this process, unless it's already running."""
+        pid = os.getpid()
+        if self._flusher_pid == pid:
+            return
+
+        with self._lock:
+            if self._flusher_pid == pid:
+                return
+            self._flusher_pid = pid
+        flusher = threading.Thread(target=self._flush_periodically, name='SplitTelemetryFlusher')
+        flusher.daemon = True
+        flusher.start()
+        atexit.register(self.flush)
+
+    def _flush_periodically(self):
+        """Flush the local metrics every `_FLUSH_INTERVAL` seconds, while in this process."""
+        pid = os.getpid()
+        while self._flusher_pid == pid:
+            time.sleep(self._FLUSH_INTERVAL)
+            try:
+                self.flush()
+            except Exception:  #pylint: disable=broad-except
+                self._logger.error('Error flushing telemetry')
+                self._logger.debug('Error: ', exc_info=True)
+
+    def flush(self):
+        """Move the metrics accumulated by this process to the shared buffers."""
+        with self._lock:
+            pending = [
+                (self._LATENCIES_KEY, self._latencies),
+                (self._COUNTERS_KEY, self._counters),
+                (self._GAUGES_KEY, self._gauges)
+            ]
+            self._latencies = {}
+            self._counters = {}
+            self._gauges = {}
+
+        for key, metrics in pending:
+            if metrics and not self._buffers[key].append([metrics]):
+                self._logger.warning('Telemetry buffer %s is full. Dropping metrics.', key)
 
     def pop_counters(self):
         """
@@ -680,11 +1210,12 @@ class UWSGITelemetryStorage(TelemetryStorage):
 
         :rtype: list
         """
-        with UWSGILock(self._uwsgi, self._COUNTERS_LOCK_KEY):
-            counters_raw = self._uwsgi.cache_get(
-                self._COUNTERS_KEY, _SPLITIO_METRICS_CACHE_NAMESPACE)
-            self._uwsgi.cache_del(self._COUNTERS_KEY, _SPLITIO_METRICS_CACHE_NAMESPACE)
-            return json.loads(counters_raw) if counters_raw else {}
+        self.flush()
+        counters = {}
+        for batch in self._buffers[self._COUNTERS_KEY].pop():
+            for name, value in six.iteritems(batch):
+                counters[name] = counters.get(name, 0) + value
+        return counters
 
     def pop_gauges(self):
         """
@@ -693,10 +1224,11 @@ class UWSGITelemetryStorage(TelemetryStorage):
         :rtype: list
 
         """
-        with UWSGILock(self._uwsgi, self._GAUGES_LOCK_KEY):
-            gauges_raw = self._uwsgi.cache_get(self._GAUGES_KEY, _SPLITIO_METRICS_CACHE_NAMESPACE)
-            self._uwsgi.cache_del(self._GAUGES_KEY, _SPLITIO_METRICS_CACHE_NAMESPACE)
-            return json.loads(gauges_raw) if gauges_raw else {}
+        self.flush()
+        gauges = {}
+        for batch in self._buffers[self._GAUGES_KEY].pop():
+            gauges.update(batch)
+        return gauges
 
     def pop_latencies(self):
         """
@@ -704,8 +1236,11 @@ class UWSGITelemetryStorage(TelemetryStorage):
 
         :rtype: list
         """
-        with UWSGILock(self._uwsgi, self._LATENCIES_LOCK_KEY):
-            latencies_raw = self._uwsgi.cache_get(
-                self._LATENCIES_KEY, _SPLITIO_METRICS_CACHE_NAMESPACE)
-            self._uwsgi.cache_del(self._LATENCIES_KEY, _SPLITIO_METRICS_CACHE_NAMESPACE)
-            return json.loads(latencies_raw) if latencies_raw else {}
+        self.flush()
+        latencies = {}
+        for batch in self._buffers[self._LATENCIES_KEY].pop():
+            for name, buckets in six.iteritems(batch):
+                current = latencies.get(name)
+                latencies[name] = buckets if current is None else \
+                    [old + new for (old, new) in zip(current, buckets)]
+        return latencies
@@ -0,0 +1,506 @@
+"""
+Asyncio synchronization tasks.
+
+Counterparts of the thread-based tasks in this package, for the asyncio SDK flavor. Every task
+runs as a single asyncio task on the event loop it was started from, so they spawn no threads.
+This module requires python 3.5+.
+"""
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+import asyncio
+import logging
+import time
+
+from splitio.api import APIException
+from splitio.tasks.split_sync import SplitSynchronizationTask
+from splitio.tasks.segment_sync import SegmentSynchronizationTask, _SegmentSchedule
+from splitio.tasks.impressions_sync import ImpressionsSyncTask, ImpressionsCountSyncTask
+from splitio.tasks.events_sync import EventsSyncTask
+from splitio.tasks.telemetry_sync import TelemetrySynchronizationTask
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def _safe_run(func):
+    """
+    Await a coroutine function wrapped in a try-except block.
+
+    If anything goes wrong returns false instead of propagating the exception.
+
+    :param func: Coroutine function to be awaited, receives no arguments and it's return
+        value is ignored.
+    """
+    try:
+        await func()
+        return True
+    except Exception:  #pylint: disable=broad-except
+        _LOGGER.error('Something went wrong when running passed function.')
+        _LOGGER.debug('Original traceback:', exc_info=True)
+        return False
+
+
+class AsyncioTask(object):  #pylint: disable=too-many-instance-attributes
+    """
+    Periodic task driven by the event loop.
+
+    Counterpart of `splitio.tasks.util.asynctask.AsyncTask` for coroutine functions. Instead of
+    a thread waiting on a queue, an asyncio task awaits `period` seconds (or a forced
+    execution) between runs.
+    """
+
+    def __init__(self, main, period, on_init=None, on_stop=None):
+        """
+        Class constructor.
+
+        :param main: Coroutine function to be awaited periodically
+        :type main: callable
+        :param period: How many seconds to wait between executions
+        :type period: int
+        :param on_init: Coroutine function to be awaited ONCE before the main one
+        :type on_init: callable
+        :param on_stop: Coroutine function to be awaited ONCE after the task has finished
+        :type on_stop: callable
+        """
+        self._on_init = on_init
+        self._main = main
+        self._on_stop = on_stop
+        self._period = period
+        self._running = False
+        self._stopping = False
+        self._wakeup = None
+        self._task = None
+
+    async def _execution_wrapper(self):
+        """
+        Await the "on init" hook if available, then the main function every <period> seconds.
+
+        After stop has been called the "on stop" hook is awaited if available.
+        """
+        try:
+            if self._on_init is not None:
+                if not await _safe_run(self._on_init):
+                    _LOGGER.error("Error running task initialization function, aborting execution")
+                    return
+            self._running = True
+            while not self._stopping:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self._period)
+                except asyncio.TimeoutError:
+                    pass
+                if self._stopping:
+                    break
+                self._wakeup.clear()
+                if not await _safe_run(self._main):
+                    _LOGGER.error(
+                        "An error occurred when executing the task. "
+                        "Retrying after period expires"
+                    )
+        finally:
+            self._running = False
+            if self._on_stop is not None:
+                if not await _safe_run(self._on_stop):
+                    _LOGGER.error("An error occurred when executing the task's OnStop hook. ")
+
+    def start(self):
+        """Start the task on the current event loop."""
+        if self._task is not None and not self._task.done():
+            _LOGGER.warning("Task is already running. Ignoring .start() call")
+            return
+
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.ensure_future(self._execution_wrapper())
+
+    async def stop(self):
+        """
+        Stop the task and wait until the "on stop" hook has finished.
+
+        A task still running its "on init" hook is cancelled.
+        """
+        self._stopping = True
+        if self._task is None or self._task.done():
+            return
+
+        if self._running:
+            self._wakeup.set()
+        else:
+            self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    def force_execution(self):
+        """Force an execution of the task without waiting for the period to end."""
+        if not self._running:
+            return
+        self._wakeup.set()
+
+    def running(self):
+        """Return whether the task is running or not."""
+        return self._running
+
+
+class AsyncSplitSynchronizationTask(SplitSynchronizationTask):
+    """Split synchronization task that runs on the event loop."""
+
+    def __init__(self, split_api, split_storage, period, ready_flag):
+        """
+        Class constructor.
+
+        :param split_api: Split API Client.
+        :type split_api: splitio.api.aio.AsyncSplitsAPI
+        :param split_storage: Split Storage.
+        :type split_storage: splitio.storage.InMemorySplitStorage
+        :param ready_flag: Flag to set when splits initial sync is complete.
+        :type ready_flag: asyncio.Event
+        """
+        SplitSynchronizationTask.__init__(self, split_api, split_storage, period, ready_flag)
+        self._task = AsyncioTask(self._update_splits, period, self._on_start)
+
+    async def _update_splits(self):
+        """
+        Hit endpoint, update storage and return True if sync is complete.
+
+        :return: True if synchronization is complete.
+        :rtype: bool
+        """
+        till = self._split_storage.get_change_number()
+        if till is None:
+            till = -1
+
+        try:
+            split_changes = await self._api.fetch_splits(till)
+        except APIException:
+            self._logger.error('Failed to fetch split from servers')
+            return False
+
+        return self._apply_split_changes(split_changes)
+
+    async def _on_start(self):
+        """Wait until splits are in sync and set the flag to true."""
+        while not await self._update_splits():
+            pass
+
+        self._ready_flag.set()
+        return True
+
+    async def stop(self):  #pylint: disable=arguments-differ
+        """Stop the task and wait until it has finished."""
+        await self._task.stop()
+
+
+class AsyncSegmentSynchronizationTask(SegmentSynchronizationTask):
+    """
+    Segment synchronization task that runs on the event loop.
+
+    Segments are fetched concurrently by up to `concurrency` coroutines, instead of a pool
+    of worker threads.
+    """
+
+    def __init__(self, segment_api, segment_storage, split_storage, period, event,  #pylint: disable=too-many-arguments
+                 concurrency=20, max_period=None, request_budget=0, telemetry_storage=None):
+        """
+        Clas constructor.
+
+        :param segment_api: API to retrieve segments from backend.
+        :type segment_api: splitio.api.aio.AsyncSegmentsAPI
+
+        :param segment_storage: Segment storage reference.
+        :type segment_storage: splitio.storage.SegmentStorage
+
+        :param event: Event to signal when all segments have finished initial sync.
+        :type event: asyncio.Event
+
+        :param concurrency: How many segments are fetched concurrently.
+        :type concurrency: int
+
+        :param max_period: Maximum seconds between polls of a quiet segment. None polls every
+            segment every `period` seconds.
+        :type max_period: int
+
+        :param request_budget: Maximum number of segments to poll per cycle. 0 means no limit.
+        :type request_budget: int
+
+        :param telemetry_storage: Optional storage where schedule gauges are reported.
+        :type telemetry_storage: splitio.storage.TelemetryStorage
+        """
+        # A pool without workers: it's never started, fetches run on the event loop.
+        SegmentSynchronizationTask.__init__(
+            self, segment_api, segment_storage, split_storage, period, event, 0, max_period,
+            request_budget, telemetry_storage
+        )
+        self._concurrency = concurrency
+        self._task = AsyncioTask(self._main, period, on_init=self._on_init)
+
+    async def _update_segment(self, segment_name):
+        """
+        Update a segment by hitting the split backend.
+
+        :param segment_name: Name of the segment to update.
+        :type segment_name: str
+
+        :return: True if the segment is in sync, False if it has more changes to fetch and
+            None if the fetch failed.
+        :rtype: bool
+        """
+        since = self._segment_storage.get_change_number(segment_name)
+        if since is None:
+            since = -1
+
+        try:
+            segment_changes = await self._segment_api.fetch_segment(segment_name, since)
+        except APIException:
+            self._logger.error('Error fetching segments')
+            return None
+
+        return self._apply_segment_changes(segment_name, segment_changes)
+
+    async def _ensure_segment_is_updated(self, segment_name):
+        """
+        Update a segment by hitting the split backend.
+
+        :param segment_name: Name of the segment to update.
+        :type segment_name: str
+        """
+        rounds = 0
+        while True:
+            in_sync = await self._update_segment(segment_name)
+            rounds += 1
+            if in_sync:
+                outcome = _SegmentSchedule.CHANGED if rounds > 1 else _SegmentSchedule.QUIET
+                break
+            # Errors are retried until ready, or forever when polling every segment each period.
+            if in_sync is None and self._schedule is not None and self._task.running():
+                outcome = _SegmentSchedule.ERROR
+                break
+
+        if self._schedule is not None:
+            self._schedule.record(segment_name, outcome, time.time())
+
+    async def _update_segments(self, segment_names):
+        """
+        Update segments concurrently and wait for all of them to finish.
+
+        :param segment_names: Names of the segments to update.
+        :type segment_names: list(str)
+        """
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def _bounded_update(segment_name):
+            async with semaphore:
+                try:
+                    await self._ensure_segment_is_updated(segment_name)
+                except Exception:  #pylint: disable=broad-except
+                    self._logger.error("Something went wrong when processing message %s",
+                                       segment_name)
+                    self._logger.debug('Original traceback: ', exc_info=True)
+
+        await asyncio.gather(*[_bounded_update(segment_name) for segment_name in segment_names])
+
+    async def _main(self):
+        """Update all current segments (or the ones due, if polling adaptively)."""
+        segment_names = self._split_storage.get_segment_names()
+        if self._schedule is not None:
+            segment_names, deferred = self._schedule.pop_due(
+                segment_names,
+                self._request_budget,
+                time.time()
+            )
+            self._report_schedule(len(segment_names), deferred)
+
+        await self._update_segments(segment_names)
+
+    async def _on_init(self):
+        """
+        Update all current segments, then set the ready flag.
+
+        The initial sync fetches every segment regardless of the request budget.
+        """
+        await self._update_segments(self._split_storage.get_segment_names())
+        self._event.set()
+
+    def start(self):
+        """Start segment synchronization."""
+        self._task.start()
+
+    async def stop(self):  #pylint: disable=arguments-differ
+        """Stop segment synchronization and wait until it has finished."""
+        await self._task.stop()
+
+
+class AsyncImpressionsSyncTask(ImpressionsSyncTask):
+    """Impressions synchronization task that runs on the event loop."""
+
+    def __init__(self, impressions_api, storage, period, bulk_size):
+        """
+        Class constructor.
+
+        :param impressions_api: Impressions Api object to send data to the backend
+        :type impressions_api: splitio.api.aio.AsyncImpressionsAPI
+        :param storage: Impressions Storage
+        :type storage: splitio.storage.ImpressionsStorage
+        :param period: How many seconds to wait between subsequent impressions pushes to the BE.
+        :type period: int
+        :param bulk_size: How many impressions to send per push.
+        :type bulk_size: int
+        """
+        ImpressionsSyncTask.__init__(self, impressions_api, storage, period, bulk_size)
+        self._task = AsyncioTask(
+            self._send_impressions,
+            self._period,
+            on_stop=self._send_impressions
+        )
+
+    async def _send_impressions(self):
+        """Send impressions from both the failed and new queues."""
+        to_send = self._get_failed()
+        if len(to_send) < self._bulk_size:
+            # If the amount of previously failed items is less than the bulk
+            # size, try to complete with new impressions from storage
+            to_send.extend(self._storage.pop_many(self._bulk_size - len(to_send)))
+
+        if not to_send:
+            return
+
+        try:
+            await self._impressions_api.flush_impressions(to_send)
+        except APIException as exc:
+            self._logger.error(
+                'Exception raised while reporting impressions: %s -- %d',
+                exc,
+                exc.status_code
+            )
+            self._add_to_failed_queue(to_send)
+
+    async def stop(self):  #pylint: disable=arguments-differ
+        """Stop the task and wait until pending impressions are flushed."""
+        await self._task.stop()
+
+
+class AsyncImpressionsCountSyncTask(ImpressionsCountSyncTask):
+    """Impression counts synchronization task that runs on the event loop."""
+
+    def __init__(self, impressions_api, counter, period):
+        """
+        Class constructor.
+
+        :param impressions_api: Impressions Api object to send data to the backend
+        :type impressions_api: splitio.api.aio.AsyncImpressionsAPI
+        :param counter: Counter of the impressions that weren't stored.
+        :type counter: splitio.engine.impressions.Counter
+        :param period: How many seconds to wait between subsequent pushes to the BE.
+        :type period: int
+        """
+        ImpressionsCountSyncTask.__init__(self, impressions_api, counter, period)
+        self._task = AsyncioTask(self._send_counters, self._period, on_stop=self._send_counters)
+
+    async def _send_counters(self):
+        """Send impression counts."""
+        to_send = self._counter.pop_all()
+        if not to_send:
+            return
+
+        try:
+            await self._impressions_api.flush_counters(to_send)
+        except APIException as exc:
+            self._logger.error(
+                'Exception raised while reporting impression counts: %s -- %d',
+                exc,
+                exc.status_code
+            )
+
+    async def stop(self):  #pylint: disable=arguments-differ
+        """Stop the task and wait until pending counts are flushed."""
+        await self._task.stop()
+
+
+class AsyncEventsSyncTask(EventsSyncTask):
+    """Events synchronization task that runs on the event loop."""
+
+    def __init__(self, events_api, storage, period, bulk_size):
+        """
+        Class constructor.
+
+        :param events_api: Events Api object to send data to the backend
+        :type events_api: splitio.api.aio.AsyncEventsAPI
+        :param storage: Events Storage
+        :type storage: splitio.storage.EventStorage
+        :param period: How many seconds to wait between subsequent event pushes to the BE.
+        :type period: int
+        :param bulk_size: How many events to send per push.
+        :type bulk_size: int
+        """
+        EventsSyncTask.__init__(self, events_api, storage, period, bulk_size)
+        self._task = AsyncioTask(self._send_events, self._period, on_stop=self._send_events)
+
+    async def _send_events(self):
+        """Send events from both the failed and new queues."""
+        to_send = self._get_failed()
+        if len(to_send) < self._bulk_size:
+            # If the amount of previously failed items is less than the bulk
+            # size, try to complete with new events from storage
+            to_send.extend(self._storage.pop_many(self._bulk_size - len(to_send)))
+
+        if not to_send:
+            return
+
+        try:
+            await self._events_api.flush_events(to_send)
+        except APIException as exc:
+            self._logger.error(
+                'Exception raised while reporting events: %s -- %d',
+                exc,
+                exc.status_code
+            )
+            self._add_to_failed_queue(to_send)
+
+    async def stop(self):  #pylint: disable=arguments-differ
+        """Stop the task and wait until pending events are flushed."""
+        await self._task.stop()
+
+
+class AsyncTelemetrySynchronizationTask(TelemetrySynchronizationTask):
+    """Telemetry synchronization task that runs on the event loop."""
+
+    def __init__(self, api, storage, period):
+        """
+        Class constructor.
+
+        :param api: Telemetry API Client.
+        :type api: splitio.api.aio.AsyncTelemetryAPI
+        :param storage: Telemetry Storage.
+        :type storage: splitio.storage.InMemoryTelemetryStorage
+        """
+        TelemetrySynchronizationTask.__init__(self, api, storage, period)
+        self._task = AsyncioTask(self._flush_telemetry, period)
+
+    async def _flush_telemetry(self):
+        """Send latencies, counters and gauges to split BE."""
+        try:
+            latencies = self._storage.pop_latencies()
+            if latencies:
+                await self._api.flush_latencies(latencies)
+        except APIException:
+            self._logger.error('Failed send telemetry/latencies to split BE.')
+
+        try:
+            counters = self._storage.pop_counters()
+            if counters:
+                await self._api.flush_counters(counters)
+        except APIException:
+            self._logger.error('Failed send telemetry/counters to split BE.')
+
+        try:
+            gauges = self._storage.pop_gauges()
+            if gauges:
+                await self._api.flush_gauges(gauges)
+        except APIException:
+            self._logger.error('Failed send telemetry/gauges to split BE.')
+
+    async def stop(self):  #pylint: disable=arguments-differ
+        """Stop the task and wait until it has finished."""
+        await self._task.stop()
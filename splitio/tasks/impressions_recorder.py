@@ -0,0 +1,171 @@
+"""Impressions recording task."""
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+import logging
+import os
+import threading
+
+from six.moves import queue
+
+from splitio.client.listener import ImpressionListenerException
+from splitio.engine.impressions import Manager as ImpressionsManager
+from splitio.tasks import BaseSynchronizationTask
+from splitio.tasks.util.asynctask import AsyncTask
+
+
+class ImpressionsRecorderTask(BaseSynchronizationTask):
+    """
+    Record impressions from a background thread.
+
+    Impressions (and the attributes used to evaluate them) are staged in a bounded in-memory
+    queue and periodically written in batches to the impressions storage & listener, so
+    evaluations don't wait for storage writes. When the queue is full, new impressions are
+    dropped.
+
+    The background thread is started lazily, on the first impressions recorded by each
+    process, so that prefork servers (ie: uwsgi) don't inherit a dead thread from the master.
+    """
+
+    def __init__(self, storage, listener, period, queue_size, bulk_size,  #pylint: disable=too-many-arguments
+                 impressions_manager=None):
+        """
+        Class constructor.
+
+        :param storage: Impressions Storage
+        :type storage: splitio.storage.ImpressionsStorage
+        :param listener: Optional impression listener.
+        :type listener: splitio.client.listener.ImpressionListenerWrapper
+        :param period: How many seconds to wait between subsequent flushes.
+        :type period: int
+        :param queue_size: How many impressions to stage before dropping new ones.
+        :type queue_size: int
+        :param bulk_size: How many impressions to write to storage at once.
+        :type bulk_size: int
+        :param impressions_manager: Decides which impressions are stored (all by default).
+        :type impressions_manager: splitio.engine.impressions.Manager
+        """
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._storage = storage
+        self._listener = listener
+        self._bulk_size = bulk_size
+        self._period = period
+        self._queue_size = queue_size
+        self._impressions_manager = impressions_manager if impressions_manager is not None \
+            else ImpressionsManager()
+        self._staged = queue.Queue(maxsize=queue_size)
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._pid = None
+        self._task = AsyncTask(self._flush, period, on_stop=self._flush)
+
+    def _ensure_started(self):
+        """Start the task in the current process, unless it's already running here."""
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+
+        with self._start_lock:
+            if self._pid == pid:
+                return
+            if self._pid is not None:
+                # Forked after starting: the parent's thread doesn't exist in this process, and
+                # its staged impressions are flushed by the parent.
+                self._staged = queue.Queue(maxsize=self._queue_size)
+                self._dropped = 0
+                self._lock = threading.Lock()
+                self._task = AsyncTask(self._flush, self._period, on_stop=self._flush)
+            self._task.start()
+            self._pid = pid
+
+    def record(self, impressions, attributes):
+        """
+        Stage impressions to be recorded.
+
+        :param impressions: Impressions to record.
+        :type impressions: list(splitio.models.impressions.Impression)
+        :param attributes: Attributes used to evaluate each impression.
+        :type attributes: list(dict)
+
+        :return: True if every impression was staged. False otherwise.
+        :rtype: bool
+        """
+        self._ensure_started()
+        for index, impression in enumerate(impressions):
+            try:
+                self._staged.put((impression, attributes[index]), False)
+            except queue.Full:
+                with self._lock:
+                    self._dropped += len(impressions) - index
+                return False
+
+        if self._staged.qsize() >= self._bulk_size:
+            self._task.force_execution()
+        return True
+
+    def _flush(self):
+        """Write every staged impression to storage & listener."""
+        with self._lock:
+            dropped, self._dropped = self._dropped, 0
+        if dropped:
+            self._logger.warning(
+                'Impressions recorder queue is full. %d impressions were dropped. '
+                'Consider increasing parameter `impressionsRecorderQueueSize` in configuration',
+                dropped
+            )
+
+        while True:
+            batch = []
+            while len(batch) < self._bulk_size:
+                try:
+                    batch.append(self._staged.get(False))
+                except queue.Empty:
+                    break
+
+            if not batch:
+                return
+
+            try:
+                self._storage.put(self._impressions_manager.process_impressions(
+                    [impression for (impression, _) in batch]
+                ))
+            except Exception:  #pylint: disable=broad-except
+                self._logger.error('Error recording impressions')
+                self._logger.debug('Error: ', exc_info=True)
+
+            if self._listener is not None:
+                for impression, attributes in batch:
+                    try:
+                        self._listener.log_impression(impression, attributes)
+                    except ImpressionListenerException:
+                        self._logger.error(
+                            'An exception was raised while calling user-custom impression listener'
+                        )
+                        self._logger.debug('Error', exc_info=True)
+
+    def start(self):
+        """Start executing the impressions recording task in the current process."""
+        self._ensure_started()
+
+    def stop(self, event=None):
+        """Stop executing the impressions recording task, flushing staged impressions."""
+        if self._pid != os.getpid():
+            # Never started in this process, so there's nothing to flush.
+            if event is not None:
+                event.set()
+            return
+        self._task.stop(event)
+
+    def is_running(self):
+        """
+        Return whether the task is running or not.
+
+        :return: True if the task is running. False otherwise.
+        :rtype: bool
+        """
+        return self._pid == os.getpid() and self._task.running()
+
+    def flush(self):
+        """Flush staged impressions."""
+        self._task.force_execution()
@@ -99,3 +99,56 @@ class ImpressionsSyncTask(BaseSynchronizationTask):
     def flush(self):
         """Flush impressions in storage."""
         self._task.force_execution()
+
+
+class ImpressionsCountSyncTask(BaseSynchronizationTask):
+    """Impression counts synchronization task uses an asynctask.AsyncTask to send counts."""
+
+    def __init__(self, impressions_api, counter, period):
+        """
+        Class constructor.
+
+        :param impressions_api: Impressions Api object to send data to the backend
+        :type impressions_api: splitio.api.impressions.ImpressionsAPI
+        :param counter: Counter of the impressions that weren't stored.
+        :type counter: splitio.engine.impressions.Counter
+        :param period: How many seconds to wait between subsequent pushes to the BE.
+        :type period: int
+        """
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._impressions_api = impressions_api
+        self._counter = counter
+        self._period = period
+        self._task = AsyncTask(self._send_counters, self._period, on_stop=self._send_counters)
+
+    def _send_counters(self):
+        """Send impression counts."""
+        to_send = self._counter.pop_all()
+        if not to_send:
+            return
+
+        try:
+            self._impressions_api.flush_counters(to_send)
+        except APIException as exc:
+            self._logger.error(
+                'Exception raised while reporting impression counts: %s -- %d',
+                exc.message,
+                exc.status_code
+            )
+
+    def start(self):
+        """Start executing the impression counts synchronization task."""
+        self._task.start()
+
+    def stop(self, event=None):
+        """Stop executing the impression counts synchronization task."""
+        self._task.stop(event)
+
+    def is_running(self):
+        """
+        Return whether the task is running or not.
+
+        :return: True if the task is running. False otherwise.
+        :rtype: bool
+        """
+        return self._task.running()
@@ -1,16 +1,114 @@
 """Segment syncrhonization module."""
 
 import logging
+import threading
+import time
+
 from splitio.api import APIException
 from splitio.tasks import BaseSynchronizationTask
 from splitio.tasks.util import asynctask, workerpool
-from splitio.models import segments
+
+
+class _SegmentSchedule(object):
+    """
+    Adaptive per-segment polling schedule.
+
+    A segment that changed is polled again after `min_interval` seconds. Every poll that finds
+    no changes, or that fails, doubles the wait, up to `max_interval` seconds.
+    """
+
+    CHANGED = 'changed'
+    QUIET = 'quiet'
+    ERROR = 'error'
+
+    def __init__(self, min_interval, max_interval):
+        """
+        Class constructor.
+
+        :param min_interval: Seconds to wait before polling a segment that just changed.
+        :type min_interval: int
+        :param max_interval: Maximum seconds to wait before polling a quiet segment.
+        :type max_interval: int
+        """
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._intervals = {}
+        self._due = {}
+        self._lock = threading.Lock()
+
+    def pop_due(self, segment_names, budget, now):
+        """
+        Return the segments due for polling, most overdue first, and mark them as in flight.
+
+        :param segment_names: Names of the segments currently in use.
+        :type segment_names: iterable(str)
+        :param budget: Maximum number of segments to return. 0 means no limit.
+        :type budget: int
+        :param now: Current timestamp, in seconds.
+        :type now: float
+
+        :return: Tuple of segments to poll & number of due segments deferred by the budget.
+        :rtype: tuple(list(str), int)
+        """
+        segment_names = set(segment_names)
+        with self._lock:
+            for unused in set(self._intervals).difference(segment_names):
+                del self._intervals[unused]
+                self._due.pop(unused, None)
+
+            due = sorted(
+                (self._due.get(segment_name, 0), segment_name)
+                for segment_name in segment_names
+                if self._due.get(segment_name, 0) <= now
+            )
+            selected = [segment_name for (_, segment_name) in (due[:budget] if budget else due)]
+            for segment_name in selected:
+                # Not polled again until the in-flight update is recorded.
+                self._due[segment_name] = now + self._max_interval
+        return selected, len(due) - len(selected)
+
+    def record(self, segment_name, outcome, now):
+        """
+        Schedule the next poll of a segment.
+
+        :param segment_name: Name of the segment just polled.
+        :type segment_name: str
+        :param outcome: One of `CHANGED`, `QUIET` or `ERROR`.
+        :type outcome: str
+        :param now: Current timestamp, in seconds.
+        :type now: float
+        """
+        with self._lock:
+            if outcome == self.CHANGED:
+                interval = self._min_interval
+            else:
+                previous = self._intervals.get(segment_name, self._min_interval)
+                interval = min(previous * 2, self._max_interval)
+            self._intervals[segment_name] = interval
+            self._due[segment_name] = now + interval
+
+    def get_average_interval(self):
+        """
+        Return the average polling interval of scheduled segments.
+
+        :rtype: float
+        """
+        with self._lock:
+            if not self._intervals:
+                return 0
+            return sum(self._intervals.values()) / float(len(self._intervals))
 
 
 class SegmentSynchronizationTask(BaseSynchronizationTask):  #pylint: disable=too-many-instance-attributes
-    """Segment Syncrhonization class."""
+    """
+    Segment Syncrhonization class.
 
-    def __init__(self, segment_api, segment_storage, split_storage, period, event):  #pylint: disable=too-many-arguments
+    When `max_period` is set, segments are polled on an adaptive per-segment schedule instead of
+    every `period` seconds, and at most `request_budget` segments are polled per cycle.
+    """
+
+    def __init__(self, segment_api, segment_storage, split_storage, period, event,  #pylint: disable=too-many-arguments
+                 worker_pool_size=20, max_period=None, request_budget=0, telemetry_storage=None):
         """
         Clas constructor.
 
@@ -22,15 +120,31 @@ class SegmentSynchronizationTask(BaseSynchronizationTask):  #pylint: disable=too
 
         :param event: Event to signal when all segments have finished initial sync.
         :type event: threading.Event
+
+        :param worker_pool_size: How many threads fetch segments concurrently.
+        :type worker_pool_size: int
+
+        :param max_period: Maximum seconds between polls of a quiet segment. None polls every
+            segment every `period` seconds.
+        :type max_period: int
+
+        :param request_budget: Maximum number of segments to poll per cycle. 0 means no limit.
+        :type request_budget: int
+
+        :param telemetry_storage: Optional storage where schedule gauges are reported.
+        :type telemetry_storage: splitio.storage.TelemetryStorage
         """
         self._logger = logging.getLogger(self.__class__.__name__)
-        self._worker_pool = workerpool.WorkerPool(20, self._ensure_segment_is_updated)
+        self._worker_pool = workerpool.WorkerPool(worker_pool_size, self._ensure_segment_is_updated)
         self._task = asynctask.AsyncTask(self._main, period, on_init=self._on_init)
         self._segment_api = segment_api
         self._segment_storage = segment_storage
         self._split_storage = split_storage
         self._event = event
         self._pending_initialization = []
+        self._schedule = _SegmentSchedule(period, max_period) if max_period else None
+        self._request_budget = request_budget
+        self._telemetry_storage = telemetry_storage
 
     def _update_segment(self, segment_name):
         """
@@ -38,6 +152,10 @@ class SegmentSynchronizationTask(BaseSynchronizationTask):  #pylint: disable=too
 
         :param segment_name: Name of the segment to update.
         :type segment_name: str
+
+        :return: True if the segment is in sync, False if it has more changes to fetch and
+            None if the fetch failed.
+        :rtype: bool
         """
         since = self._segment_storage.get_change_number(segment_name)
         if since is None:
@@ -47,30 +165,76 @@ class SegmentSynchronizationTask(BaseSynchronizationTask):  #pylint: disable=too
             segment_changes = self._segment_api.fetch_segment(segment_name, since)
         except APIException:
             self._logger.error('Error fetching segments')
-            return False
-
-        if since == -1:  # first time fetching the segment
-            new_segment = segments.from_raw(segment_changes)
-            self._segment_storage.put(new_segment)
-        else:
-            self._segment_storage.update(
-                segment_name,
-                segment_changes['added'],
-                segment_changes['removed'],
-                segment_changes['till']
-            )
+            return None
+
+        return self._apply_segment_changes(segment_name, segment_changes)
+
+    def _apply_segment_changes(self, segment_name, segment_changes):
+        """
+        Store fetched segment changes.
+
+        :param segment_name: Name of the fetched segment.
+        :type segment_name: str
+        :param segment_changes: Json representation of a segmentChanges response.
+        :type segment_changes: dict
+
+        :return: True if the segment is in sync.
+        :rtype: bool
+        """
+        # The storage creates the segment on the first fetch, straight from the fetched keys.
+        self._segment_storage.update(
+            segment_name,
+            segment_changes['added'],
+            segment_changes['removed'],
+            segment_changes['till']
+        )
 
         return segment_changes['till'] == segment_changes['since']
 
     def _main(self):
-        """Submit all current segments and wait for them to finish."""
+        """Submit all current segments (or the ones due, if polling adaptively)."""
         segment_names = self._split_storage.get_segment_names()
+        if self._schedule is not None:
+            segment_names, deferred = self._schedule.pop_due(
+                segment_names,
+                self._request_budget,
+                time.time()
+            )
+            self._report_schedule(len(segment_names), deferred)
+
         for segment_name in segment_names:
             self._worker_pool.submit_work(segment_name)
 
+    def _report_schedule(self, submitted, deferred):
+        """
+        Report the state of the adaptive schedule as telemetry gauges.
+
+        :param submitted: Number of segments submitted this cycle.
+        :type submitted: int
+        :param deferred: Number of due segments deferred by the request budget.
+        :type deferred: int
+        """
+        if self._telemetry_storage is None:
+            return
+
+        try:
+            self._telemetry_storage.put_gauge('segments.polling.submitted', submitted)
+            self._telemetry_storage.put_gauge('segments.polling.deferred', deferred)
+            self._telemetry_storage.put_gauge(
+                'segments.polling.averageInterval',
+                self._schedule.get_average_interval()
+            )
+        except Exception:  #pylint: disable=broad-except
+            self._logger.debug('Error: ', exc_info=True)
+
     def _on_init(self):
-        """Submit all current segments and wait for them to finish, then set the ready flag."""
-        self._main()
+        """
+        Submit all current segments and wait for them to finish, then set the ready flag.
+
+        The initial sync fetches every segment regardless of the request budget.
+        """
+        for segment_name in self._split_storage.get_segment_names():
+            self._worker_pool.submit_work(segment_name)
         self._worker_pool.wait_for_completion()
         self._event.set()
 
@@ -81,8 +245,20 @@ class SegmentSynchronizationTask(BaseSynchronizationTask):  #pylint: disable=too
         :param segment_name: Name of the segment to update.
         :type segment_name: str
         """
-        while not self._update_segment(segment_name):
-            pass
+        rounds = 0
+        while True:
+            in_sync = self._update_segment(segment_name)
+            rounds += 1
+            if in_sync:
+                outcome = _SegmentSchedule.CHANGED if rounds > 1 else _SegmentSchedule.QUIET
+                break
+            # Errors are retried until ready, or forever when polling every segment each period.
+            if in_sync is None and self._schedule is not None and self._task.running():
+                outcome = _SegmentSchedule.ERROR
+                break
+
+        if self._schedule is not None:
+            self._schedule.record(segment_name, outcome, time.time())
 
     def start(self):
         """Start segment synchronization."""
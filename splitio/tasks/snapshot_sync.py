@@ -0,0 +1,125 @@
+"""Snapshot writing & loading tasks."""
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+import logging
+
+from splitio.storage.mmap_snapshot import write_snapshot
+from splitio.tasks import BaseSynchronizationTask
+from splitio.tasks.util.asynctask import AsyncTask
+
+
+class SnapshotWriterTask(BaseSynchronizationTask):
+    """Write splits & segments to a snapshot file whenever a change number moves."""
+
+    def __init__(self, split_storage, segment_storage, path, period):
+        """
+        Class constructor.
+
+        :param split_storage: Storage to read splits from.
+        :type split_storage: splitio.storage.SplitStorage
+        :param segment_storage: Storage to read segments from.
+        :type segment_storage: splitio.storage.SegmentStorage
+        :param path: Path of the snapshot file.
+        :type path: str
+        :param period: How many seconds to wait between checks for changes.
+        :type period: int
+        """
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._split_storage = split_storage
+        self._segment_storage = segment_storage
+        self._path = path
+        self._written_version = None
+        self._hashes_cache = {}
+        self._task = AsyncTask(self._write, period)
+
+    def _get_version(self):
+        """
+        Return the change numbers of the splits & every segment in use.
+
+        :rtype: tuple
+        """
+        return (
+            self._split_storage.get_change_number(),
+            tuple(sorted(
+                (segment_name, self._segment_storage.get_change_number(segment_name))
+                for segment_name in self._split_storage.get_segment_names()
+            ))
+        )
+
+    def _write(self):
+        """Write a new snapshot if anything changed since the last one."""
+        version = self._get_version()
+        if version == self._written_version:
+            return
+
+        try:
+            write_snapshot(
+                self._path,
+                self._split_storage,
+                self._segment_storage,
+                self._hashes_cache
+            )
+            self._written_version = version
+        except Exception:  #pylint: disable=broad-except
+            self._logger.error('Error writing snapshot to %s', self._path)
+            self._logger.debug('Error: ', exc_info=True)
+
+    def start(self):
+        """Start the task."""
+        self._task.start()
+
+    def stop(self, event=None):
+        """Stop the task. Accept an optional event to set when the task has finished."""
+        self._task.stop(event)
+
+    def is_running(self):
+        """
+        Return whether the task is running or not.
+
+        :return: True if the task is running. False otherwise.
+        :rtype: bool
+        """
+        return self._task.running()
+
+
+class SnapshotLoaderTask(BaseSynchronizationTask):
+    """
+    Keep checking for new snapshots in the background.
+
+    Lookups find the latest snapshot already mapped, and the reader's ready event is set as
+    soon as the first one is written, even if no lookups are made.
+    """
+
+    def __init__(self, reader, period):
+        """
+        Class constructor.
+
+        :param reader: Snapshot reader.
+        :type reader: splitio.storage.mmap_snapshot.SnapshotReader
+        :param period: How many seconds to wait between checks for a new snapshot.
+        :type period: int
+        """
+        self._reader = reader
+        self._task = AsyncTask(self._load, period, on_init=self._load)
+
+    def _load(self):
+        """Map the latest snapshot, if there's a new one."""
+        self._reader.get()
+
+    def start(self):
+        """Start the task."""
+        self._task.start()
+
+    def stop(self, event=None):
+        """Stop the task. Accept an optional event to set when the task has finished."""
+        self._task.stop(event)
+
+    def is_running(self):
+        """
+        Return whether the task is running or not.
+
+        :return: True if the task is running. False otherwise.
+        :rtype: bool
+        """
+        return self._task.running()
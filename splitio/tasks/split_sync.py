@@ -45,13 +45,27 @@ class SplitSynchronizationTask(BaseSynchronizationTask):
             self._logger.error('Failed to fetch split from servers')
             return False
 
+        return self._apply_split_changes(split_changes)
+
+    def _apply_split_changes(self, split_changes):
+        """
+        Store fetched split changes.
+
+        :param split_changes: Json representation of a splitChanges response.
+        :type split_changes: dict
+
+        :return: True if synchronization is complete.
+        :rtype: bool
+        """
+        to_put = []
+        to_remove = []
         for split in split_changes.get('splits', []):
             if split['status'] == splits.Status.ACTIVE.value:
-                self._split_storage.put(splits.from_raw(split))
+                to_put.append(splits.from_raw(split))
             else:
-                self._split_storage.remove(split['name'])
+                to_remove.append(split['name'])
 
-        self._split_storage.set_change_number(split_changes['till'])
+        self._split_storage.apply_changes(to_put, to_remove, split_changes['till'])
         return split_changes['till'] == split_changes['since']
 
     def _on_start(self):
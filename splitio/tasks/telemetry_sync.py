@@ -1,6 +1,9 @@
 """Split Synchronization task."""
 
 import logging
+
+import six
+
 from splitio.api import APIException
 from splitio.tasks import BaseSynchronizationTask
 from splitio.tasks.util.asynctask import AsyncTask
@@ -9,7 +12,7 @@ from splitio.tasks.util.asynctask import AsyncTask
 class TelemetrySynchronizationTask(BaseSynchronizationTask):
     """Split Synchronization task class."""
 
-    def __init__(self, api, storage, period):
+    def __init__(self, api, storage, period, http_client=None):
         """
         Class constructor.
 
@@ -17,11 +20,14 @@ class TelemetrySynchronizationTask(BaseSynchronizationTask):
         :type api: splitio.api.telemetry.TelemetryAPI
         :param storage: Telemetry Storage.
         :type storage: splitio.storage.InMemoryTelemetryStorage
+        :param http_client: Optional client whose connection reuse is reported as gauges.
+        :type http_client: splitio.api.client.HttpClient
         """
         self._logger = logging.getLogger(self.__class__.__name__)
         self._api = api
         self._period = period
         self._storage = storage
+        self._http_client = http_client
         self._task = AsyncTask(self._flush_telemetry, period)
 
     def _flush_telemetry(self):
@@ -31,6 +37,9 @@ class TelemetrySynchronizationTask(BaseSynchronizationTask):
         :return: True if synchronization is complete.
         :rtype: bool
         """
+        if self._http_client is not None:
+            self._report_connection_stats()
+
         try:
             latencies = self._storage.pop_latencies()
             if latencies:
@@ -52,6 +61,20 @@ class TelemetrySynchronizationTask(BaseSynchronizationTask):
         except APIException:
             self._logger.error('Failed send telemetry/gauges to split BE.')
 
+    def _report_connection_stats(self):
+        """Store the requests issued & connections opened to each server as gauges."""
+        try:
+            stats = self._http_client.get_connection_stats()
+            for server, server_stats in six.iteritems(stats):
+                self._storage.put_gauge('http.%s.requests' % server, server_stats['requests'])
+                self._storage.put_gauge(
+                    'http.%s.connections' % server,
+                    server_stats['connections']
+                )
+        except Exception:  #pylint: disable=broad-except
+            self._logger.error('Error reporting connection stats')
+            self._logger.debug('Error: ', exc_info=True)
+
     def start(self):
         """Start the task."""
         self._task.start()
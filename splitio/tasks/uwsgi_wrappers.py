@@ -108,10 +108,15 @@ def uwsgi_report_impressions(user_config):
     config = _get_config(user_config)
     metadata = get_metadata(config)
     seconds = config['impressionsRefreshRate']
-    storage = UWSGIImpressionStorage(get_uwsgi())
+    storage = UWSGIImpressionStorage(get_uwsgi(), config['uwsgiImpressionsSlotsPerWorker'])
     impressions_sync_task = ImpressionsSyncTask(
         ImpressionsAPI(
-            HttpClient(1500, config.get('sdk_url'), config.get('events_url')),
+            HttpClient(
+                1500,
+                config.get('sdk_url'),
+                config.get('events_url'),
+                config['requestCompressionEnabled']
+            ),
             config['apikey'],
             metadata
         ),
@@ -145,7 +150,12 @@ def uwsgi_report_events(user_config):
     storage = UWSGIEventStorage(get_uwsgi())
     task = EventsSyncTask(
         EventsAPI(
-            HttpClient(1500, config.get('sdk_url'), config.get('events_url')),
+            HttpClient(
+                1500,
+                config.get('sdk_url'),
+                config.get('events_url'),
+                config['requestCompressionEnabled']
+            ),
             config['apikey'],
             metadata
         ),
@@ -176,14 +186,12 @@ def uwsgi_report_telemetry(user_config):
     metadata = get_metadata(config)
     seconds = config.get('metricsRefreshRate', 30)
     storage = UWSGITelemetryStorage(get_uwsgi())
+    http_client = HttpClient(1500, config.get('sdk_url'), config.get('events_url'))
     task = TelemetrySynchronizationTask(
-        TelemetryAPI(
-            HttpClient(1500, config.get('sdk_url'), config.get('events_url')),
-            config['apikey'],
-            metadata
-        ),
+        TelemetryAPI(http_client, config['apikey'], metadata),
         storage,
         None, # Period not needed. Task is being triggered manually.
+        http_client
     )
     while True:
         try:
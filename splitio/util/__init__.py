@@ -0,0 +1 @@
+"""Generic utilities shared by the engine & storage layers."""
@@ -0,0 +1,136 @@
+"""Bounded LRU cache module."""
+from __future__ import absolute_import, division, print_function, \
+    unicode_literals
+
+import logging
+import threading
+from collections import OrderedDict
+
+
+DEFAULT_REPORT_INTERVAL = 1000
+
+
+class LRUCache(object):  #pylint: disable=too-many-instance-attributes
+    """
+    Bounded LRU cache with hit/miss accounting, for values that never expire on their own.
+
+    When a telemetry storage and metric names are supplied, the cache size & hit rate (percent)
+    are pushed as gauges every `report_interval` lookups.
+    """
+
+    def __init__(self, max_size, telemetry_storage=None, metric_prefix=None,  #pylint: disable=too-many-arguments
+                 report_interval=DEFAULT_REPORT_INTERVAL):
+        """
+        Class constructor.
+
+        :param max_size: Maximum number of items to keep.
+        :type max_size: int
+        :param telemetry_storage: Optional storage where cache size & hit rate are reported.
+        :type telemetry_storage: splitio.storage.TelemetryStorage
+        :param metric_prefix: Prefix of the `<prefix>.size` & `<prefix>.hitRate` gauges.
+        :type metric_prefix: str
+        :param report_interval: How many lookups to account for between reports.
+        :type report_interval: int
+        """
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._telemetry_storage = telemetry_storage if metric_prefix else None
+        self._metric_prefix = metric_prefix
+        self._report_interval = report_interval
+
+    def get(self, key):
+        """
+        Return the cached value for a key (marking it as the most recently used one).
+
+        :param key: Key of the item.
+        :type key: object
+
+        :return: The cached value or None.
+        :rtype: object
+        """
+        with self._lock:
+            value = self._data.pop(key, None)
+            if value is None:
+                self._misses += 1
+            else:
+                self._data[key] = value
+                self._hits += 1
+            stats = self._pop_stats_if_due()
+
+        if stats is not None:
+            self._report(stats)
+        return value
+
+    def put(self, key, value):
+        """
+        Store a value, evicting the least recently used one if the cache is full.
+
+        :param key: Key of the item.
+        :type key: object
+        :param value: Value to store (None cannot be cached).
+        :type value: object
+        """
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            if len(self._data) > self._max_size:
+                self._data.popitem(last=False)
+
+    def record_hit(self):
+        """Account for a lookup answered by the caller without going through `get`."""
+        with self._lock:
+            self._hits += 1
+            stats = self._pop_stats_if_due()
+
+        if stats is not None:
+            self._report(stats)
+
+    def pop_stats(self):
+        """
+        Return the current size and the hits & misses since the last call, and reset them.
+
+        :rtype: tuple(int, int, int)
+        """
+        with self._lock:
+            return self._pop_stats()
+
+    def _pop_stats(self):
+        """Return & reset the stats. Must be called while holding the lock."""
+        stats = (len(self._data), self._hits, self._misses)
+        self._hits = 0
+        self._misses = 0
+        return stats
+
+    def _pop_stats_if_due(self):
+        """
+        Pop the stats if they must be reported. Must be called while holding the lock.
+
+        :return: Stats to report, or None.
+        :rtype: tuple(int, int, int)
+        """
+        if self._telemetry_storage is None or \
+                self._hits + self._misses < self._report_interval:
+            return None
+        return self._pop_stats()
+
+    def _report(self, stats):
+        """
+        Push the cache size & hit rate to the telemetry storage, outside the cache lock.
+
+        :param stats: Size, hits & misses, as returned by `pop_stats`.
+        :type stats: tuple(int, int, int)
+        """
+        size, hits, misses = stats
+        try:
+            self._telemetry_storage.put_gauge(self._metric_prefix + '.size', size)
+            self._telemetry_storage.put_gauge(
+                self._metric_prefix + '.hitRate',
+                hits * 100 // (hits + misses)
+            )
+        except Exception:  #pylint: disable=broad-except
+            self._logger.error('Error reporting %s metrics', self._metric_prefix)
+            self._logger.debug('Error: ', exc_info=True)
@@ -0,0 +1,116 @@
+"""Asyncio API tests module."""
+
+import json
+import sys
+
+import pytest
+
+from splitio.api import client, APIException
+from splitio.client.util import SdkMetadata
+from splitio.models.impressions import Impression
+
+
+def _done(result=None, exception=None):
+    """Return an awaitable resolved to the result (or failed with the exception)."""
+    import asyncio
+    future = asyncio.get_event_loop().create_future()
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+    return future
+
+
+@pytest.mark.skipif(sys.version_info < (3, 5), reason='asyncio requires python 3.5+')
+class AsyncAPITests(object):
+    """Asyncio API test cases."""
+
+    def setup_method(self):
+        """Run each test on a fresh event loop."""
+        import asyncio
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def teardown_method(self):
+        """Close the event loop."""
+        import asyncio
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    def test_fetch_split_changes(self, mocker):
+        """Test that split changes are fetched conditionally & client errors are wrapped."""
+        from splitio.api.aio import AsyncSplitsAPI
+        httpclient = mocker.Mock()
+        httpclient.get.side_effect = [
+            _done(client.HttpResponse(200, '{"splits": [], "since": 1, "till": 1}', {'ETag': 'a'})),
+            _done(client.HttpResponse(304, '')),
+            _done(exception=client.HttpClientException('some_message')),
+        ]
+        split_api = AsyncSplitsAPI(httpclient, 'some_api_key')
+        assert self.loop.run_until_complete(split_api.fetch_splits(1)) == \
+            {'splits': [], 'since': 1, 'till': 1}
+        assert self.loop.run_until_complete(split_api.fetch_splits(1)) == \
+            {'splits': [], 'since': 1, 'till': 1}
+        with pytest.raises(APIException):
+            self.loop.run_until_complete(split_api.fetch_splits(1))
+
+        assert httpclient.get.mock_calls[:2] == [
+            mocker.call('sdk', '/splitChanges', 'some_api_key', {'since': 1}, None),
+            mocker.call('sdk', '/splitChanges', 'some_api_key', {'since': 1}, {'If-None-Match': 'a'})
+        ]
+
+    def test_fetch_segment_changes(self, mocker):
+        """Test that segment changes are fetched & non-2xx responses raise."""
+        from splitio.api.aio import AsyncSegmentsAPI
+        httpclient = mocker.Mock()
+        httpclient.get.side_effect = [
+            _done(client.HttpResponse(200, '{"name": "s1", "added": ["k"]}')),
+            _done(client.HttpResponse(403, 'forbidden')),
+        ]
+        segment_api = AsyncSegmentsAPI(httpclient, 'some_api_key')
+        assert self.loop.run_until_complete(segment_api.fetch_segment('s1', -1)) == \
+            {'name': 's1', 'added': ['k']}
+        with pytest.raises(APIException) as exc_info:
+            self.loop.run_until_complete(segment_api.fetch_segment('s1', -1))
+        assert exc_info.value.status_code == 403
+        assert httpclient.get.mock_calls[0] == \
+            mocker.call('sdk', '/segmentChanges/s1', 'some_api_key', {'since': -1}, None)
+
+    def test_flush_impressions(self, mocker):
+        """Test that impressions are posted in the same format as the regular API."""
+        from splitio.api.aio import AsyncImpressionsAPI
+        httpclient = mocker.Mock()
+        httpclient.post.side_effect = [
+            _done(client.HttpResponse(200, '')),
+            _done(client.HttpResponse(500, 'error')),
+        ]
+        impressions_api = AsyncImpressionsAPI(
+            httpclient, 'some_api_key', SdkMetadata('python-1.2.3', 'host', 'NA')
+        )
+        impressions = [Impression('k1', 'f1', 'on', 'l1', 123456, 'b1', 321654)]
+        self.loop.run_until_complete(impressions_api.flush_impressions(impressions))
+        with pytest.raises(APIException):
+            self.loop.run_until_complete(impressions_api.flush_impressions(impressions))
+
+        call = httpclient.post.mock_calls[0]
+        assert call[1][:3] == ('events', '/testImpressions/bulk', 'some_api_key')
+        assert json.loads(''.join(client._iter_json(call[2]['body']))) == [{
+            'testName': 'f1',
+            'keyImpressions': [{
+                'keyName': 'k1',
+                'treatment': 'on',
+                'time': 321654,
+                'changeNumber': 123456,
+                'label': 'l1',
+                'bucketingKey': 'b1'
+            }]
+        }]
+        assert call[2]['extra_headers'] == {'SplitSDKVersion': 'python-1.2.3'}
+
+    def test_missing_aiohttp(self):
+        """Test that the http client fails to build without aiohttp."""
+        from splitio.api import aio
+        if not hasattr(aio, 'missing_aiohttp_dependencies'):
+            pytest.skip('aiohttp is installed')
+        with pytest.raises(NotImplementedError):
+            aio.AsyncHttpClient()
@@ -46,7 +46,7 @@ class EventsAPITests(object):
         }
 
         # validate key-value args (body)
-        assert call_made[2]['body'] == self.eventsExpected
+        assert list(call_made[2]['body']) == self.eventsExpected
 
         httpclient.reset_mock()
         def raise_exception(*args, **kwargs):
@@ -78,4 +78,4 @@ class EventsAPITests(object):
         }
 
         # validate key-value args (body)
-        assert call_made[2]['body'] == self.eventsExpected
+        assert list(call_made[2]['body']) == self.eventsExpected
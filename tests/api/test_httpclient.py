@@ -1,5 +1,9 @@
 """HTTPClient test module."""
 
+import gzip
+import io
+import json
+
 from splitio.api import client
 
 class HttpClientTests(object):
@@ -12,7 +16,7 @@ class HttpClientTests(object):
         response_mock.text = 'ok'
         get_mock = mocker.Mock()
         get_mock.return_value = response_mock
-        mocker.patch('splitio.api.client.requests.get', new=get_mock)
+        mocker.patch('splitio.api.client.requests.Session.get', new=get_mock)
         httpclient = client.HttpClient()
         response = httpclient.get('sdk', '/test1', 'some_api_key', {'param1': 123}, {'h1': 'abc'})
         call = mocker.call(
@@ -44,7 +48,7 @@ class HttpClientTests(object):
         response_mock.text = 'ok'
         get_mock = mocker.Mock()
         get_mock.return_value = response_mock
-        mocker.patch('splitio.api.client.requests.get', new=get_mock)
+        mocker.patch('splitio.api.client.requests.Session.get', new=get_mock)
         httpclient = client.HttpClient(sdk_url='https://sdk.com', events_url='https://events.com')
         response = httpclient.get('sdk', '/test1', 'some_api_key', {'param1': 123}, {'h1': 'abc'})
         call = mocker.call(
@@ -77,7 +81,7 @@ class HttpClientTests(object):
         response_mock.text = 'ok'
         get_mock = mocker.Mock()
         get_mock.return_value = response_mock
-        mocker.patch('splitio.api.client.requests.post', new=get_mock)
+        mocker.patch('splitio.api.client.requests.Session.post', new=get_mock)
         httpclient = client.HttpClient()
         response = httpclient.post('sdk', '/test1', 'some_api_key', {'p1': 'a'}, {'param1': 123}, {'h1': 'abc'})
         call = mocker.call(
@@ -111,7 +115,7 @@ class HttpClientTests(object):
         response_mock.text = 'ok'
         get_mock = mocker.Mock()
         get_mock.return_value = response_mock
-        mocker.patch('splitio.api.client.requests.post', new=get_mock)
+        mocker.patch('splitio.api.client.requests.Session.post', new=get_mock)
         httpclient = client.HttpClient(sdk_url='https://sdk.com', events_url='https://events.com')
         response = httpclient.post('sdk', '/test1', 'some_api_key', {'p1': 'a'}, {'param1': 123}, {'h1': 'abc'})
         call = mocker.call(
@@ -137,3 +141,73 @@ class HttpClientTests(object):
         assert response.status_code == 200
         assert response.body == 'ok'
         assert get_mock.mock_calls == [call]
+
+    def test_post_generator_and_compression(self, mocker):
+        """Test that generator bodies are serialized & optionally gzipped."""
+        response_mock = mocker.Mock()
+        response_mock.status_code = 200
+        response_mock.text = 'ok'
+        post_mock = mocker.Mock()
+        post_mock.return_value = response_mock
+        mocker.patch('splitio.api.client.requests.Session.post', new=post_mock)
+        body = [{'p1': 'a', 'p2': [1, 2]}, {'p1': 'b'}]
+
+        httpclient = client.HttpClient()
+        httpclient.post('events', '/test1', 'some_api_key', (item for item in body))
+        kwargs = post_mock.mock_calls[0][2]
+        assert json.loads(b''.join(kwargs['data']).decode('utf-8')) == body
+        assert 'Content-Encoding' not in kwargs['headers']
+        post_mock.reset_mock()
+
+        httpclient = client.HttpClient(compression=True)
+        for sent in [body, (item for item in body)]:
+            httpclient.post('events', '/test1', 'some_api_key', sent)
+            kwargs = post_mock.mock_calls[0][2]
+            assert kwargs['headers']['Content-Encoding'] == 'gzip'
+            assert 'json' not in kwargs
+            with gzip.GzipFile(fileobj=io.BytesIO(b''.join(kwargs['data']))) as payload:
+                assert json.loads(payload.read().decode('utf-8')) == body
+            post_mock.reset_mock()
+
+    def test_body_chunks(self, mocker):
+        """Test that bodies are serialized in buffered, non-empty chunks."""
+        mocker.patch('splitio.api.client._BODY_CHUNK_SIZE', new=100)
+        body = [{'key': 'key%d' % index, 'value': index} for index in range(50)]
+        for compress in [False, True]:
+            chunks = list(client._encode_body((item for item in body), compress))  #pylint: disable=protected-access
+            assert len(chunks) > 1
+            assert all(chunks)
+            payload = b''.join(chunks)
+            if compress:
+                payload = gzip.GzipFile(fileobj=io.BytesIO(payload)).read()
+            assert json.loads(payload.decode('utf-8')) == body
+
+        compressor = mocker.Mock()
+        compressor.compress.return_value = b'x'
+        compressor.flush.return_value = b''
+        mocker.patch('splitio.api.client.zlib.compressobj', return_value=compressor)
+        chunks = list(client._encode_body(body, True))  #pylint: disable=protected-access
+        tokens = list(client._iter_json(body))  #pylint: disable=protected-access
+        assert len(compressor.compress.mock_calls) == len(chunks)
+        assert len(chunks) <= len(''.join(tokens)) // 100 + 1 < len(tokens)
+
+    def test_connection_pooling(self):
+        """Test that each server gets its own sized connection pool & stats."""
+        httpclient = client.HttpClient(sdk_pool_size=7, events_pool_size=3)
+        sdk_session = httpclient._sessions['sdk']  #pylint: disable=protected-access
+        events_session = httpclient._sessions['events']  #pylint: disable=protected-access
+        assert sdk_session is not events_session
+        assert sdk_session.get_adapter('https://sdk.split.io')._pool_maxsize == 7  #pylint: disable=protected-access
+        assert events_session.get_adapter('https://events.split.io')._pool_maxsize == 3  #pylint: disable=protected-access
+        assert httpclient.get_connection_stats() == {
+            'sdk': {'requests': 0, 'connections': 0},
+            'events': {'requests': 0, 'connections': 0}
+        }
+
+        pool = sdk_session.get_adapter('https://sdk.split.io').poolmanager.connection_from_url(
+            client.HttpClient.SDK_URL
+        )
+        pool.num_requests = 10
+        pool.num_connections = 2
+        assert httpclient.get_connection_stats()['sdk'] == {'requests': 10, 'connections': 2}
+        httpclient.close()
@@ -2,7 +2,7 @@
 
 import pytest
 from splitio.api import impressions, client, APIException
-from splitio.models.impressions import Impression
+from splitio.models.impressions import Impression, ImpressionCount
 from splitio.client.util import get_metadata
 from splitio.client.config import DEFAULT_CONFIG
 from splitio.version import __version__
@@ -51,7 +51,7 @@ class ImpressionsAPITests(object):
         }
 
         # validate key-value args (body)
-        assert call_made[2]['body'] == self.expectedImpressions
+        assert list(call_made[2]['body']) == self.expectedImpressions
 
         httpclient.reset_mock()
         def raise_exception(*args, **kwargs):
@@ -83,4 +83,26 @@ class ImpressionsAPITests(object):
         }
 
         # validate key-value args (body)
-        assert call_made[2]['body'] == self.expectedImpressions
+        assert list(call_made[2]['body']) == self.expectedImpressions
+
+    def test_post_counters(self, mocker):
+        """Test impression counts posting API call."""
+        httpclient = mocker.Mock(spec=client.HttpClient)
+        httpclient.post.return_value = client.HttpResponse(200, '')
+        sdk_metadata = get_metadata(DEFAULT_CONFIG.copy())
+        impressions_api = impressions.ImpressionsAPI(httpclient, 'some_api_key', sdk_metadata)
+        impressions_api.flush_counters([
+            ImpressionCount('f1', 3600000, 2),
+            ImpressionCount('f2', 7200000, 5)
+        ])
+
+        call_made = httpclient.post.mock_calls[0]
+        assert call_made[1] == ('events', '/testImpressions/count', 'some_api_key')
+        assert call_made[2]['body'] == {'pf': [
+            {'f': 'f1', 'm': 3600000, 'rc': 2},
+            {'f': 'f2', 'm': 7200000, 'rc': 5}
+        ]}
+
+        httpclient.post.return_value = client.HttpResponse(500, '')
+        with pytest.raises(APIException):
+            impressions_api.flush_counters([ImpressionCount('f1', 3600000, 2)])
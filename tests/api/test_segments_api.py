@@ -15,7 +15,7 @@ class SegmentAPITests(object):
         response = segment_api.fetch_segment('some_segment', 123)
 
         assert response['prop1'] == 'value1'
-        assert httpclient.get.mock_calls == [mocker.call('sdk', '/segmentChanges/some_segment', 'some_api_key', {'since': 123})]
+        assert httpclient.get.mock_calls == [mocker.call('sdk', '/segmentChanges/some_segment', 'some_api_key', {'since': 123}, None)]
 
         httpclient.reset_mock()
         def raise_exception(*args, **kwargs):
@@ -25,3 +25,26 @@ class SegmentAPITests(object):
             response = segment_api.fetch_segment('some_segment', 123)
             assert exc_info.type == APIException
             assert exc_info.value.message == 'some_message'
+
+    def test_fetch_segment_changes_conditional(self, mocker):
+        """Test that ETags are sent back per segment & that a 304 is not parsed."""
+        httpclient = mocker.Mock(spec=client.HttpClient)
+        httpclient.get.return_value = client.HttpResponse(
+            200,
+            '{"name": "s1", "added": [], "removed": [], "since": 123, "till": 123}',
+            {'ETag': 'abc'}
+        )
+        segment_api = segments.SegmentsAPI(httpclient, 'some_api_key')
+        segment_api.fetch_segment('s1', 123)
+        httpclient.get.return_value = client.HttpResponse(304, '')
+        assert segment_api.fetch_segment('s1', 123) == {
+            'name': 's1', 'added': [], 'removed': [], 'since': 123, 'till': 123
+        }
+        segment_api.fetch_segment('s2', 123)
+        segment_api.fetch_segment('s1', 456)
+        assert httpclient.get.mock_calls == [
+            mocker.call('sdk', '/segmentChanges/s1', 'some_api_key', {'since': 123}, None),
+            mocker.call('sdk', '/segmentChanges/s1', 'some_api_key', {'since': 123}, {'If-None-Match': 'abc'}),
+            mocker.call('sdk', '/segmentChanges/s2', 'some_api_key', {'since': 123}, None),
+            mocker.call('sdk', '/segmentChanges/s1', 'some_api_key', {'since': 456}, None)
+        ]
@@ -15,7 +15,7 @@ class SplitAPITests(object):
         response = split_api.fetch_splits(123)
 
         assert response['prop1'] == 'value1'
-        assert httpclient.get.mock_calls == [mocker.call('sdk', '/splitChanges', 'some_api_key', {'since': 123})]
+        assert httpclient.get.mock_calls == [mocker.call('sdk', '/splitChanges', 'some_api_key', {'since': 123}, None)]
 
         httpclient.reset_mock()
         def raise_exception(*args, **kwargs):
@@ -25,3 +25,22 @@ class SplitAPITests(object):
             response = split_api.fetch_splits(123)
             assert exc_info.type == APIException
             assert exc_info.value.message == 'some_message'
+
+    def test_fetch_split_changes_conditional(self, mocker):
+        """Test that ETags are sent back & that a 304 is not parsed."""
+        httpclient = mocker.Mock(spec=client.HttpClient)
+        httpclient.get.return_value = client.HttpResponse(
+            200,
+            '{"splits": [], "since": 123, "till": 123}',
+            {'ETag': 'abc'}
+        )
+        split_api = splits.SplitsAPI(httpclient, 'some_api_key')
+        split_api.fetch_splits(123)
+        httpclient.get.return_value = client.HttpResponse(304, '')
+        assert split_api.fetch_splits(123) == {'splits': [], 'since': 123, 'till': 123}
+        split_api.fetch_splits(456)
+        assert httpclient.get.mock_calls == [
+            mocker.call('sdk', '/splitChanges', 'some_api_key', {'since': 123}, None),
+            mocker.call('sdk', '/splitChanges', 'some_api_key', {'since': 123}, {'If-None-Match': 'abc'}),
+            mocker.call('sdk', '/splitChanges', 'some_api_key', {'since': 456}, None)
+        ]
@@ -0,0 +1,165 @@
+"""Asyncio client test module."""
+
+import json
+import sys
+
+import pytest
+
+from splitio.api.client import HttpResponse, _iter_json
+from splitio.client.client import Client
+
+
+_SPLIT = {
+    'name': 'f1',
+    'trafficTypeName': 'user',
+    'killed': False,
+    'seed': 1,
+    'status': 'ACTIVE',
+    'defaultTreatment': 'off',
+    'changeNumber': 1,
+    'algo': 2,
+    'trafficAllocation': 100,
+    'trafficAllocationSeed': 1,
+    'conditions': [{
+        'conditionType': 'ROLLOUT',
+        'matcherGroup': {
+            'combiner': 'AND',
+            'matchers': [{
+                'matcherType': 'IN_SEGMENT',
+                'negate': False,
+                'userDefinedSegmentMatcherData': {'segmentName': 'employees'},
+                'keySelector': {'trafficType': 'user', 'attribute': None}
+            }]
+        },
+        'partitions': [{'treatment': 'on', 'size': 100}],
+        'label': 'in segment employees'
+    }]
+}
+
+
+class _FakeAsyncHttpClient(object):
+    """Async HTTP client serving a split & a segment, and recording posts."""
+
+    def __init__(self, *_, **__):
+        """Class constructor."""
+        self.posts = {}
+        self.closed = False
+
+    @staticmethod
+    def _done(result=None):
+        """Return an awaitable resolved to the result."""
+        import asyncio
+        future = asyncio.get_event_loop().create_future()
+        future.set_result(result)
+        return future
+
+    def get(self, server, path, apikey, query=None, extra_headers=None):  #pylint: disable=too-many-arguments,unused-argument
+        """Serve split & segment changes."""
+        since = query['since']
+        if path == '/splitChanges':
+            body = {'splits': [_SPLIT] if since == -1 else [], 'since': since, 'till': 1}
+        elif path == '/segmentChanges/employees':
+            body = {'name': 'employees', 'added': ['key1'] if since == -1 else [],
+                    'removed': [], 'since': since, 'till': 10}
+        else:
+            body = {'name': path, 'added': [], 'removed': [], 'since': since, 'till': since}
+        return self._done(HttpResponse(200, json.dumps(body)))
+
+    def post(self, server, path, apikey, body, query=None, extra_headers=None):  #pylint: disable=too-many-arguments,unused-argument
+        """Record a post."""
+        self.posts.setdefault(path, []).extend(json.loads(''.join(_iter_json(body))))
+        return self._done(HttpResponse(200, ''))
+
+    def close(self):
+        """Close the client."""
+        self.closed = True
+        return self._done()
+
+
+@pytest.mark.skipif(sys.version_info < (3, 5), reason='asyncio requires python 3.5+')
+class AsyncClientTests(object):
+    """Asyncio client test cases."""
+
+    def test_executor_calls_are_awaitable(self, mocker):
+        """Test that executor client calls run off the loop and resolve to the client's results."""
+        import asyncio
+        import threading
+        from splitio.client.aio import ExecutorClient
+
+        loop_thread = []
+        client = mocker.Mock(spec=Client)
+
+        def get_treatment(*_):
+            loop_thread.append(threading.current_thread())
+            return 'on'
+        client.get_treatment.side_effect = get_treatment
+        client.get_treatments.return_value = {'f1': 'on', 'f2': 'off'}
+        client.track.return_value = True
+
+        async_client = ExecutorClient(client)
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            assert loop.run_until_complete(async_client.get_treatment('key', 'f1', {'a': 1})) == 'on'
+            assert loop.run_until_complete(async_client.get_treatments('key', ['f1', 'f2'])) == \
+                {'f1': 'on', 'f2': 'off'}
+            assert loop.run_until_complete(async_client.track('key', 'user', 'click', 1)) is True
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+        assert loop_thread[0] is not threading.current_thread()
+        assert client.get_treatment.mock_calls == [mocker.call('key', 'f1', {'a': 1})]
+        assert client.get_treatments.mock_calls == [mocker.call('key', ['f1', 'f2'], None)]
+        assert client.track.mock_calls == [mocker.call('key', 'user', 'click', 1, None)]
+
+    def test_async_factory(self, mocker):
+        """Test that the asyncio factory syncs, evaluates & flushes on the loop, without threads."""
+        import asyncio
+        import threading
+        from splitio.client import aio
+
+        http_client = _FakeAsyncHttpClient()
+        mocker.patch('splitio.client.aio.AsyncHttpClient', return_value=http_client)
+        threads = threading.active_count()
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            factory = loop.run_until_complete(aio.get_async_factory(
+                'some_api_key',
+                config={'impressionsMode': 'debug'}
+            ))
+            loop.run_until_complete(factory.block_until_ready(1))
+            assert factory.ready
+            client = factory.client()
+            assert loop.run_until_complete(client.get_treatment('key1', 'f1')) == 'on'
+            assert loop.run_until_complete(client.get_treatment('key2', 'f1')) == 'off'
+            assert loop.run_until_complete(client.track('key1', 'user', 'click', 1)) is True
+            assert threading.active_count() == threads
+
+            loop.run_until_complete(client.destroy())
+            assert factory.destroyed
+            assert http_client.closed
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+        impressions = http_client.posts['/testImpressions/bulk']
+        assert [(imp['keyName'], imp['treatment']) for imp in impressions[0]['keyImpressions']] \
+            == [('key1', 'on'), ('key2', 'off')]
+        assert [event['key'] for event in http_client.posts['/events/bulk']] == ['key1']
+
+    def test_async_factory_modes(self, mocker):
+        """Test that only the standalone mode is supported."""
+        import asyncio
+        from splitio.client import aio
+
+        loop = asyncio.new_event_loop()
+        try:
+            assert loop.run_until_complete(aio.get_async_factory('localhost')) is None
+            assert loop.run_until_complete(aio.get_async_factory(
+                'some_api_key',
+                config={'redisHost': 'localhost'}
+            )) is None
+        finally:
+            loop.close()
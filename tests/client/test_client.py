@@ -13,6 +13,7 @@ from splitio.storage import EventStorage, ImpressionStorage, SegmentStorage, Spl
 from splitio.storage.inmemmory import InMemorySplitStorage, InMemorySegmentStorage, \
     InMemoryImpressionStorage, InMemoryTelemetryStorage, InMemoryEventStorage
 from splitio.models import splits, segments
+from splitio.tasks.impressions_recorder import ImpressionsRecorderTask
 
 class ClientTests(object):  #pylint: disable=too-few-public-methods
     """Split client test cases."""
@@ -241,6 +242,82 @@ class ClientTests(object):  #pylint: disable=too-few-public-methods
         assert client.get_treatments('key', ['f1', 'f2']) == {'f1': 'control', 'f2': 'control'}
         assert len(telemetry_storage.inc_latency.mock_calls) == 2
 
+    def test_get_treatments_bulk(self, mocker):
+        """Test get_treatments_bulk execution paths."""
+        split_storage = mocker.Mock(spec=SplitStorage)
+        segment_storage = mocker.Mock(spec=SegmentStorage)
+        impression_storage = mocker.Mock(spec=ImpressionStorage)
+        event_storage = mocker.Mock(spec=EventStorage)
+        telemetry_storage = mocker.Mock(spec=TelemetryStorage)
+        def _get_storage_mock(name):
+            return {
+                'splits': split_storage,
+                'segments': segment_storage,
+                'impressions': impression_storage,
+                'events': event_storage,
+                'telemetry': telemetry_storage
+            }[name]
+
+        destroyed_property = mocker.PropertyMock()
+        destroyed_property.return_value = False
+
+        factory = mocker.Mock(spec=SplitFactory)
+        factory._get_storage.side_effect = _get_storage_mock
+        type(factory).destroyed = destroyed_property
+
+        mocker.patch('splitio.client.client.time.time', new=lambda: 1)
+        mocker.patch('splitio.client.client.get_latency_bucket_index', new=lambda x: 5)
+
+        client = Client(factory, True, None)
+        client._evaluator = mocker.Mock(spec=Evaluator)
+        client._evaluator.evaluate_features_bulk.return_value = {
+            'f1': {'treatments': ['on', 'off'], 'labels': ['l1', 'l2'], 'change_number': 123},
+            'f2': {'treatments': ['off', 'on'], 'labels': ['l3', 'l4'], 'change_number': 456}
+        }
+        client._logger = mocker.Mock()
+        client._send_impression_to_listener = mocker.Mock()
+
+        # Invalid keys get control and generate no impressions.
+        assert client.get_treatments_bulk(['k1', '', 'k2'], ['f1', 'f2']) == {
+            'f1': ['on', 'control', 'off'],
+            'f2': ['off', 'control', 'on']
+        }
+        assert client._evaluator.evaluate_features_bulk.mock_calls[0][1][1:] == \
+            (['k1', 'k2'], [None, None], None)
+        assert len(impression_storage.put.mock_calls) == 1
+        impressions_called = impression_storage.put.mock_calls[0][1][0]
+        assert len(impressions_called) == 4
+        assert Impression('k1', 'f1', 'on', 'l1', 123, None, 1000) in impressions_called
+        assert Impression('k2', 'f1', 'off', 'l2', 123, None, 1000) in impressions_called
+        assert Impression('k1', 'f2', 'off', 'l3', 456, None, 1000) in impressions_called
+        assert Impression('k2', 'f2', 'on', 'l4', 456, None, 1000) in impressions_called
+        assert telemetry_storage.inc_latency.mock_calls == [mocker.call('sdk.getTreatmentsBulk', 5)]
+        assert len(client._send_impression_to_listener.mock_calls) == 4
+
+        # Attributes must be aligned with the keys.
+        client._evaluator.evaluate_features_bulk.reset_mock()
+        assert client.get_treatments_bulk(['k1', 'k2'], ['f1'], [{}]) == {
+            'f1': ['control', 'control']
+        }
+        assert client._evaluator.evaluate_features_bulk.mock_calls == []
+
+        # Test with client not ready
+        ready_property = mocker.PropertyMock()
+        ready_property.return_value = False
+        type(factory).ready = ready_property
+        impression_storage.put.reset_mock()
+        assert client.get_treatments_bulk(['k1'], ['f1'], [{'a': 1}]) == {'f1': ['control']}
+        assert impression_storage.put.mock_calls == [mocker.call(
+            [Impression('k1', 'f1', 'control', Label.NOT_READY, None, None, 1000)]
+        )]
+
+        # Test with exception:
+        ready_property.return_value = True
+        def _raise(*_):
+            raise Exception('something')
+        client._evaluator.evaluate_features_bulk.side_effect = _raise
+        assert client.get_treatments_bulk(['k1', 'k2'], ['f1']) == {'f1': ['control', 'control']}
+
     def test_get_treatments_with_config(self, mocker):
         """Test get_treatment execution paths."""
         split_storage = mocker.Mock(spec=SplitStorage)
@@ -324,6 +401,54 @@ class ClientTests(object):  #pylint: disable=too-few-public-methods
         }
         assert len(telemetry_storage.inc_latency.mock_calls) == 2
 
+    def test_get_treatments_with_recorder(self, mocker):
+        """Test that impressions go through the recorder when one is set."""
+        split_storage = mocker.Mock(spec=SplitStorage)
+        segment_storage = mocker.Mock(spec=SegmentStorage)
+        impression_storage = mocker.Mock(spec=ImpressionStorage)
+        event_storage = mocker.Mock(spec=EventStorage)
+        telemetry_storage = mocker.Mock(spec=TelemetryStorage)
+        def _get_storage_mock(name):
+            return {
+                'splits': split_storage,
+                'segments': segment_storage,
+                'impressions': impression_storage,
+                'events': event_storage,
+                'telemetry': telemetry_storage
+            }[name]
+
+        destroyed_property = mocker.PropertyMock()
+        destroyed_property.return_value = False
+
+        factory = mocker.Mock(spec=SplitFactory)
+        factory._get_storage.side_effect = _get_storage_mock
+        type(factory).destroyed = destroyed_property
+
+        mocker.patch('splitio.client.client.time.time', new=lambda: 1)
+        mocker.patch('splitio.client.client.get_latency_bucket_index', new=lambda x: 5)
+
+        recorder = mocker.Mock(spec=ImpressionsRecorderTask)
+        client = Client(factory, True, None, impressions_recorder=recorder)
+        client._evaluator = mocker.Mock(spec=Evaluator)
+        client._evaluator.evaluate_feature.return_value = {
+            'treatment': 'on',
+            'configurations': None,
+            'impression': {
+                'label': 'some_label',
+                'change_number': 123
+            },
+        }
+        client._send_impression_to_listener = mocker.Mock()
+
+        assert client.get_treatment('some_key', 'some_feature', {'some_attribute': 1}) == 'on'
+        assert recorder.record.mock_calls == [mocker.call(
+            [Impression('some_key', 'some_feature', 'on', 'some_label', 123, None, 1000)],
+            [{'some_attribute': 1}]
+        )]
+        assert impression_storage.put.mock_calls == []
+        assert client._send_impression_to_listener.mock_calls == []
+        assert mocker.call('sdk.getTreatment', 5) in telemetry_storage.inc_latency.mock_calls
+
     def test_destroy(self, mocker):
         """Test that destroy/destroyed calls are forwarded to the factory."""
         split_storage = mocker.Mock(spec=SplitStorage)
@@ -4,11 +4,17 @@
 
 import time
 import threading
+
+import pytest
+
 from splitio.client.listener import ImpressionListenerWrapper
-from splitio.client.factory import get_factory, SplitFactory, _INSTANTIATED_FACTORIES
+from splitio.client.factory import get_factory, SplitFactory, _INSTANTIATED_FACTORIES, \
+    TimeoutException
 from splitio.client.config import DEFAULT_CONFIG
 from splitio.storage import redis, inmemmory, uwsgi
-from splitio.tasks import events_sync, impressions_sync, split_sync, segment_sync, telemetry_sync
+from splitio.storage.mmap_snapshot import write_snapshot
+from splitio.tasks import events_sync, impressions_sync, split_sync, segment_sync, telemetry_sync, \
+    snapshot_sync
 from splitio.tasks.util import asynctask, workerpool
 from splitio.api.splits import SplitsAPI
 from splitio.api.segments import SegmentsAPI
@@ -31,7 +37,9 @@ class SplitFactoryTests(object):
             self._event = event
             event.set()
         mocker.patch('splitio.client.factory.SplitSynchronizationTask.__init__', new=_split_task_init_mock)
-        def _segment_task_init_mock(self, api, storage, split_storage, period, event):
+        def _segment_task_init_mock(self, api, storage, split_storage, period, event,
+                                    worker_pool_size=20, max_period=None, request_budget=0,
+                                    telemetry_storage=None):
             self._task = mocker.Mock()
             self._worker_pool = mocker.Mock()
             self._api = api
@@ -84,12 +92,59 @@ class SplitFactoryTests(object):
         assert factory._tasks['telemetry']._period == DEFAULT_CONFIG['metricsRefreshRate']
         assert factory._tasks['telemetry']._storage == factory._storages['telemetry']
         assert factory._tasks['telemetry']._api == factory._apis['telemetry']
+        assert 'impressions_count' not in factory._tasks
         assert factory._labels_enabled is True
         factory.block_until_ready()
         time.sleep(1) # give a chance for the bg thread to set the ready status
         assert factory.ready
         factory.destroy()
 
+    def test_optimized_impressions_mode(self, mocker):
+        """Test that impression counts are only synchronized in optimized mode."""
+        def _split_task_init_mock(self, api, storage, period, event):
+            self._task = mocker.Mock()
+            event.set()
+        mocker.patch('splitio.client.factory.SplitSynchronizationTask.__init__', new=_split_task_init_mock)
+        def _segment_task_init_mock(self, api, storage, split_storage, period, event,
+                                    worker_pool_size=20, max_period=None, request_budget=0,
+                                    telemetry_storage=None):
+            self._task = mocker.Mock()
+            self._worker_pool = mocker.Mock()
+            event.set()
+        mocker.patch('splitio.client.factory.SegmentSynchronizationTask.__init__', new=_segment_task_init_mock)
+
+        factory = get_factory('some_api_key', config={'impressionsMode': 'optimized'})
+        task = factory._tasks['impressions_count']
+        assert isinstance(task, impressions_sync.ImpressionsCountSyncTask)
+        assert task.is_running()
+        factory.destroy()
+
+    def test_snapshot_client_creation(self, tmpdir):
+        """Test that snapshot factories are ready once the first snapshot is loaded."""
+        path = str(tmpdir.join('split.snapshot'))
+        factory = get_factory('some_api_key', config={
+            'snapshotReadPath': path,
+            'snapshotCheckInterval': 0.1
+        })
+        assert isinstance(factory._tasks['snapshot'], snapshot_sync.SnapshotLoaderTask)
+        assert not factory.ready
+        with pytest.raises(TimeoutException):
+            factory.block_until_ready(0.3)
+
+        write_snapshot(path, inmemmory.InMemorySplitStorage(), inmemmory.InMemorySegmentStorage())
+        factory.block_until_ready(5)
+        time.sleep(0.1)
+        assert factory.ready
+
+        destroyed_event = threading.Event()
+        factory.destroy(destroyed_event)
+        assert destroyed_event.wait(5)
+
+        assert get_factory('some_api_key', config={
+            'snapshotReadPath': path,
+            'segmentsCompactVerify': True
+        }) is None
+
     def test_redis_client_creation(self, mocker):
         """Test that a client with redis storage is created correctly."""
         strict_redis_mock = mocker.Mock()
@@ -171,21 +226,40 @@ class SplitFactoryTests(object):
 
     def test_uwsgi_client_creation(self):
         """Test that a client with redis storage is created correctly."""
-        factory = get_factory('some_api_key', config={'uwsgiClient': True})
+        factory = get_factory('some_api_key', config={
+            'uwsgiClient': True,
+            'uwsgiImpressionsSlotsPerWorker': 50
+        })
         assert isinstance(factory._get_storage('splits'), uwsgi.UWSGISplitStorage)
         assert isinstance(factory._get_storage('segments'), uwsgi.UWSGISegmentStorage)
         assert isinstance(factory._get_storage('impressions'), uwsgi.UWSGIImpressionStorage)
+        assert factory._get_storage('impressions')._slots_per_lane == 50
         assert isinstance(factory._get_storage('events'), uwsgi.UWSGIEventStorage)
         assert isinstance(factory._get_storage('telemetry'), uwsgi.UWSGITelemetryStorage)
         assert factory._apis == {}
         assert factory._tasks == {}
         assert factory._labels_enabled is True
         assert factory._impression_listener is None
+        assert factory._impressions_recorder is None
         factory.block_until_ready()
         time.sleep(1) # give a chance for the bg thread to set the ready status
         assert factory.ready
         factory.destroy()
 
+    def test_impressions_recorder(self):
+        """Test that the impressions recorder is built when enabled and stopped on destroy."""
+        factory = get_factory('some_api_key', config={
+            'uwsgiClient': True,
+            'impressionsRecorderEnabled': True
+        })
+        recorder = factory._impressions_recorder
+        assert not recorder.is_running()
+        assert factory.client()._impressions_recorder is recorder
+        recorder.record([], [])
+        assert recorder.is_running()
+        factory.destroy()
+        assert not recorder.is_running()
+
     def test_destroy(self, mocker):
         """Test that tasks are shutdown and data is flushed when destroy is called."""
         def _split_task_init_mock(self, api, storage, period, event):
@@ -197,7 +271,9 @@ class SplitFactoryTests(object):
             event.set()
         mocker.patch('splitio.client.factory.SplitSynchronizationTask.__init__', new=_split_task_init_mock)
 
-        def _segment_task_init_mock(self, api, storage, split_storage, period, event):
+        def _segment_task_init_mock(self, api, storage, split_storage, period, event,
+                                    worker_pool_size=20, max_period=None, request_budget=0,
+                                    telemetry_storage=None):
             self._task = mocker.Mock()
             self._worker_pool = mocker.Mock()
             self._api = api
@@ -256,7 +332,9 @@ class SplitFactoryTests(object):
 
         sgm_async_task_mock = mocker.Mock(spec=asynctask.AsyncTask)
         worker_pool_mock = mocker.Mock(spec=workerpool.WorkerPool)
-        def _segment_task_init_mock(self, api, storage, split_storage, period, event):
+        def _segment_task_init_mock(self, api, storage, split_storage, period, event,
+                                    worker_pool_size=20, max_period=None, request_budget=0,
+                                    telemetry_storage=None):
             self._task = sgm_async_task_mock
             self._worker_pool = worker_pool_mock
             self._api = api
@@ -290,7 +368,7 @@ class SplitFactoryTests(object):
         mocker.patch('splitio.client.factory.EventsSyncTask.__init__', new=_event_task_init_mock)
 
         tmt_async_task_mock = mocker.Mock(spec=asynctask.AsyncTask)
-        def _telemetry_task_init_mock(self, api, storage, refresh_rate):
+        def _telemetry_task_init_mock(self, api, storage, refresh_rate, http_client=None):
             self._task = tmt_async_task_mock
             self._logger = mocker.Mock()
             self._api = api
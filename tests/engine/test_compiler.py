@@ -0,0 +1,172 @@
+"""Split compiler tests module."""
+#pylint: disable=no-self-use,protected-access
+import json
+import os
+
+from splitio.engine import compiler, evaluator, splitters
+from splitio.models import splits, segments
+from splitio.models.impressions import Label
+from splitio.storage.inmemmory import InMemorySplitStorage, InMemorySegmentStorage
+
+
+def _raw_rollout_split(name='rollout_feature', traffic_allocation=50, algo=2):
+    """Build a raw split with a whitelist condition and a partitioned rollout."""
+    return {
+        'name': name,
+        'seed': 1234,
+        'killed': False,
+        'defaultTreatment': 'off',
+        'trafficTypeName': 'user',
+        'status': 'ACTIVE',
+        'changeNumber': 10,
+        'algo': algo,
+        'trafficAllocation': traffic_allocation,
+        'trafficAllocationSeed': 4321,
+        'conditions': [
+            {
+                'conditionType': 'WHITELIST',
+                'label': 'whitelisted',
+                'matcherGroup': {
+                    'combiner': 'AND',
+                    'matchers': [{
+                        'matcherType': 'WHITELIST',
+                        'negate': False,
+                        'whitelistMatcherData': {'whitelist': ['vip']}
+                    }]
+                },
+                'partitions': [{'treatment': 'on', 'size': 100}]
+            },
+            {
+                'conditionType': 'ROLLOUT',
+                'label': 'in segment all',
+                'matcherGroup': {
+                    'combiner': 'AND',
+                    'matchers': [{
+                        'matcherType': 'ALL_KEYS',
+                        'negate': False
+                    }]
+                },
+                'partitions': [
+                    {'treatment': 'on', 'size': 33},
+                    {'treatment': 'off', 'size': 33},
+                    {'treatment': 'v3', 'size': 34}
+                ]
+            }
+        ]
+    }
+
+
+class SplitCompilerTests(object):
+    """Split compiler test cases."""
+
+    def _build_evaluator(self, split_storage):
+        """Build an evaluator with in-memory storages loaded from the integration files."""
+        segment_storage = InMemorySegmentStorage()
+        base = os.path.join(os.path.dirname(__file__), '..', 'integration', 'files')
+        for name in ['segmentEmployeesChanges.json', 'segmentHumanBeignsChanges.json']:
+            with open(os.path.join(base, name), 'r') as flo:
+                segment_storage.put(segments.from_raw(json.loads(flo.read())))
+        return evaluator.Evaluator(split_storage, segment_storage, splitters.Splitter())
+
+    def test_compile_attaches_plan(self):
+        """Test that compiling a split attaches the plan and storage compiles on put."""
+        split = splits.from_raw(_raw_rollout_split())
+        assert getattr(split, '_evaluation_plan', None) is None
+        plan = compiler.compile_split(split)
+        assert isinstance(plan, compiler.EvaluationPlan)
+        assert split._evaluation_plan is plan
+        assert not plan.needs_bucketing_key
+
+        storage = InMemorySplitStorage()
+        other = splits.from_raw(_raw_rollout_split('other'))
+        storage.put(other)
+        assert isinstance(other._evaluation_plan, compiler.EvaluationPlan)
+
+    def test_plan_matches_condition_walk(self):
+        """Test that compiled evaluations yield the same results as walking conditions."""
+        split_fn = os.path.join(
+            os.path.dirname(__file__), '..', 'integration', 'files', 'splitChanges.json'
+        )
+        with open(split_fn, 'r') as flo:
+            raw_splits = json.loads(flo.read())['splits']
+        raw_splits.append(_raw_rollout_split('rollout_murmur', 50, 2))
+        raw_splits.append(_raw_rollout_split('rollout_legacy', 75, 1))
+        raw_splits.append(_raw_rollout_split('rollout_full', 100, 2))
+
+        compiled_storage = InMemorySplitStorage()
+        plain_storage = InMemorySplitStorage()
+        plain_storage._compile = lambda split: None
+        for raw in raw_splits:
+            compiled_storage.put(splits.from_raw(raw))
+            plain_storage.put(splits.from_raw(raw))
+
+        compiled = self._build_evaluator(compiled_storage)
+        plain = self._build_evaluator(plain_storage)
+        keys = ['vip', 'employee_1', 'human_1', 'whitelisted_user', 'abc'] + \
+            ['key_%d' % i for i in range(300)]
+        attributes = {'boolean_attribute': True, 'some_attribute': 'abc'}
+        for raw in raw_splits:
+            assert compiled_storage.get(raw['name'])._evaluation_plan is not None
+            assert getattr(plain_storage.get(raw['name']), '_evaluation_plan', None) is None
+            for key in keys:
+                assert compiled.evaluate_feature(raw['name'], key, None, attributes) == \
+                    plain.evaluate_feature(raw['name'], key, None, attributes)
+                assert compiled.evaluate_feature(raw['name'], key, 'bucket', None) == \
+                    plain.evaluate_feature(raw['name'], key, 'bucket', None)
+
+    def test_evaluate_many(self):
+        """Test that bulk evaluations yield the same results as single-key evaluations."""
+        split_fn = os.path.join(
+            os.path.dirname(__file__), '..', 'integration', 'files', 'splitChanges.json'
+        )
+        with open(split_fn, 'r') as flo:
+            raw_splits = json.loads(flo.read())['splits']
+        raw_splits.append(_raw_rollout_split('rollout_murmur', 50, 2))
+        raw_splits.append(_raw_rollout_split('rollout_legacy', 75, 1))
+
+        storage = InMemorySplitStorage()
+        for raw in raw_splits:
+            storage.put(splits.from_raw(raw))
+        split_evaluator = self._build_evaluator(storage)
+
+        features = [raw['name'] for raw in raw_splits] + ['non_existant']
+        keys = ['vip', 'employee_1', 'human_1', 'whitelisted_user', 'abc'] + \
+            ['key_%d' % i for i in range(300)]
+        bucketing_keys = [None if index % 2 else 'bucket_%d' % index for index in range(len(keys))]
+        attributes = [{'boolean_attribute': bool(index % 3), 'some_attribute': 'abc'}
+                      for index in range(len(keys))]
+        result = split_evaluator.evaluate_features_bulk(features, keys, bucketing_keys, attributes)
+        assert set(result.keys()) == set(features)
+        for feature in features:
+            for index, key in enumerate(keys):
+                expected = split_evaluator.evaluate_feature(
+                    feature, key, bucketing_keys[index], attributes[index]
+                )
+                assert result[feature]['treatments'][index] == expected['treatment']
+                assert result[feature]['labels'][index] == expected['impression']['label']
+                assert result[feature]['change_number'] == \
+                    expected['impression']['change_number']
+
+    def test_traffic_allocation(self, mocker):
+        """Test that the traffic allocation check is done before the first rollout condition."""
+        split = splits.from_raw(_raw_rollout_split())
+        plan = compiler.compile_split(split)
+        splitter = mocker.Mock(spec=splitters.Splitter)
+        splitter.get_bucket.return_value = 60
+
+        # whitelisted keys don't go through traffic allocation
+        assert plan.evaluate(splitter, 'vip', 'vip', None, {}) == ('on', 'whitelisted')
+        assert splitter.get_bucket.mock_calls == []
+
+        assert plan.evaluate(splitter, 'key', 'key', None, {}) == ('off', Label.NOT_IN_SPLIT)
+        assert splitter.get_bucket.mock_calls == [
+            mocker.call('key', 4321, splits.HashAlgorithm.MURMUR)
+        ]
+
+        splitter.get_bucket.reset_mock()
+        splitter.get_bucket.return_value = 40
+        assert plan.evaluate(splitter, 'key', 'key', None, {}) == ('off', 'in segment all')
+        assert splitter.get_bucket.mock_calls == [
+            mocker.call('key', 4321, splits.HashAlgorithm.MURMUR),
+            mocker.call('key', 1234, splits.HashAlgorithm.MURMUR)
+        ]
@@ -94,6 +94,7 @@ class EvaluatorTests(object):
         mocked_split.killed = False
         mocked_split.change_number = 123
         mocked_split.get_configurations_for.return_value = '{"some_property": 123}'
+        mocked_split.conditions = []
         e._split_storage.fetch_many.return_value = {
             'feature1': None,
             'feature2': mocked_split,
@@ -110,6 +111,56 @@ class EvaluatorTests(object):
         assert result['impression']['change_number'] == 123
         assert result['impression']['label'] == 'some_label'
 
+    def test_evaluate_treatments_prefetches_segments(self, mocker):
+        """Test that segment memberships are fetched at once and passed to the matchers."""
+        e = self._build_evaluator_with_mocks(mocker)
+        e._segment_storage.batches_membership_checks = True
+        e._get_treatment_for_split = mocker.Mock()
+        e._get_treatment_for_split.return_value = ('on', 'some_label')
+        mocked_condition_1 = mocker.Mock(spec=Condition)
+        mocked_condition_1.get_segment_names.return_value = ['segment1', 'segment2']
+        mocked_condition_2 = mocker.Mock(spec=Condition)
+        mocked_condition_2.get_segment_names.return_value = ['segment2']
+        mocked_split = mocker.Mock(spec=Split)
+        mocked_split.killed = False
+        mocked_split.conditions = [mocked_condition_1, mocked_condition_2]
+        killed_split = mocker.Mock(spec=Split)
+        killed_split.killed = True
+        killed_split.default_treatment = 'off'
+        killed_split.conditions = [mocked_condition_1]
+        e._split_storage.fetch_many.return_value = {
+            'feature1': mocked_split,
+            'feature2': killed_split,
+            'feature3': None
+        }
+        e._segment_storage.segment_contains_many.return_value = {
+            'segment1': True,
+            'segment2': False
+        }
+        e.evaluate_features(['feature1', 'feature2', 'feature3'], 'some_key', None, None)
+        assert e._segment_storage.segment_contains_many.mock_calls == [
+            mocker.call(set(['segment1', 'segment2']), 'some_key')
+        ]
+        context = e._get_treatment_for_split.mock_calls[0][1][4]
+        assert context['segment_memberships'] == {
+            ('segment1', 'some_key'): True,
+            ('segment2', 'some_key'): False
+        }
+        assert context['segment_storage'] is e._segment_storage
+
+        # No segments, no prefetch.
+        mocked_split.conditions = []
+        e._segment_storage.segment_contains_many.reset_mock()
+        e.evaluate_features(['feature1'], 'some_key', None, None)
+        assert e._segment_storage.segment_contains_many.mock_calls == []
+
+        # Storages that don't batch lookups are queried lazily.
+        mocked_split.conditions = [mocked_condition_1]
+        e._segment_storage.batches_membership_checks = False
+        e.evaluate_features(['feature1'], 'some_key', None, None)
+        assert e._segment_storage.segment_contains_many.mock_calls == []
+        assert 'segment_memberships' not in e._get_treatment_for_split.mock_calls[-1][1][4]
+
     def test_get_gtreatment_for_split_no_condition_matches(self, mocker):
         """Test no condition matches."""
         e = self._build_evaluator_with_mocks(mocker)
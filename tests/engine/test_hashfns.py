@@ -87,3 +87,29 @@ class HashFunctionsTests(object):
             hashed = int(hashed)
             assert hashfns._murmur_hash(key, seed) == hashed
             assert splitter.get_bucket(key, seed, splits.HashAlgorithm.MURMUR) == bucket
+
+    def test_hash_many(self, mocker):
+        """Test that batched hashes and buckets match the scalar functions bit for bit."""
+        samples = []
+        base = os.path.join(os.path.dirname(__file__), 'files')
+        for name in ['sample-data.jsonl', 'sample-data-non-alpha-numeric.jsonl']:
+            with io.open(os.path.join(base, name), 'r', encoding='utf-8') as flo:
+                samples.extend(json.loads(line) for line in flo.read().split('\n')[:300] if line)
+        with io.open(os.path.join(base, 'murmur3-custom-uuids.csv'), 'r', encoding='utf-8') as flo:
+            samples.extend(line.split(',') for line in flo.read().split('\n')[:300] if line)
+
+        keys = [six.text_type(sample[1]) for sample in samples] + ['', 'a', 'ab', 'abc', 'abcd']
+        splitter = splitters.Splitter()
+        for use_numpy in [True, False]:
+            if not use_numpy:
+                mocker.patch('splitio.engine.hashfns.numpy', new=None)
+                mocker.patch('splitio.engine.hashfns.legacy.numpy', new=None)
+                mocker.patch('splitio.engine.hashfns.murmur3py.numpy', new=None)
+            for seed in [0, -275728571, 2147483647, -2147483648]:
+                for algo in [splits.HashAlgorithm.LEGACY, splits.HashAlgorithm.MURMUR]:
+                    hashfn = hashfns.get_hash_fn(algo)
+                    assert list(hashfns.hash_many(keys, seed, algo)) == \
+                        [hashfn(key, seed) for key in keys]
+                    assert list(hashfns.buckets_many(keys, seed, algo)) == \
+                        [splitter.get_bucket(key, seed, algo) for key in keys]
+            assert list(hashfns.hash_many([], 1, splits.HashAlgorithm.MURMUR)) == []
@@ -0,0 +1,43 @@
+"""Impressions manager test module."""
+
+from splitio.engine.impressions import Manager, Counter, ImpressionsMode, truncate_time_frame
+from splitio.models.impressions import Impression, ImpressionCount
+
+
+class ImpressionsManagerTests(object):
+    """Impressions manager test cases."""
+
+    def test_truncate_time_frame(self):
+        """Test that timestamps are truncated to the start of the hour."""
+        assert truncate_time_frame(0) == 0
+        assert truncate_time_frame(3599999) == 0
+        assert truncate_time_frame(3600000) == 3600000
+        assert truncate_time_frame(7300000) == 7200000
+
+    def test_debug_mode(self):
+        """Test that every impression is stored in debug mode."""
+        imp = Impression('k1', 'f1', 'on', 'l1', 123, None, 3600001)
+        manager = Manager()
+        assert manager.process_impressions([imp, imp]) == [imp, imp]
+
+    def test_optimized_mode(self):
+        """Test that repeated impressions within the hour are counted instead of stored."""
+        counter = Counter()
+        manager = Manager(ImpressionsMode.OPTIMIZED, counter, 2)
+        imp1 = Impression('k1', 'f1', 'on', 'l1', 123, None, 3600001)
+        imp2 = Impression('k1', 'f1', 'on', 'l1', 123, None, 3600002)
+        imp3 = Impression('k1', 'f1', 'off', 'l1', 123, None, 3600003)
+        imp4 = Impression('k1', 'f1', 'on', 'l1', 123, None, 7200001)
+        assert manager.process_impressions([imp1, imp2, imp3]) == [imp1, imp3]
+        assert manager.process_impressions([imp2]) == []
+
+        # Next hour, the impression is stored again.
+        assert manager.process_impressions([imp4]) == [imp4]
+        assert counter.pop_all() == [ImpressionCount('f1', 3600000, 2)]
+        assert counter.pop_all() == []
+
+        # Observer is bounded: evicted impressions are stored again.
+        imp5 = Impression('k2', 'f1', 'on', 'l1', 123, None, 7200002)
+        imp6 = Impression('k3', 'f1', 'on', 'l1', 123, None, 7200003)
+        imp7 = Impression('k1', 'f1', 'on', 'l1', 123, None, 7200004)
+        assert manager.process_impressions([imp5, imp6, imp7]) == [imp5, imp6, imp7]
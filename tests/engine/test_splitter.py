@@ -2,6 +2,7 @@
 
 from splitio.models.grammar.partitions import Partition
 from splitio.engine.splitters import Splitter, CONTROL
+from splitio.storage import TelemetryStorage
 
 
 class SplitterTests(object):
@@ -43,9 +44,47 @@ class SplitterTests(object):
         assert splitter.get_treatment_for_bucket(50, [Partition('a', 50), Partition('b', 50)]) == 'a'
         assert splitter.get_treatment_for_bucket(51, [Partition('a', 50), Partition('b', 50)]) == 'b'
 
+    def test_get_buckets(self, mocker):
+        """Test that batched buckets match the ones calculated one key at a time."""
+        splitter = Splitter()
+        keys = ['key_%d' % i for i in range(200)]
+        table = (None,) + tuple('t%d' % (bucket % 3) for bucket in range(1, 101))
+        for algo in [1, 2]:
+            expected = [splitter.get_bucket(key, 123, algo) for key in keys]
+            buckets = splitter.get_buckets(keys, 123, algo)
+            assert list(buckets) == expected
+            assert splitter.get_treatments_for_buckets(buckets, table) == \
+                [table[bucket] for bucket in expected]
 
+            mocker.patch('splitio.engine.splitters.numpy', new=None)
+            mocker.patch('splitio.engine.hashfns.numpy', new=None)
+            buckets = splitter.get_buckets(keys, 123, algo)
+            assert buckets == expected
+            assert splitter.get_treatments_for_buckets(buckets, table) == \
+                [table[bucket] for bucket in expected]
+            mocker.stopall()
 
+    def test_bucket_cache(self, mocker):
+        """Test that buckets are memoized and cache stats are reported."""
+        telemetry_storage = mocker.Mock(spec=TelemetryStorage)
+        splitter = Splitter(2, telemetry_storage)
+        splitter._cache._report_interval = 4
+        calculate = mocker.Mock(wraps=Splitter._calculate_bucket)
+        splitter._calculate_bucket = calculate
 
+        expected = Splitter().get_bucket('key1', 123, 2)
+        assert splitter.get_bucket('key1', 123, 2) == expected
+        assert splitter.get_bucket('key1', 123, 2) == expected
+        assert calculate.mock_calls == [mocker.call('key1', 123, 2)]
 
-
-
+        # different seed is a different entry, and evicts the LRU when the cache is full.
+        splitter.get_bucket('key1', 456, 2)
+        assert telemetry_storage.put_gauge.mock_calls == []
+        splitter.get_bucket('key2', 123, 2)
+        assert telemetry_storage.put_gauge.mock_calls == [
+            mocker.call('splitter.bucketCache.size', 2),
+            mocker.call('splitter.bucketCache.hitRate', 25)
+        ]
+        splitter.get_bucket('key1', 123, 2)
+        assert calculate.mock_calls[-1] == mocker.call('key1', 123, 2)
+        assert len(calculate.mock_calls) == 4
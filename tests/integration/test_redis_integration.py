@@ -78,6 +78,46 @@ class SplitStorageTests(object):
             assert storage.is_valid_traffic_type('user') is False
             assert storage.is_valid_traffic_type('account') is False
 
+    def test_split_names_index(self):
+        """Test that split names are read from the index once it's built."""
+        adapter = _build_default_client({})
+        try:
+            storage = RedisSplitStorage(adapter)
+            with open(os.path.join(os.path.dirname(__file__), 'files', 'split_changes.json'), 'r') as flo:
+                split_changes = json.load(flo)
+
+            for raw in split_changes['splits']:
+                adapter.set(RedisSplitStorage._SPLIT_KEY.format(split_name=raw['name']), json.dumps(raw))
+            adapter.set(RedisSplitStorage._SPLIT_TILL_KEY, split_changes['till'])
+            names = set(raw['name'] for raw in split_changes['splits'])
+            assert set(storage.get_split_names()) == names
+
+            assert RedisSplitStorage.build_split_names_index(adapter) == len(names)
+            assert set(adapter.smembers(RedisSplitStorage._SPLIT_NAMES_KEY)) == names
+
+            # A split written without updating the index is only seen once the index is stale.
+            adapter.set(RedisSplitStorage._SPLIT_KEY.format(split_name='unindexed'), json.dumps(split_changes['splits'][0]))
+            assert set(storage.get_split_names()) == names
+            assert set(split.name for split in storage.get_all_splits()) == names
+
+            adapter.set(RedisSplitStorage._SPLIT_TILL_KEY, split_changes['till'] + 1)
+            assert set(storage.get_split_names()) == names.union(['unindexed'])
+        finally:
+            adapter.delete(
+                'SPLITIO.split.sample_feature',
+                'SPLITIO.splits.till',
+                'SPLITIO.splits.names',
+                'SPLITIO.splits.names.till',
+                'SPLITIO.split.unindexed',
+                'SPLITIO.split.all_feature',
+                'SPLITIO.split.killed_feature',
+                'SPLITIO.split.Risk_Max_Deductible',
+                'SPLITIO.split.whitelist_feature',
+                'SPLITIO.split.regex_test',
+                'SPLITIO.split.boolean_test',
+                'SPLITIO.split.dependency_test'
+            )
+
     def test_get_all(self):
         """Test get all names & splits."""
         adapter = _build_default_client({})
@@ -413,6 +413,17 @@ class UserDefinedSegmentMatcherTests(MatcherTestsBase):
             mocker.call('some_segment', 'some_key')
         ]
 
+        # Prefetched memberships are used when present for the segment & key.
+        context = {
+            'segment_storage': segment_storage,
+            'segment_memberships': {('some_segment', 'some_key'): True}
+        }
+        assert matcher.evaluate('some_key', {}, context) is True
+        assert matcher.evaluate('other_key', {}, context) is False
+        assert segment_storage.segment_contains.mock_calls[2:] == [
+            mocker.call('some_segment', 'other_key')
+        ]
+
         assert matcher.evaluate([], {}, {'segment_storage': segment_storage}) is False
         assert matcher.evaluate({}, {}, {'segment_storage': segment_storage}) is False
         assert matcher.evaluate(123, {}, {'segment_storage': segment_storage}) is False
@@ -0,0 +1,57 @@
+"""Segment model tests module."""
+
+from splitio.models.segments import Segment, CompactSegment
+
+
+class CompactSegmentTests(object):
+    """Compact segment model tests."""
+
+    def test_contains_and_update(self):
+        """Test lookups before and after applying deltas, with and without verification."""
+        keys = ['key%d' % index for index in range(1000)]
+        for verify in [False, True]:
+            segment = CompactSegment('some_segment', keys + ['key1'], 123, verify)
+            assert len(segment) == 1000
+            assert segment.name == 'some_segment'
+            assert segment.change_number == 123
+            assert all(segment.contains(key) for key in keys)
+            assert not segment.contains('key1000')
+
+            segment.update(['key1000', 'key2'], ['key1', 'unknown'])
+            assert len(segment) == 1000
+            assert segment.contains('key1000')
+            assert segment.contains('key2')
+            assert not segment.contains('key1')
+
+    def test_overlay_compaction(self, mocker):
+        """Test that deltas are kept in the overlay until it's merged into the arrays."""
+        mocker.patch('splitio.models.segments.CompactSegment._MIN_OVERLAY_SIZE', new=4)
+        keys = ['key%d' % index for index in range(10)]
+        for verify in [False, True]:
+            segment = CompactSegment('some_segment', keys, 123, verify)
+            hashes = segment.hashes
+            segment.update(['key10', u'árbol'], ['key0', 'key11'])
+            assert segment.hashes is not hashes
+            assert segment._data[0] is hashes
+            assert len(segment) == 11
+            assert segment.contains(u'árbol')
+            assert not segment.contains('key0')
+
+            segment.update(['key0', 'key12'], ['key1', 'key2'])
+            assert segment._data[3] == frozenset()
+            assert segment._data[4] == frozenset()
+            assert len(segment) == 11
+            assert sorted(segment.hashes) == list(segment.hashes)
+            expected = ['key%d' % index for index in range(3, 11)] + ['key0', 'key12', u'árbol']
+            assert all(segment.contains(key) for key in expected)
+            assert not any(segment.contains(key) for key in ['key1', 'key2', 'key11'])
+            assert segment.hashes == CompactSegment('other', expected, 123, verify).hashes
+
+    def test_verification(self, mocker):
+        """Test that hash collisions are only detected when verifying."""
+        mocker.patch('splitio.models.segments._hash_key', new=lambda encoded: len(encoded))
+        assert CompactSegment('some_segment', ['abc'], 123).contains('xyz')
+        segment = CompactSegment('some_segment', ['abc', 'def'], 123, True)
+        assert segment.contains('def')
+        assert not segment.contains('xyz')
+        assert len(Segment('some_segment', ['abc', 'def'], 123)) == 2
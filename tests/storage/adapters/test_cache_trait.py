@@ -130,3 +130,44 @@ class  CacheTraitTests(object):
         assert cache_trait.decorate(key_func, 0, 10)(user_func) is user_func
         assert cache_trait.decorate(key_func, 10, 0)(user_func) is user_func
         assert cache_trait.decorate(key_func, 0, 0)(user_func) is user_func
+
+    def test_versioned_cache(self, mocker):
+        """Test that the versioned cache only drops items when the version changes."""
+        fetch = mocker.Mock()
+        fetch.side_effect = lambda keys: {key: len(key) for key in keys if key != 'failing'}
+        cache = cache_trait.VersionedLocalCache()
+
+        assert cache.get_many('1', ['a', 'bb'], fetch) == {'a': 1, 'bb': 2}
+        assert fetch.mock_calls == [mocker.call(['a', 'bb'])]
+
+        fetch.reset_mock()
+        assert cache.get_many('1', ['a', 'ccc', 'failing'], fetch) == {'a': 1, 'ccc': 3}
+        assert fetch.mock_calls == [mocker.call(['ccc', 'failing'])]
+
+        # items not returned by the fetch function are not cached
+        fetch.reset_mock()
+        assert cache.get_many('1', ['bb', 'failing'], fetch) == {'bb': 2}
+        assert fetch.mock_calls == [mocker.call(['failing'])]
+
+        fetch.reset_mock()
+        assert cache.get_many('2', ['a'], fetch) == {'a': 1}
+        assert fetch.mock_calls == [mocker.call(['a'])]
+        assert cache._data.pop_stats()[0] == 1
+
+        cache.clear()
+        assert cache._data.pop_stats()[0] == 0
+        assert cache._version is None
+
+    def test_versioned_cache_bounds(self, mocker):
+        """Test that the versioned cache is bounded and doesn't keep misses."""
+        fetch = mocker.Mock()
+        fetch.side_effect = lambda keys: {key: None if key == 'missing' else key for key in keys}
+        cache = cache_trait.VersionedLocalCache(2)
+
+        assert cache.get_many('1', ['a', 'b', 'c', 'missing'], fetch) == \
+            {'a': 'a', 'b': 'b', 'c': 'c', 'missing': None}
+        assert cache._data.pop_stats()[0] == 2
+
+        fetch.reset_mock()
+        assert cache.get_many('1', ['c', 'missing'], fetch) == {'c': 'c', 'missing': None}
+        assert fetch.mock_calls == [mocker.call(['missing'])]
@@ -17,6 +17,10 @@ class RedisStorageAdapterTests(object):
         adapter.keys('*')
         assert redis_mock.keys.mock_calls[0] == mocker.call('some_prefix.*')
 
+        redis_mock.scan_iter.return_value = iter([b'some_prefix.key1', 'some_prefix.key2'])
+        assert list(adapter.scan_iter('*', 10)) == ['key1', 'key2']
+        assert redis_mock.scan_iter.mock_calls[0] == mocker.call(match='some_prefix.*', count=10)
+
         adapter.set('key1', 'value1')
         assert redis_mock.set.mock_calls[0] == mocker.call('some_prefix.key1', 'value1')
 
@@ -69,6 +73,28 @@ class RedisStorageAdapterTests(object):
         adapter.ttl('key1')
         assert redis_mock.ttl.mock_calls[0] == mocker.call('some_prefix.key1')
 
+    def test_pipeline(self, mocker):
+        """Test that pipelined commands are prefixed, sent together and post-processed."""
+        redis_mock = mocker.Mock(StrictRedis)
+        pipeline_mock = mocker.Mock()
+        redis_mock.pipeline.return_value = pipeline_mock
+        pipeline_mock.execute.return_value = [b'value1', set([b'm1']), 1, True]
+        adapter = redis.RedisAdapter(redis_mock, 'some_prefix')
+
+        pipeline = adapter.pipeline()
+        assert redis_mock.pipeline.mock_calls == [mocker.call(transaction=False)]
+        result = pipeline.get('key1').smembers('s1').rpush('key2', 'v1').sismember('s1', 'm1') \
+            .execute()
+        assert result == ['value1', ['m1'], 1, True]
+        assert pipeline_mock.get.mock_calls == [mocker.call('some_prefix.key1')]
+        assert pipeline_mock.smembers.mock_calls == [mocker.call('some_prefix.s1')]
+        assert pipeline_mock.rpush.mock_calls == [mocker.call('some_prefix.key2', 'v1')]
+        assert pipeline_mock.sismember.mock_calls == [mocker.call('some_prefix.s1', 'm1')]
+
+        pipeline_mock.execute.side_effect = redis.RedisError('something')
+        with pytest.raises(redis.RedisAdapterException):
+            pipeline.get('key1').execute()
+
     def test_adapter_building(self, mocker):
         """Test buildin different types of client according to parameters received."""
         strict_redis_mock = mocker.Mock(spec=StrictRedis)
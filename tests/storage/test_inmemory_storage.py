@@ -1,7 +1,7 @@
 """In-Memory storage test module."""
-#pylint: disable=no-self-use
+#pylint: disable=no-self-use,protected-access
 from splitio.models.splits import Split
-from splitio.models.segments import Segment
+from splitio.models.segments import Segment, CompactSegment
 from splitio.models.impressions import Impression
 from splitio.models.events import Event, EventWrapper
 
@@ -173,6 +173,48 @@ class InMemorySplitStorageTests(object):
         assert storage.is_valid_traffic_type('user') is False
         assert storage.is_valid_traffic_type('account') is True
 
+    def test_put_in_place(self, mocker):
+        """Test that single puts & removes don't copy the whole split mapping."""
+        storage = InMemorySplitStorage()
+        split1 = mocker.Mock()
+        type(split1).name = mocker.PropertyMock(return_value='split1')
+        type(split1).traffic_type_name = mocker.PropertyMock(return_value='user')
+        split2 = mocker.Mock()
+        type(split2).name = mocker.PropertyMock(return_value='split2')
+        type(split2).traffic_type_name = mocker.PropertyMock(return_value='user')
+
+        splits = storage._splits
+        storage.put(split1)
+        storage.put(split2)
+        storage.put(split2)
+        assert storage._splits is splits
+        assert splits == {'split1': split1, 'split2': split2}
+        assert storage._traffic_types['user'] == 2
+
+        storage.remove('split1')
+        assert storage._splits is splits
+        assert storage.fetch_many(['split1', 'split2']) == {'split1': None, 'split2': split2}
+        assert storage.is_valid_traffic_type('user') is True
+
+    def test_apply_changes(self, mocker):
+        """Test that a whole changeset is applied in a single swap."""
+        storage = InMemorySplitStorage()
+        split1 = mocker.Mock()
+        type(split1).name = mocker.PropertyMock(return_value='split1')
+        type(split1).traffic_type_name = mocker.PropertyMock(return_value='user')
+        split2 = mocker.Mock()
+        type(split2).name = mocker.PropertyMock(return_value='split2')
+        type(split2).traffic_type_name = mocker.PropertyMock(return_value='account')
+        storage.put(split1)
+
+        snapshot = storage._splits
+        storage.apply_changes([split2], ['split1', 'nonexistant'], 123)
+        assert snapshot == {'split1': split1}
+        assert storage._splits == {'split2': split2}
+        assert storage.get_change_number() == 123
+        assert storage.is_valid_traffic_type('user') is False
+        assert storage.is_valid_traffic_type('account') is True
+
 
 class InMemorySegmentStorageTests(object):
     """In memory segment storage tests."""
@@ -234,6 +276,54 @@ class InMemorySegmentStorageTests(object):
         assert not storage.segment_contains('some_segment', 'key3')
         assert storage.get_change_number('some_segment') == 456
 
+    def test_segment_update_in_place(self):
+        """Test that updates apply the delta to the stored segment without copying it."""
+        storage = InMemorySegmentStorage()
+        segment = Segment('some_segment', ['key1', 'key2'], 123)
+        storage.put(segment)
+        segments = storage._segments
+        keys = segment._keys
+
+        storage.update('some_segment', ['key3'], ['key1'], 456)
+        assert storage._segments is segments
+        assert storage.get('some_segment') is segment
+        assert segment._keys is keys
+        assert segment.keys == set(['key2', 'key3'])
+        assert segment.change_number == 456
+
+    def test_compact_segments(self):
+        """Test that segments over the threshold are stored compacted."""
+        storage = InMemorySegmentStorage(compact_threshold=3)
+        storage.put(Segment('small', ['key1', 'key2'], 123))
+        storage.put(Segment('big', ['key1', 'key2', 'key3'], 123))
+        assert isinstance(storage.get('small'), Segment)
+        assert isinstance(storage.get('big'), CompactSegment)
+        assert storage.segment_contains('big', 'key3')
+        assert not storage.segment_contains('big', 'key4')
+
+        storage.update('small', ['key3'], [], 456)
+        assert isinstance(storage.get('small'), CompactSegment)
+        assert storage.segment_contains('small', 'key3')
+        assert storage.get_change_number('small') == 456
+
+        storage.update('big', ['key4'], ['key1'], 456)
+        assert storage.segment_contains('big', 'key4')
+        assert not storage.segment_contains('big', 'key1')
+        assert storage.get_change_number('big') == 456
+
+    def test_build_new_segments(self, mocker):
+        """Test that new segments are built straight from the fetched keys."""
+        storage = InMemorySegmentStorage(compact_threshold=3)
+        mocker.patch.object(storage, '_maybe_compact', side_effect=AssertionError)
+        storage.update('big', ['key1', 'key2', 'key3'], ['key2'], 123)
+        storage.update('small', ['key1', 'key2'], ['key2'], 123)
+        assert isinstance(storage.get('big'), CompactSegment)
+        assert isinstance(storage.get('small'), Segment)
+        for name in ['big', 'small']:
+            assert storage.segment_contains(name, 'key1')
+            assert not storage.segment_contains(name, 'key2')
+            assert storage.get_change_number(name) == 123
+
 
 class InMemoryImpressionsStorageTests(object):
     """InMemory impressions storage test cases."""
@@ -0,0 +1,171 @@
+"""Memory-mapped snapshot storage tests."""
+#pylint: disable=no-self-use,protected-access
+import os
+import threading
+
+import pytest
+
+from splitio.models import splits
+from splitio.models.segments import Segment, CompactSegment
+from splitio.storage.inmemmory import InMemorySplitStorage, InMemorySegmentStorage
+from splitio.storage import mmap_snapshot
+from splitio.storage.mmap_snapshot import write_snapshot, SnapshotReader, MmapSplitStorage, \
+    MmapSegmentStorage
+from splitio.tasks.snapshot_sync import SnapshotWriterTask, SnapshotLoaderTask
+
+
+def _raw_split(name, segment_name, change_number):
+    """Build a raw split that evaluates `on` for members of a segment."""
+    return {
+        'changeNumber': change_number,
+        'trafficTypeName': 'user',
+        'name': name,
+        'trafficAllocation': 100,
+        'trafficAllocationSeed': 123456,
+        'seed': 321654,
+        'status': 'ACTIVE',
+        'killed': False,
+        'defaultTreatment': 'off',
+        'algo': 2,
+        'conditions': [{
+            'partitions': [{'treatment': 'on', 'size': 100}],
+            'contitionType': 'ROLLOUT',
+            'label': 'in segment',
+            'matcherGroup': {
+                'matchers': [{
+                    'matcherType': 'IN_SEGMENT',
+                    'userDefinedSegmentMatcherData': {'segmentName': segment_name},
+                    'negate': False
+                }],
+                'combiner': 'AND'
+            }
+        }]
+    }
+
+
+class MmapSnapshotStorageTests(object):
+    """Snapshot storage test cases."""
+
+    def test_write_and_read(self, tmpdir):
+        """Test that splits & segments written to a snapshot are read back by workers."""
+        path = str(tmpdir.join('split.snapshot'))
+        split_storage = InMemorySplitStorage()
+        segment_storage = InMemorySegmentStorage(compact_threshold=100)
+        split_storage.apply_changes([
+            splits.from_raw(_raw_split('split1', 'small', 123)),
+            splits.from_raw(_raw_split('split2', 'big', 123))
+        ], [], 123)
+        segment_storage.put(Segment('small', ['key1', 'key2'], 456))
+        segment_storage.put(Segment('big', ['key%d' % index for index in range(1000)], 789))
+        assert isinstance(segment_storage.get('big'), CompactSegment)
+
+        ready_event = threading.Event()
+        reader = SnapshotReader(path, 0, ready_event)
+        mmap_splits = MmapSplitStorage(reader)
+        mmap_segments = MmapSegmentStorage(reader)
+        assert mmap_splits.get('split1') is None
+        assert not mmap_segments.segment_contains('small', 'key1')
+        assert not ready_event.is_set()
+
+        write_snapshot(path, split_storage, segment_storage)
+        assert mmap_splits.get_change_number() == 123
+        assert ready_event.is_set()
+        assert sorted(mmap_splits.get_split_names()) == ['split1', 'split2']
+        assert mmap_splits.get('split1').to_json() == split_storage.get('split1').to_json()
+        assert set(mmap_splits.fetch_many(['split2', 'split3']).keys()) == set(['split2', 'split3'])
+        assert mmap_splits.fetch_many(['split3'])['split3'] is None
+        assert mmap_splits.is_valid_traffic_type('user')
+        assert not mmap_splits.is_valid_traffic_type('account')
+
+        assert mmap_segments.get_change_number('small') == 456
+        assert mmap_segments.get_change_number('big') == 789
+        assert mmap_segments.get_change_number('unknown') is None
+        assert mmap_segments.segment_contains('small', 'key2')
+        assert not mmap_segments.segment_contains('small', 'key3')
+        assert all(mmap_segments.segment_contains('big', 'key%d' % index) for index in range(1000))
+        assert not mmap_segments.segment_contains('big', 'key1000')
+        assert not mmap_segments.segment_contains('unknown', 'key1')
+
+        # Snapshots are swapped atomically when replaced.
+        segment_storage.update('small', ['key3'], ['key1'], 457)
+        write_snapshot(path, split_storage, segment_storage)
+        assert mmap_segments.get_change_number('small') == 457
+        assert mmap_segments.segment_contains('small', 'key3')
+        assert not mmap_segments.segment_contains('small', 'key1')
+        assert os.listdir(str(tmpdir)) == ['split.snapshot']
+
+        with pytest.raises(NotImplementedError):
+            mmap_splits.put(split_storage.get('split1'))
+        with pytest.raises(NotImplementedError):
+            mmap_segments.update('small', ['key4'], [], 458)
+
+    def test_writer_task(self, mocker, tmpdir):
+        """Test that snapshots are only written when a change number moves."""
+        path = str(tmpdir.join('split.snapshot'))
+        write_mock = mocker.Mock()
+        mocker.patch('splitio.tasks.snapshot_sync.write_snapshot', new=write_mock)
+        split_storage = InMemorySplitStorage()
+        segment_storage = InMemorySegmentStorage()
+        split_storage.apply_changes([splits.from_raw(_raw_split('split1', 'small', 123))], [], 123)
+        segment_storage.put(Segment('small', ['key1'], 456))
+
+        task = SnapshotWriterTask(split_storage, segment_storage, path, 60)
+        task._write()
+        task._write()
+        assert write_mock.mock_calls == [
+            mocker.call(path, split_storage, segment_storage, task._hashes_cache)
+        ]
+
+        segment_storage.update('small', ['key2'], [], 457)
+        task._write()
+        assert len(write_mock.mock_calls) == 2
+
+    def test_hashes_cache(self, mocker, tmpdir):
+        """Test that only segments whose change number moved are hashed again."""
+        path = str(tmpdir.join('split.snapshot'))
+        split_storage = InMemorySplitStorage()
+        segment_storage = InMemorySegmentStorage()
+        split_storage.apply_changes([
+            splits.from_raw(_raw_split('split1', 'segment1', 123)),
+            splits.from_raw(_raw_split('split2', 'segment2', 123))
+        ], [], 123)
+        segment_storage.put(Segment('segment1', ['key1'], 456))
+        segment_storage.put(Segment('segment2', ['key2'], 456))
+        hashes_mock = mocker.patch(
+            'splitio.storage.mmap_snapshot._segment_hashes',
+            wraps=mmap_snapshot._segment_hashes
+        )
+
+        cache = {}
+        write_snapshot(path, split_storage, segment_storage, cache)
+        assert len(hashes_mock.mock_calls) == 2
+        assert set(cache.keys()) == set(['segment1', 'segment2'])
+
+        segment_storage.update('segment2', ['key3'], [], 457)
+        write_snapshot(path, split_storage, segment_storage, cache)
+        assert hashes_mock.mock_calls[2:] == [mocker.call(segment_storage.get('segment2'))]
+        assert cache['segment2'][0] == 457
+
+        mmap_segments = MmapSegmentStorage(SnapshotReader(path, 0))
+        assert mmap_segments.segment_contains('segment1', 'key1')
+        assert mmap_segments.segment_contains('segment2', 'key3')
+
+        split_storage.remove('split1')
+        write_snapshot(path, split_storage, segment_storage, cache)
+        assert list(cache.keys()) == ['segment2']
+        assert len(hashes_mock.mock_calls) == 3
+
+    def test_loader_task(self, mocker):
+        """Test that the loader task maps new snapshots in the background."""
+        loaded = threading.Event()
+        reader = mocker.Mock(spec=SnapshotReader)
+        reader.get.side_effect = loaded.set
+        task = SnapshotLoaderTask(reader, 60)
+        task.start()
+        assert loaded.wait(5)
+        assert task.is_running()
+
+        stop_event = threading.Event()
+        task.stop(stop_event)
+        assert stop_event.wait(5)
+        assert reader.get.mock_calls == [mocker.call()]
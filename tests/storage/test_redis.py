@@ -1,5 +1,5 @@
 """Redis storage test module."""
-#pylint: disable=no-self-use
+#pylint: disable=no-self-use,protected-access
 
 import json
 import time
@@ -10,7 +10,17 @@ from splitio.storage.redis import RedisEventsStorage, RedisImpressionsStorage, \
 from splitio.models.segments import Segment
 from splitio.models.impressions import Impression
 from splitio.models.events import Event, EventWrapper
-from splitio.storage.adapters.redis import RedisAdapter, RedisAdapterException
+from splitio.storage.adapters.redis import RedisAdapter, RedisAdapterException, \
+    RedisPipelineAdapter
+
+
+def _build_pipeline_mock(mocker, adapter):
+    """Make the adapter return a pipeline mock whose commands can be chained."""
+    pipeline = mocker.Mock(spec=RedisPipelineAdapter)
+    for command in ['get', 'set', 'delete', 'smembers', 'sadd', 'sismember', 'scard']:
+        getattr(pipeline, command).return_value = pipeline
+    adapter.pipeline.return_value = pipeline
+    return pipeline
 
 
 class RedisSplitStorageTests(object):
@@ -70,6 +80,65 @@ class RedisSplitStorageTests(object):
         assert adapter.get.mock_calls == [mocker.call('SPLITIO.split.some_split')]
         assert not from_raw.mock_calls
 
+    def test_get_split_with_versioned_cache(self, mocker):
+        """Test that parsed splits are kept until the change number moves."""
+        adapter = mocker.Mock(spec=RedisAdapter)
+        till = ['100']
+        adapter.get.side_effect = lambda key: till[0] if key == 'SPLITIO.splits.till' else '2'
+        adapter.mget.side_effect = lambda keys: ['{"name": "split1"}' for _ in keys]
+        split = mocker.Mock()
+        from_raw = mocker.Mock(return_value=split)
+        mocker.patch('splitio.models.splits.from_raw', new=from_raw)
+        compile_split = mocker.Mock()
+        mocker.patch('splitio.storage.redis.compile_split', new=compile_split)
+
+        storage = RedisSplitStorage(adapter, True, 1, 'versioned', 0)
+        assert storage.get('split1') is split
+        assert storage.fetch_many(['split1']) == {'split1': split}
+        assert storage.get('split1') is split
+        assert adapter.mget.mock_calls == [mocker.call(['SPLITIO.split.split1'])]
+        assert from_raw.mock_calls == [mocker.call({'name': 'split1'})]
+        assert compile_split.mock_calls == [mocker.call(split)]
+        assert adapter.get.mock_calls == [mocker.call('SPLITIO.splits.till')] * 3
+
+        assert storage.is_valid_traffic_type('user') is True
+        assert storage.is_valid_traffic_type('user') is True
+        assert adapter.get.mock_calls.count(mocker.call('SPLITIO.trafficType.user')) == 1
+
+        # change number moved, splits & traffic types are fetched again
+        till[0] = '101'
+        assert storage.fetch_many(['split1', 'split2']) == {'split1': split, 'split2': split}
+        assert len(adapter.mget.mock_calls) == 2
+        assert adapter.mget.mock_calls[1] == \
+            mocker.call(['SPLITIO.split.split1', 'SPLITIO.split.split2'])
+        assert storage.is_valid_traffic_type('user') is True
+        assert adapter.get.mock_calls.count(mocker.call('SPLITIO.trafficType.user')) == 2
+
+        # redis failures are not cached
+        adapter.mget.side_effect = RedisAdapterException('something')
+        till[0] = '102'
+        assert storage.get('split1') is None
+        adapter.mget.side_effect = lambda keys: ['{"name": "split1"}' for _ in keys]
+        assert storage.get('split1') is split
+
+    def test_versioned_cache_till_checks(self, mocker):
+        """Test that the change number is re-read at most once per interval, and misses aren't cached."""
+        adapter = mocker.Mock(spec=RedisAdapter)
+        adapter.get.return_value = '100'
+        adapter.mget.side_effect = lambda keys: [None for _ in keys]
+        mocker.patch('splitio.storage.redis.time.time', return_value=1000)
+
+        storage = RedisSplitStorage(adapter, True, 1, 'versioned', 5, 10)
+        assert storage.get('unknown') is None
+        assert storage.get('unknown') is None
+        assert adapter.get.mock_calls == [mocker.call('SPLITIO.splits.till')]
+        assert len(adapter.mget.mock_calls) == 2
+
+        mocker.patch('splitio.storage.redis.time.time', return_value=1005)
+        assert storage.get('unknown') is None
+        assert adapter.get.mock_calls == [mocker.call('SPLITIO.splits.till')] * 2
+        assert storage._split_cache._data._max_size == 10
+
     def test_get_splits_with_cache(self, mocker):
         """Test retrieving a list of passed splits."""
         adapter = mocker.Mock(spec=RedisAdapter)
@@ -104,18 +173,16 @@ class RedisSplitStorageTests(object):
         from_raw = mocker.Mock()
         mocker.patch('splitio.models.splits.from_raw', new=from_raw)
 
-        adapter.keys.return_value = [
-            'SPLITIO.split.split1',
-            'SPLITIO.split.split2',
-            'SPLITIO.split.split3'
-        ]
+        pipeline = _build_pipeline_mock(mocker, adapter)
+        pipeline.execute.return_value = ['123', '123', ['split1', 'split2', 'split3']]
         def _mget_mock(*_):
             return ['{"name": "split1"}', '{"name": "split2"}', '{"name": "split3"}']
         adapter.mget.side_effect = _mget_mock
 
         storage.get_all_splits()
 
-        assert adapter.keys.mock_calls == [mocker.call('SPLITIO.split.*')]
+        assert adapter.keys.mock_calls == []
+        assert adapter.scan_iter.mock_calls == []
         assert adapter.mget.mock_calls == [
             mocker.call(['SPLITIO.split.split1', 'SPLITIO.split.split2', 'SPLITIO.split.split3'])
         ]
@@ -129,12 +196,56 @@ class RedisSplitStorageTests(object):
         """Test getching split names."""
         adapter = mocker.Mock(spec=RedisAdapter)
         storage = RedisSplitStorage(adapter)
-        adapter.keys.return_value = [
-            'SPLITIO.split.split1',
-            'SPLITIO.split.split2',
-            'SPLITIO.split.split3'
-        ]
+        pipeline = _build_pipeline_mock(mocker, adapter)
+
+        # Up to date index
+        pipeline.execute.return_value = ['123', '123', ['split1', 'split2', 'split3']]
         assert storage.get_split_names() == ['split1', 'split2', 'split3']
+        assert pipeline.get.mock_calls == [
+            mocker.call('SPLITIO.splits.till'),
+            mocker.call('SPLITIO.splits.names.till')
+        ]
+        assert pipeline.smembers.mock_calls == [mocker.call('SPLITIO.splits.names')]
+        assert adapter.scan_iter.mock_calls == []
+        assert adapter.keys.mock_calls == []
+
+        # Missing or stale index falls back to a scan, without writing.
+        pipeline.reset_mock()
+        pipeline.execute.return_value = ['124', '123', ['split1']]
+        adapter.scan_iter.return_value = iter(['SPLITIO.split.split1', 'SPLITIO.split.split2'])
+        assert storage.get_split_names() == ['split1', 'split2']
+        assert adapter.scan_iter.mock_calls == [mocker.call('SPLITIO.split.*', 1000)]
+        assert pipeline.execute.mock_calls == [mocker.call()]
+        assert pipeline.delete.mock_calls == []
+        assert pipeline.sadd.mock_calls == []
+        assert pipeline.set.mock_calls == []
+
+        # Without a change number, there's no index either.
+        pipeline.reset_mock()
+        pipeline.execute.return_value = [None, None, []]
+        adapter.scan_iter.return_value = iter([])
+        assert storage.get_split_names() == []
+        assert pipeline.execute.mock_calls == [mocker.call()]
+
+    def test_build_split_names_index(self, mocker):
+        """Test building the split names index from the split keys."""
+        adapter = mocker.Mock(spec=RedisAdapter)
+        pipeline = _build_pipeline_mock(mocker, adapter)
+        adapter.get.return_value = '123'
+        adapter.scan_iter.return_value = iter(['SPLITIO.split.split1', 'SPLITIO.split.split2'])
+        assert RedisSplitStorage.build_split_names_index(adapter) == 2
+        assert adapter.get.mock_calls == [mocker.call('SPLITIO.splits.till')]
+        adapter.pipeline.assert_called_once_with(transaction=True)
+        assert pipeline.delete.mock_calls == [mocker.call('SPLITIO.splits.names')]
+        assert pipeline.sadd.mock_calls == [mocker.call('SPLITIO.splits.names', 'split1', 'split2')]
+        assert pipeline.set.mock_calls == [mocker.call('SPLITIO.splits.names.till', '123')]
+        assert pipeline.execute.mock_calls == [mocker.call()]
+
+        adapter.reset_mock()
+        adapter.get.return_value = None
+        assert RedisSplitStorage.build_split_names_index(adapter) is None
+        assert adapter.scan_iter.mock_calls == []
+        assert not adapter.pipeline.called
 
     def test_is_valid_traffic_type(self, mocker):
         """Test that traffic type validation works."""
@@ -174,8 +285,11 @@ class RedisSegmentStorageTests(object):
     def test_fetch_segment(self, mocker):
         """Test fetching a whole segment."""
         adapter = mocker.Mock(spec=RedisAdapter)
-        adapter.smembers.return_value = set(["key1", "key2", "key3"])
-        adapter.get.return_value = '100'
+        pipeline = mocker.Mock(spec=RedisPipelineAdapter)
+        adapter.pipeline.return_value = pipeline
+        pipeline.smembers.return_value = pipeline
+        pipeline.get.return_value = pipeline
+        pipeline.execute.return_value = [set(["key1", "key2", "key3"]), '100']
         from_raw = mocker.Mock()
         mocker.patch('splitio.models.segments.from_raw', new=from_raw)
 
@@ -187,16 +301,19 @@ class RedisSegmentStorageTests(object):
         assert result.contains('key2')
         assert result.contains('key3')
         assert result.change_number == 100
-        assert adapter.smembers.mock_calls == [mocker.call('SPLITIO.segment.some_segment')]
-        assert adapter.get.mock_calls == [mocker.call('SPLITIO.segment.some_segment.till')]
+        assert pipeline.smembers.mock_calls == [mocker.call('SPLITIO.segment.some_segment')]
+        assert pipeline.get.mock_calls == [mocker.call('SPLITIO.segment.some_segment.till')]
+        assert pipeline.execute.mock_calls == [mocker.call()]
+        assert adapter.smembers.mock_calls == []
+        assert adapter.get.mock_calls == []
 
         # Assert that if segment doesn't exist, None is returned
-        adapter.reset_mock()
+        pipeline.reset_mock()
         from_raw.reset_mock()
-        adapter.smembers.return_value = set()
+        pipeline.execute.return_value = [set(), None]
         assert storage.get('some_segment') is None
-        assert adapter.smembers.mock_calls == [mocker.call('SPLITIO.segment.some_segment')]
-        assert adapter.get.mock_calls == [mocker.call('SPLITIO.segment.some_segment.till')]
+        assert pipeline.smembers.mock_calls == [mocker.call('SPLITIO.segment.some_segment')]
+        assert pipeline.get.mock_calls == [mocker.call('SPLITIO.segment.some_segment.till')]
 
     def test_fetch_change_number(self, mocker):
         """Test fetching change number."""
@@ -218,6 +335,106 @@ class RedisSegmentStorageTests(object):
             mocker.call('SPLITIO.segment.some_segment', 'some_key')
         ]
 
+    def test_segment_contains_many(self, mocker):
+        """Test that many memberships are checked in a single round trip."""
+        adapter = mocker.Mock(spec=RedisAdapter)
+        pipeline = _build_pipeline_mock(mocker, adapter)
+        storage = RedisSegmentStorage(adapter)
+        pipeline.execute.return_value = [True, False]
+        assert storage.segment_contains_many(['segment1', 'segment2', 'segment1'], 'key') == {
+            'segment1': True,
+            'segment2': False
+        }
+        assert pipeline.sismember.mock_calls == [
+            mocker.call('SPLITIO.segment.segment1', 'key'),
+            mocker.call('SPLITIO.segment.segment2', 'key')
+        ]
+        assert adapter.sismember.mock_calls == []
+
+        pipeline.execute.side_effect = RedisAdapterException('something')
+        assert storage.segment_contains_many(['segment1'], 'key') == {}
+
+    def test_segment_contains_with_cache(self, mocker):
+        """Test that membership results are cached until the segment till changes."""
+        adapter = mocker.Mock(spec=RedisAdapter)
+        telemetry_storage = mocker.Mock(spec=RedisTelemetryStorage)
+        storage = RedisSegmentStorage(adapter, cache_size=10, till_check_interval=0,
+                                      telemetry_storage=telemetry_storage)
+        storage._cache._report_interval = 4
+        adapter.get.return_value = '123'
+        adapter.sismember.return_value = True
+        assert storage.segment_contains('some_segment', 'some_key') is True
+        adapter.sismember.return_value = False
+        assert storage.segment_contains('some_segment', 'some_key') is True
+        assert storage.segment_contains('some_segment', 'other_key') is False
+        assert adapter.sismember.mock_calls == [
+            mocker.call('SPLITIO.segment.some_segment', 'some_key'),
+            mocker.call('SPLITIO.segment.some_segment', 'other_key')
+        ]
+        assert telemetry_storage.put_gauge.mock_calls == []
+
+        # A new till invalidates previous results.
+        adapter.get.return_value = '124'
+        assert storage.segment_contains('some_segment', 'some_key') is False
+        assert len(adapter.sismember.mock_calls) == 3
+        assert telemetry_storage.put_gauge.mock_calls == [
+            mocker.call('segments.membershipCache.size', 2),
+            mocker.call('segments.membershipCache.hitRate', 25)
+        ]
+
+        # The till is only checked once per interval.
+        storage._till_check_interval = 60
+        adapter.get.reset_mock()
+        adapter.get.return_value = '125'
+        assert storage.segment_contains('some_segment', 'some_key') is False
+        assert storage.segment_contains('other_segment', 'some_key') is False
+        assert storage.segment_contains('other_segment', 'some_key') is False
+        assert adapter.get.mock_calls == [mocker.call('SPLITIO.segment.other_segment.till')]
+
+    def test_segment_contains_with_snapshot(self, mocker):
+        """Test that small segments are cached entirely."""
+        adapter = mocker.Mock(spec=RedisAdapter)
+        pipeline = _build_pipeline_mock(mocker, adapter)
+        storage = RedisSegmentStorage(adapter, cache_size=10, snapshot_max_size=2,
+                                      till_check_interval=0)
+        pipeline.execute.return_value = ['123', 2]
+        adapter.smembers.return_value = set(['key1', 'key2'])
+        assert storage.segment_contains('small_segment', 'key1') is True
+        assert storage.segment_contains('small_segment', 'key3') is False
+        assert adapter.smembers.mock_calls == [mocker.call('SPLITIO.segment.small_segment')]
+        assert adapter.sismember.mock_calls == []
+        assert pipeline.scard.mock_calls == [
+            mocker.call('SPLITIO.segment.small_segment'),
+            mocker.call('SPLITIO.segment.small_segment')
+        ]
+
+        # Segments over the threshold fall back to per-key lookups.
+        pipeline.execute.return_value = ['123', 3]
+        adapter.sismember.return_value = True
+        assert storage.segment_contains('big_segment', 'key1') is True
+        assert adapter.smembers.mock_calls == [mocker.call('SPLITIO.segment.small_segment')]
+        assert adapter.sismember.mock_calls == [mocker.call('SPLITIO.segment.big_segment', 'key1')]
+
+    def test_snapshot_without_cache(self, mocker):
+        """Test that small segments are cached entirely even without a membership cache."""
+        adapter = mocker.Mock(spec=RedisAdapter)
+        pipeline = _build_pipeline_mock(mocker, adapter)
+        storage = RedisSegmentStorage(adapter, cache_size=0, snapshot_max_size=2)
+        pipeline.execute.return_value = ['123', 2]
+        adapter.smembers.return_value = set(['key1', 'key2'])
+        assert storage.segment_contains('small_segment', 'key1') is True
+        assert storage.segment_contains('small_segment', 'key3') is False
+        assert storage.segment_contains_many(['small_segment'], 'key2') == {'small_segment': True}
+        assert adapter.smembers.mock_calls == [mocker.call('SPLITIO.segment.small_segment')]
+        assert adapter.sismember.mock_calls == []
+
+        # Without snapshots either, memberships go straight to redis.
+        storage = RedisSegmentStorage(adapter)
+        adapter.sismember.return_value = True
+        assert storage.segment_contains('small_segment', 'key1') is True
+        assert adapter.sismember.mock_calls == [mocker.call('SPLITIO.segment.small_segment', 'key1')]
+        assert adapter.get.mock_calls == []
+
 
 class RedisImpressionsStorageTests(object):  #pylint: disable=too-few-public-methods
     """Redis Events storage test cases."""
@@ -1,5 +1,5 @@
 """UWSGI Storage unit tests."""
-#pylint: disable=no-self-usage
+#pylint: disable=no-self-usage,protected-access
 import json
 
 from splitio.storage.uwsgi import UWSGIEventStorage, UWSGIImpressionStorage,  \
@@ -154,6 +154,59 @@ class UWSGISplitStorageTests(object):
         assert storage.is_valid_traffic_type('user') is False
         assert storage.is_valid_traffic_type('account') is False
 
+    def test_apply_changes(self, mocker):
+        """Test applying a whole changeset."""
+        uwsgi = get_uwsgi(True)
+        storage = UWSGISplitStorage(uwsgi)
+        from_raw_mock = self._get_from_raw_mock(mocker)
+        mocker.patch('splitio.models.splits.from_raw', new=from_raw_mock)
+
+        split_1 = from_raw_mock({'name': 'some_split_1', 'trafficTypeName': 'user'})
+        split_2 = from_raw_mock({'name': 'some_split_2', 'trafficTypeName': 'account'})
+        storage.apply_changes([split_1, split_2], [], 123)
+        assert set(storage.get_split_names()) == set(['some_split_1', 'some_split_2'])
+        assert storage.is_valid_traffic_type('user') is True
+        assert storage.is_valid_traffic_type('account') is True
+        assert storage.get_change_number() == 123
+
+        split_3 = from_raw_mock({'name': 'some_split_3', 'trafficTypeName': 'user'})
+        storage.apply_changes([split_3], ['some_split_2', 'nonexistant_split'], 456)
+        assert set(storage.get_split_names()) == set(['some_split_1', 'some_split_3'])
+        assert storage.get('some_split_2') is None
+        assert storage.get('some_split_3').name == 'some_split_3'
+        assert storage.is_valid_traffic_type('user') is True
+        assert storage.is_valid_traffic_type('account') is False
+        assert storage.get_change_number() == 456
+
+    def test_parsed_split_cache(self, mocker):
+        """Test that splits are parsed once per change number."""
+        uwsgi = get_uwsgi(True)
+        storage = UWSGISplitStorage(uwsgi)
+        from_raw_mock = self._get_from_raw_mock(mocker)
+        mocker.patch('splitio.models.splits.from_raw', new=from_raw_mock)
+        compile_mock = mocker.Mock()
+        mocker.patch('splitio.storage.uwsgi.compile_split', new=compile_mock)
+
+        raw_split = {'name': 'some_split', 'trafficTypeName': 'user'}
+        storage.apply_changes([from_raw_mock(raw_split)], [], 123)
+        from_raw_mock.reset_mock()
+
+        first = storage.get('some_split')
+        assert storage.get('some_split') is first
+        assert storage.fetch_many(['some_split'])['some_split'] is first
+        assert from_raw_mock.mock_calls == [mocker.call(raw_split)]
+        assert compile_mock.mock_calls == [mocker.call(first)]
+
+        # A new change number drops the parsed splits.
+        storage.set_change_number(456)
+        second = storage.get('some_split')
+        assert second is not first
+        assert len(from_raw_mock.mock_calls) == 2
+
+        # Missing splits are not cached.
+        assert storage.get('nonexistant_split') is None
+        assert storage.get('nonexistant_split') is None
+
 class UWSGISegmentStorageTests(object):
     """UWSGI Segment storage test cases."""
 
@@ -212,6 +265,45 @@ class UWSGISegmentStorageTests(object):
 
         assert storage.segment_contains('some_segment', 'abc')
         assert not storage.segment_contains('some_segment', 'qwe')
+        assert not storage.segment_contains('nonexistant_segment', 'abc')
+
+    def test_segment_contains_decodes_once_per_change_number(self, mocker):
+        """Test that segment members are decoded again only when the change number changes."""
+        uwsgi = get_uwsgi(True)
+        storage = UWSGISegmentStorage(uwsgi)
+        storage.put(Segment('some_segment', ['abc', 'def'], 123))
+        loads_mock = mocker.Mock(wraps=json.loads)
+        mocker.patch('splitio.storage.uwsgi.json.loads', new=loads_mock)
+
+        assert storage.segment_contains('some_segment', 'abc')
+        assert storage.segment_contains('some_segment', 'def')
+        assert not storage.segment_contains('some_segment', 'ghi')
+        # 3 change number reads + 1 read of every bucket.
+        assert len(loads_mock.mock_calls) == 3 + UWSGISegmentStorage._BUCKETS
+
+        storage.update('some_segment', ['ghi'], ['abc'], 124)
+        loads_mock.reset_mock()
+        assert storage.segment_contains('some_segment', 'ghi')
+        assert not storage.segment_contains('some_segment', 'abc')
+        assert len(loads_mock.mock_calls) == 2 + UWSGISegmentStorage._BUCKETS
+
+    def test_update_rewrites_touched_buckets_only(self, mocker):
+        """Test that updates only write the buckets of the added & removed keys."""
+        uwsgi = get_uwsgi(True)
+        storage = UWSGISegmentStorage(uwsgi)
+        storage.put(Segment('some_segment', ['key%d' % index for index in range(500)], 123))
+        update_mock = mocker.Mock(wraps=uwsgi.cache_update)
+        uwsgi.cache_update = update_mock
+
+        storage.update('some_segment', ['new_key'], ['key1'], 124)
+        touched = set([storage._bucket_for('new_key'), storage._bucket_for('key1')])
+        data_writes = [call for call in update_mock.mock_calls if call[1][0].startswith('segmentData.')]
+        assert len(data_writes) == len(touched)
+        assert storage.get_change_number('some_segment') == 124
+        segment = storage.get('some_segment')
+        assert segment.contains('new_key')
+        assert not segment.contains('key1')
+        assert len(segment.keys) == 500
 
 
 
@@ -232,6 +324,60 @@ class UWSGIImpressionsStorageTests(object):
         res = storage.pop_many(10)
         assert res == impressions
 
+    def test_impression_lanes(self, mocker):
+        """Test that workers append to their own ring buffers."""
+        uwsgi = get_uwsgi(True)
+        mocker.patch.object(UWSGIImpressionStorage, '_MAX_SLOT_ITEMS', 2)
+        storage = UWSGIImpressionStorage(uwsgi, 2)
+        impressions = [
+            Impression('key%d' % index, 'feature1', 'on', 'some_label', 123456, None, 321654)
+            for index in range(7)
+        ]
+
+        uwsgi.worker_id = lambda: 1
+        storage.put(impressions[0:2])
+        storage.put(impressions[2:3])
+        storage.put(impressions[3:4])  # lane full, merged into the newest slot.
+        storage.put(impressions[6:7])  # newest slot full too, dropped.
+        uwsgi.worker_id = lambda: 2
+        storage.put(impressions[4:6])
+        assert uwsgi.cache_get('SPLITIO.impressions_lock.1', 'splitio_locks') is None
+        assert json.loads(uwsgi.cache_get('SPLITIO.impressions.lanes', 'splitio_impressions')) == [1, 2]
+
+        # Partially consumed slots keep the remaining impressions.
+        assert storage.pop_many(1) == impressions[0:1]
+        assert storage.pop_many(4) == [impressions[1], impressions[2], impressions[3], impressions[4]]
+        assert storage.pop_many(10) == impressions[5:6]
+        assert storage.pop_many(10) == []
+
+        # Freed slots are reused.
+        uwsgi.worker_id = lambda: 1
+        storage.put(impressions[6:7])
+        assert uwsgi.cache_get('SPLITIO.impressions.1.0', 'splitio_impressions') is not None
+        assert storage.pop_many(10) == impressions[6:7]
+
+    def test_impressions_overflow(self, mocker):
+        """Test that a busy worker requests a flush and doesn't drop a full lane's worth."""
+        uwsgi = get_uwsgi(True)
+        uwsgi.worker_id = lambda: 1
+        storage = UWSGIImpressionStorage(uwsgi, 10)
+        impressions = [
+            Impression('key%d' % index, 'feature1', 'on', 'some_label', 123456, None, 321654)
+            for index in range(50)
+        ]
+
+        for impression in impressions[:4]:
+            storage.put([impression])
+        assert storage.should_flush() is False
+        storage.put([impressions[4]])
+        assert storage.should_flush() is True
+
+        storage.acknowledge_flush()
+        for impression in impressions[5:]:
+            storage.put([impression])
+        assert storage.should_flush() is True
+        assert storage.pop_many(100) == impressions
+
     def test_flush(self):
         """Test requesting, querying and acknowledging a flush."""
         uwsgi = get_uwsgi(True)
@@ -299,3 +445,75 @@ class UWSGITelemetryStorageTests(object):
         assert storage.pop_gauges() == {'some_gauge1': 123, 'some_gauge2': 456}
         assert storage.pop_gauges() == {}
 
+
+    def test_local_accumulation(self, mocker):
+        """Test that metrics are kept locally and merged from every worker when popped."""
+        uwsgi = get_uwsgi(True)
+        worker_1 = UWSGITelemetryStorage(uwsgi)
+        worker_2 = UWSGITelemetryStorage(uwsgi)
+        reader = UWSGITelemetryStorage(uwsgi)
+        uwsgi.worker_id = lambda: 1
+        worker_1.inc_latency('some_latency', 2)
+        worker_1.inc_counter('some_counter')
+        worker_1.put_gauge('some_gauge', 1)
+        assert reader.pop_latencies() == {}
+        assert reader.pop_counters() == {}
+
+        worker_1.flush()
+        uwsgi.worker_id = lambda: 2
+        worker_2.inc_latency('some_latency', 2)
+        worker_2.inc_latency('some_latency', 3)
+        worker_2.inc_counter('some_counter')
+        worker_2.put_gauge('some_gauge', 2)
+
+        worker_2.inc_counter('other_counter')
+        worker_2.flush()
+        assert uwsgi.cache_get('SPLITIO.latencies.lock.2', 'splitio_locks') is None
+
+        uwsgi.worker_id = lambda: 0
+        latencies = [0] * 22
+        latencies[2] = 2
+        latencies[3] = 1
+        assert reader.pop_latencies() == {'some_latency': latencies}
+        assert reader.pop_counters() == {'some_counter': 2, 'other_counter': 1}
+        assert reader.pop_gauges() == {'some_gauge': 2}
+        assert reader.pop_latencies() == {}
+
+    def test_idle_workers_flush(self, mocker):
+        """Test that metrics of idle & exiting workers reach the shared buffers."""
+        thread_mock = mocker.patch('splitio.storage.uwsgi.threading.Thread')
+        atexit_mock = mocker.patch('splitio.storage.uwsgi.atexit.register')
+        uwsgi = get_uwsgi(True)
+        idle = UWSGITelemetryStorage(uwsgi)
+        busy = UWSGITelemetryStorage(uwsgi)
+        reader = UWSGITelemetryStorage(uwsgi)
+
+        uwsgi.worker_id = lambda: 1
+        idle.inc_counter('some_counter')
+        uwsgi.worker_id = lambda: 2
+        busy.inc_counter('some_counter')
+        busy.inc_counter('other_counter')
+
+        # One flusher per process, started on the first metric recorded.
+        assert thread_mock.mock_calls == [
+            mocker.call(target=idle._flush_periodically, name='SplitTelemetryFlusher'),
+            mocker.call().start(),
+            mocker.call(target=busy._flush_periodically, name='SplitTelemetryFlusher'),
+            mocker.call().start()
+        ]
+        assert atexit_mock.mock_calls == [mocker.call(idle.flush), mocker.call(busy.flush)]
+
+        # The idle worker's flusher runs without it recording anything else.
+        def _sleep(_):
+            idle._flusher_pid = None
+        mocker.patch('splitio.storage.uwsgi.time.sleep', new=_sleep)
+        uwsgi.worker_id = lambda: 1
+        idle._flush_periodically()
+        uwsgi.worker_id = lambda: 0
+        assert reader.pop_counters() == {'some_counter': 1}
+
+        # The busy worker exits.
+        uwsgi.worker_id = lambda: 2
+        atexit_mock.mock_calls[1][1][0]()
+        uwsgi.worker_id = lambda: 0
+        assert reader.pop_counters() == {'some_counter': 1, 'other_counter': 1}
@@ -0,0 +1,187 @@
+"""Asyncio synchronization tasks test module."""
+
+import sys
+import threading
+
+import pytest
+
+from splitio.api import APIException
+from splitio.storage import SegmentStorage, SplitStorage, EventStorage
+from splitio.models.events import Event
+
+
+def _done(result=None, exception=None):
+    """Return an awaitable resolved to the result (or failed with the exception)."""
+    import asyncio
+    future = asyncio.get_event_loop().create_future()
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+    return future
+
+
+@pytest.mark.skipif(sys.version_info < (3, 5), reason='asyncio requires python 3.5+')
+class AsyncioTaskTests(object):
+    """Asyncio task test cases."""
+
+    def setup_method(self):
+        """Run each test on a fresh event loop."""
+        import asyncio
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def teardown_method(self):
+        """Close the event loop."""
+        import asyncio
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    def _sleep(self, seconds):
+        """Let the loop run for some seconds."""
+        import asyncio
+        self.loop.run_until_complete(asyncio.sleep(seconds))
+
+    def test_normal_operation(self):
+        """Test that the task runs periodically on the loop, without threads."""
+        from splitio.tasks.aio import AsyncioTask
+        calls = []
+
+        def _hook(name):
+            def _run():
+                calls.append((name, threading.current_thread()))
+                return _done()
+            return _run
+
+        threads = threading.active_count()
+        task = AsyncioTask(_hook('main'), 0.05, on_init=_hook('init'), on_stop=_hook('stop'))
+        task.start()
+        self._sleep(0.2)
+        assert task.running()
+        assert threading.active_count() == threads
+
+        self.loop.run_until_complete(task.stop())
+        assert not task.running()
+        names = [name for (name, _) in calls]
+        assert names[0] == 'init'
+        assert names.count('main') >= 2
+        assert names[-1] == 'stop'
+        assert set(thread for (_, thread) in calls) == set([threading.current_thread()])
+
+    def test_force_execution_and_errors(self):
+        """Test that errors don't stop the task and that executions can be forced."""
+        from splitio.tasks.aio import AsyncioTask
+        calls = []
+
+        def _main():
+            calls.append(1)
+            return _done(exception=Exception('some error'))
+
+        task = AsyncioTask(_main, 60)
+        task.start()
+        self._sleep(0.05)
+        assert calls == []
+        task.force_execution()
+        self._sleep(0.05)
+        task.force_execution()
+        self._sleep(0.05)
+        assert calls == [1, 1]
+        assert task.running()
+        self.loop.run_until_complete(task.stop())
+        assert not task.running()
+
+    def test_stop_while_initializing(self):
+        """Test that a task stuck in its init hook is cancelled and still runs on_stop."""
+        import asyncio
+        from splitio.tasks.aio import AsyncioTask
+        stopped = []
+
+        def _on_stop():
+            stopped.append(True)
+            return _done()
+
+        task = AsyncioTask(lambda: _done(), 60, on_init=lambda: asyncio.sleep(60),
+                           on_stop=_on_stop)
+        task.start()
+        self._sleep(0.05)
+        self.loop.run_until_complete(asyncio.wait_for(task.stop(), 1))
+        assert stopped == [True]
+        assert not task.running()
+
+    def test_segment_sync(self, mocker):
+        """Test that segments are fetched concurrently on the loop and the flag is set."""
+        import asyncio
+        from splitio.tasks.aio import AsyncSegmentSynchronizationTask
+        split_storage = mocker.Mock(spec=SplitStorage)
+        split_storage.get_segment_names.return_value = ['segmentA', 'segmentB', 'segmentC']
+        storage = mocker.Mock(spec=SegmentStorage)
+        storage.get_change_number.return_value = -1
+
+        in_flight = []
+        max_in_flight = []
+        failing = set()
+
+        async_api = mocker.Mock()
+
+        def _fetch(segment_name, since):
+            in_flight.append(segment_name)
+            max_in_flight.append(len(in_flight))
+
+            async_result = asyncio.get_event_loop().create_future()
+
+            def _resolve():
+                in_flight.remove(segment_name)
+                if segment_name in failing:
+                    async_result.set_exception(APIException('some error'))
+                else:
+                    async_result.set_result({
+                        'name': segment_name, 'added': ['key'], 'removed': [],
+                        'since': since, 'till': since
+                    })
+            asyncio.get_event_loop().call_later(0.01, _resolve)
+            return async_result
+        async_api.fetch_segment.side_effect = _fetch
+
+        ready = asyncio.Event()
+        task = AsyncSegmentSynchronizationTask(
+            async_api, storage, split_storage, 60, ready, concurrency=2, max_period=240
+        )
+        task.start()
+        self.loop.run_until_complete(asyncio.wait_for(ready.wait(), 1))
+        assert ready.is_set()
+        assert max(max_in_flight) == 2
+        assert mocker.call('segmentA', ['key'], [], -1) in storage.update.mock_calls
+        assert mocker.call('segmentB', ['key'], [], -1) in storage.update.mock_calls
+
+        # Once running, a failed fetch is recorded as an error instead of retried.
+        assert task._schedule._intervals['segmentC'] == 120
+        failing.add('segmentC')
+        async_api.fetch_segment.reset_mock()
+        self.loop.run_until_complete(task._ensure_segment_is_updated('segmentC'))
+        assert len(async_api.fetch_segment.mock_calls) == 1
+        assert task._schedule._intervals['segmentC'] == 240
+        self.loop.run_until_complete(task.stop())
+
+    def test_events_flushed_on_stop(self, mocker):
+        """Test that pending events are flushed when the task stops and re-queued on errors."""
+        from splitio.tasks.aio import AsyncEventsSyncTask
+        events = [Event('key%d' % index, 'user', 'purchase', 1, 123456, None)
+                  for index in range(3)]
+        storage = mocker.Mock(spec=EventStorage)
+        storage.pop_many.side_effect = [events[:2], [], [events[2]]]
+        api = mocker.Mock()
+        api.flush_events.side_effect = [
+            _done(exception=APIException('some error', 500)),
+            _done(),
+            _done(),
+        ]
+
+        task = AsyncEventsSyncTask(api, storage, 60, 5)
+        self.loop.run_until_complete(task._send_events())
+        self.loop.run_until_complete(task._send_events())
+        assert api.flush_events.mock_calls[1] == mocker.call(events[:2])
+
+        task.start()
+        self._sleep(0.05)
+        self.loop.run_until_complete(task.stop())
+        assert api.flush_events.mock_calls[2] == mocker.call([events[2]])
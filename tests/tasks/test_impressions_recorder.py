@@ -0,0 +1,81 @@
+"""Impressions recorder task test module."""
+
+import threading
+
+from splitio.client.listener import ImpressionListenerWrapper, ImpressionListenerException
+from splitio.tasks import impressions_recorder
+from splitio.storage import ImpressionStorage
+from splitio.models.impressions import Impression
+
+
+class ImpressionsRecorderTests(object):
+    """Impressions recorder task test cases."""
+
+    def test_normal_operation(self, mocker):
+        """Test that staged impressions reach the storage & listener in batches."""
+        storage = mocker.Mock(spec=ImpressionStorage)
+        listener = mocker.Mock(spec=ImpressionListenerWrapper)
+        listener.log_impression.side_effect = [None, ImpressionListenerException(), None]
+        impressions = [
+            Impression('key1', 'split1', 'on', 'l1', 123456, 'b1', 321654),
+            Impression('key2', 'split1', 'on', 'l1', 123456, 'b1', 321654),
+            Impression('key3', 'split2', 'off', 'l1', 123456, 'b1', 321654)
+        ]
+        task = impressions_recorder.ImpressionsRecorderTask(storage, listener, 60, 10, 2)
+        task.start()
+        assert task.is_running()
+        assert task.record(impressions, [{'a': 1}, {'a': 2}, None])
+        assert storage.put.mock_calls == []
+
+        stop_event = threading.Event()
+        task.stop(stop_event)
+        stop_event.wait(5)
+        assert stop_event.is_set()
+        assert storage.put.mock_calls == [
+            mocker.call(impressions[0:2]),
+            mocker.call(impressions[2:3])
+        ]
+        assert listener.log_impression.mock_calls == [
+            mocker.call(impressions[0], {'a': 1}),
+            mocker.call(impressions[1], {'a': 2}),
+            mocker.call(impressions[2], None)
+        ]
+
+    def test_queue_full(self, mocker):
+        """Test that impressions are dropped when the staging queue is full."""
+        storage = mocker.Mock(spec=ImpressionStorage)
+        impressions = [
+            Impression('key%d' % index, 'split1', 'on', 'l1', 123456, None, 321654)
+            for index in range(3)
+        ]
+        task = impressions_recorder.ImpressionsRecorderTask(storage, None, 60, 2, 10)
+        assert task.record(impressions, [None] * 3) is False
+        task._flush()  #pylint: disable=protected-access
+        assert storage.put.mock_calls == [mocker.call(impressions[0:2])]
+        assert task.record(impressions[2:], [None]) is True
+
+    def test_start_after_fork(self, mocker):
+        """Test that the task is started on first use in every process."""
+        storage = mocker.Mock(spec=ImpressionStorage)
+        impression = Impression('key1', 'split1', 'on', 'l1', 123456, None, 321654)
+        getpid = mocker.patch('splitio.tasks.impressions_recorder.os.getpid')
+        getpid.return_value = 1
+        task = impressions_recorder.ImpressionsRecorderTask(storage, None, 60, 10, 10)
+        assert not task.is_running()
+        task.record([impression], [None])
+        assert task.is_running()
+        parent_task = task._task  #pylint: disable=protected-access
+
+        # A forked child doesn't see the parent's thread, and starts its own.
+        getpid.return_value = 2
+        assert not task.is_running()
+        task.record([impression], [None])
+        assert task.is_running()
+        assert task._task is not parent_task  #pylint: disable=protected-access
+
+        stop_event = threading.Event()
+        task.stop(stop_event)
+        stop_event.wait(5)
+        assert storage.put.mock_calls == [mocker.call([impression])]
+        getpid.return_value = 1
+        parent_task.stop()
@@ -5,7 +5,8 @@ import time
 from splitio.api.client import HttpResponse
 from splitio.tasks import impressions_sync
 from splitio.storage import ImpressionStorage
-from splitio.models.impressions import Impression
+from splitio.models.impressions import Impression, ImpressionCount
+from splitio.engine.impressions import Counter
 from splitio.api.impressions import ImpressionsAPI
 
 class ImpressionsSyncTests(object):
@@ -36,3 +37,25 @@ class ImpressionsSyncTests(object):
         stop_event.wait(5)
         assert stop_event.is_set()
         assert len(api.flush_impressions.mock_calls) > calls_now
+
+
+class ImpressionsCountSyncTests(object):
+    """Impression counts synchronization task test cases."""
+
+    def test_normal_operation(self, mocker):
+        """Test that counts are sent and reset, and flushed on stop."""
+        counter = Counter()
+        counter.track([
+            Impression('key1', 'split1', 'on', 'l1', 123456, 'b1', 3600001),
+            Impression('key2', 'split1', 'on', 'l1', 123456, 'b1', 3600002)
+        ])
+        api = mocker.Mock(spec=ImpressionsAPI)
+        task = impressions_sync.ImpressionsCountSyncTask(api, counter, 60)
+        task.start()
+        assert task.is_running()
+        stop_event = threading.Event()
+        task.stop(stop_event)
+        stop_event.wait(5)
+        assert stop_event.is_set()
+        assert api.flush_counters.mock_calls == [mocker.call([ImpressionCount('split1', 3600000, 2)])]
+        assert counter.pop_all() == []
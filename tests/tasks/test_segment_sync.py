@@ -78,15 +78,97 @@ class SegmentSynchronizationTests(object):
         assert mocker.call('segmentB', 123) in api_calls
         assert mocker.call('segmentC', 123) in api_calls
 
-        segment_put_calls = storage.put.mock_calls
-        segments_to_validate = set(['segmentA', 'segmentB', 'segmentC'])
-        for call in segment_put_calls:
-            func_name, positional_args, keyword_args = call
-            segment = positional_args[0]
-            assert isinstance(segment, Segment)
-            assert segment.name in segments_to_validate
-            segments_to_validate.remove(segment.name)
+        update_calls = storage.update.mock_calls
+        assert mocker.call('segmentA', ['key1', 'key2', 'key3'], [], 123) in update_calls
+        assert mocker.call('segmentB', ['key4', 'key5', 'key6'], [], 123) in update_calls
+        assert mocker.call('segmentC', ['key7', 'key8', 'key9'], [], 123) in update_calls
+        assert storage.put.mock_calls == []
 
     def test_that_errors_dont_stop_task(self, mocker):
         """Test that if fetching segments fails at some_point, the task will continue running."""
         # TODO!
+
+    def test_adaptive_polling(self, mocker):
+        """Test that only due segments are polled, within the request budget."""
+        split_storage = mocker.Mock(spec=SplitStorage)
+        split_storage.get_segment_names.return_value = ['segmentA', 'segmentB', 'segmentC']
+        telemetry_storage = mocker.Mock()
+        task = segment_sync.SegmentSynchronizationTask(
+            mocker.Mock(), mocker.Mock(spec=SegmentStorage), split_storage, 10,
+            threading.Event(), max_period=80, request_budget=2,
+            telemetry_storage=telemetry_storage
+        )
+        task._worker_pool = mocker.Mock()
+
+        time_mock = mocker.patch('splitio.tasks.segment_sync.time.time')
+        time_mock.return_value = 1000
+        task._main()
+        assert task._worker_pool.submit_work.mock_calls == [
+            mocker.call('segmentA'),
+            mocker.call('segmentB')
+        ]
+        assert mocker.call('segments.polling.deferred', 1) in telemetry_storage.put_gauge.mock_calls
+
+        # In-flight segments are not resubmitted.
+        task._worker_pool.reset_mock()
+        task._main()
+        assert task._worker_pool.submit_work.mock_calls == [mocker.call('segmentC')]
+
+        task._schedule.record('segmentA', segment_sync._SegmentSchedule.CHANGED, 1000)
+        task._schedule.record('segmentB', segment_sync._SegmentSchedule.QUIET, 1000)
+        task._schedule.record('segmentC', segment_sync._SegmentSchedule.QUIET, 1000)
+        task._worker_pool.reset_mock()
+        time_mock.return_value = 1010
+        task._main()
+        assert task._worker_pool.submit_work.mock_calls == [mocker.call('segmentA')]
+
+        task._worker_pool.reset_mock()
+        time_mock.return_value = 1020
+        task._main()
+        assert task._worker_pool.submit_work.mock_calls == [
+            mocker.call('segmentB'),
+            mocker.call('segmentC')
+        ]
+
+    def test_schedule_backoff(self):
+        """Test that quiet segments back off up to the max interval and reset on changes."""
+        schedule = segment_sync._SegmentSchedule(10, 40)
+        intervals = []
+        for _ in range(4):
+            schedule.record('segmentA', segment_sync._SegmentSchedule.QUIET, 0)
+            intervals.append(schedule._intervals['segmentA'])
+        assert intervals == [20, 40, 40, 40]
+        schedule.record('segmentA', segment_sync._SegmentSchedule.CHANGED, 0)
+        assert schedule._intervals['segmentA'] == 10
+        assert schedule.pop_due(['segmentA'], 0, 9) == ([], 0)
+        assert schedule.pop_due(['segmentA'], 0, 10) == (['segmentA'], 0)
+        assert schedule.pop_due([], 0, 100) == ([], 0)
+        assert schedule.get_average_interval() == 0
+
+    def test_fetch_errors_back_off(self, mocker):
+        """Test that a failed fetch is recorded as an error and backs off instead of retrying."""
+        api = mocker.Mock()
+        api.fetch_segment.side_effect = APIException('some error')
+        storage = mocker.Mock(spec=SegmentStorage)
+        storage.get_change_number.return_value = 123
+        task = segment_sync.SegmentSynchronizationTask(
+            api, storage, mocker.Mock(spec=SplitStorage), 10, threading.Event(), max_period=80
+        )
+        task._task = mocker.Mock()
+        task._task.running.return_value = True
+        time_mock = mocker.patch('splitio.tasks.segment_sync.time.time')
+        time_mock.return_value = 1000
+
+        task._schedule.record('segmentA', segment_sync._SegmentSchedule.QUIET, 1000)
+        task._ensure_segment_is_updated('segmentA')
+        assert len(api.fetch_segment.mock_calls) == 1
+        assert task._schedule._intervals['segmentA'] == 40
+        assert task._schedule._due['segmentA'] == 1040
+
+        # A fetch that needed several rounds to catch up resets the interval.
+        api.fetch_segment.side_effect = [
+            {'name': 'segmentA', 'added': ['key1'], 'removed': [], 'since': 123, 'till': 124},
+            {'name': 'segmentA', 'added': [], 'removed': [], 'since': 124, 'till': 124},
+        ]
+        task._ensure_segment_is_updated('segmentA')
+        assert task._schedule._intervals['segmentA'] == 10
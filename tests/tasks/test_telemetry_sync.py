@@ -3,6 +3,7 @@
 import time
 import threading
 from splitio.storage import TelemetryStorage
+from splitio.api.client import HttpClient
 from splitio.api.telemetry import TelemetryAPI
 from splitio.tasks.telemetry_sync import TelemetrySynchronizationTask
 
@@ -55,3 +56,30 @@ class TelemetrySyncTests(object):  #pylint: disable=too-few-public-methods
             'counter1': 1,
             'counter2': 5
         }) in api.flush_counters.mock_calls
+
+    def test_connection_stats(self, mocker):
+        """Test that connection reuse is reported as gauges before flushing them."""
+        api = mocker.Mock(spec=TelemetryAPI)
+        storage = mocker.Mock(spec=TelemetryStorage)
+        storage.pop_latencies.return_value = {}
+        storage.pop_counters.return_value = {}
+        storage.pop_gauges.return_value = {}
+        http_client = mocker.Mock(spec=HttpClient)
+        http_client.get_connection_stats.return_value = {
+            'sdk': {'requests': 10, 'connections': 2}
+        }
+        task = TelemetrySynchronizationTask(api, storage, 1, http_client)
+        task._flush_telemetry()  #pylint: disable=protected-access
+        assert storage.put_gauge.mock_calls == [
+            mocker.call('http.sdk.requests', 10),
+            mocker.call('http.sdk.connections', 2)
+        ]
+        assert storage.mock_calls.index(mocker.call.put_gauge('http.sdk.connections', 2)) < \
+            storage.mock_calls.index(mocker.call.pop_gauges())
+
+        # Errors don't stop telemetry from being flushed.
+        http_client.get_connection_stats.side_effect = Exception('something')
+        storage.reset_mock()
+        task._flush_telemetry()  #pylint: disable=protected-access
+        assert storage.put_gauge.mock_calls == []
+        assert mocker.call() in storage.pop_gauges.mock_calls
@@ -0,0 +1,49 @@
+"""LRU cache test module."""
+
+from splitio.util.lru import LRUCache
+
+
+class LRUCacheTests(object):
+    """LRU cache test cases."""
+
+    def test_lru_cache(self):
+        """Test LRU eviction & stats of the bounded LRU cache."""
+        cache = LRUCache(2)
+        cache.put('a', 1)
+        cache.put('b', False)
+        assert cache.get('a') == 1
+        cache.put('c', 3)
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+        cache.record_hit()
+        assert cache.pop_stats() == (2, 4, 1)
+        assert cache.pop_stats() == (2, 0, 0)
+        cache.put('d', False)
+        assert cache.get('d') is False
+
+    def test_stats_reporting(self, mocker):
+        """Test that size & hit rate are reported every `report_interval` lookups."""
+        telemetry_storage = mocker.Mock()
+        cache = LRUCache(2, telemetry_storage, 'some.cache', 3)
+        cache.put('a', 1)
+        cache.get('a')
+        cache.get('b')
+        assert telemetry_storage.put_gauge.mock_calls == []
+        cache.record_hit()
+        assert telemetry_storage.put_gauge.mock_calls == [
+            mocker.call('some.cache.size', 1),
+            mocker.call('some.cache.hitRate', 66)
+        ]
+        assert cache.pop_stats() == (1, 0, 0)
+
+        # Reporting errors don't propagate.
+        telemetry_storage.put_gauge.side_effect = Exception('something')
+        for _ in range(3):
+            assert cache.get('a') == 1
+
+        # Without a metric prefix nothing is reported.
+        telemetry_storage.reset_mock()
+        cache = LRUCache(2, telemetry_storage, report_interval=1)
+        cache.get('a')
+        assert telemetry_storage.put_gauge.mock_calls == []